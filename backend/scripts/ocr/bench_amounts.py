@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""Check and benchmark the single-pass amount tokenizer against the former regex chain.
+
+The regex implementation ``_amounts_from_line`` / ``parse_amount`` used before the
+tokenizer is kept here as the reference. Random OCR-like lines (grouped and ungrouped
+amounts, stray separators, broken spacing, letters, non-ASCII digits) are generated and
+both implementations must return the same amounts; the run fails on the first mismatch.
+Then both are timed on the same corpus.
+"""
+import argparse
+import json
+import random
+import re
+import sys
+import time
+from typing import List, Optional
+
+from paddle_ocr_v3 import OCRService
+from receipt_heuristics import MAX_AMOUNT, MAX_VALID_AMOUNT, MIN_AMOUNT, parse_amount
+
+LEGACY_AMOUNT_RE = re.compile(
+    r"(?:(?:rp|idr)\s*)?(\d{1,3}(?:[.,\s]\d{3})+(?:[.,]\d{2})?|\d+(?:[.,]\d{2})?)",
+    re.IGNORECASE,
+)
+LEGACY_NOISY_AMOUNT_RE = re.compile(r"\d[\d.,\s]{3,}\d")
+
+
+def legacy_parse_amount(raw: str) -> Optional[int]:
+    text = raw.lower().replace("rp", "").replace("idr", "")
+    text = text.replace(" ", "").strip()
+    if not text:
+        return None
+
+    text = re.sub(r"[^0-9.,]", "", text)
+    if not text:
+        return None
+
+    if re.match(r"^\d{1,3}[.,]\d{2}[.,]00$", text):
+        parts = re.split(r"[.,]", text)
+        if len(parts) == 3:
+            text = f"{parts[0]}{parts[1]}0,00"
+
+    decimal_sep_match = re.search(r"([.,])(\d{2})$", text)
+    decimal_sep = decimal_sep_match.group(1) if decimal_sep_match else None
+    decimal_tail = decimal_sep_match.group(2) if decimal_sep_match else None
+
+    if "," in text and "." in text:
+        last_comma = text.rfind(",")
+        last_dot = text.rfind(".")
+        if last_comma > last_dot:
+            text = text.replace(".", "").replace(",", ".")
+        else:
+            text = text.replace(",", "")
+    elif "." in text and "," not in text:
+        parts = text.split(".")
+        if len(parts) > 2:
+            text = text.replace(".", "")
+        else:
+            right = parts[1] if len(parts) == 2 else ""
+            if len(right) == 3:
+                text = text.replace(".", "")
+    elif "," in text and "." not in text:
+        parts = text.split(",")
+        if len(parts) > 2:
+            text = text.replace(",", "")
+        else:
+            right = parts[1] if len(parts) == 2 else ""
+            if len(right) <= 2:
+                text = text.replace(",", ".")
+            else:
+                text = text.replace(",", "")
+
+    if decimal_sep and decimal_tail == "00":
+        stripped = re.sub(r"\D", "", text)
+        if len(stripped) >= 3 and stripped.endswith("00"):
+            text = stripped[:-2]
+
+    text = text.replace(".", "")
+    text = text.replace(",", "")
+
+    if not text.isdigit():
+        digits_only = re.sub(r"\D", "", text)
+        if digits_only.isdigit():
+            text = digits_only
+        else:
+            return None
+
+    if not text.isdigit():
+        return None
+
+    value = int(text)
+    if value <= 0 or value > MAX_AMOUNT:
+        return None
+    return value
+
+
+def legacy_amounts_from_line(text: str) -> List[int]:
+    values: List[int] = []
+    seen: set = set()
+    raws = [m.group(1) for m in LEGACY_AMOUNT_RE.finditer(text)] + LEGACY_NOISY_AMOUNT_RE.findall(text)
+    for raw in raws:
+        value = legacy_parse_amount(raw)
+        if value is None or value < MIN_AMOUNT or value > MAX_VALID_AMOUNT:
+            continue
+        if value not in seen:
+            values.append(value)
+            seen.add(value)
+    return values
+
+
+def random_line(rng: random.Random) -> str:
+    pieces = []
+    for _ in range(rng.randint(1, 5)):
+        kind = rng.random()
+        if kind < 0.45:
+            value = rng.choice([rng.randint(1, 999), rng.randint(1_000, 99_999_999), rng.randint(1, 999) * 1000])
+            text = f"{value:,}"
+            if rng.random() < 0.5:
+                text = text.replace(",", ".")
+            if rng.random() < 0.3:
+                text += rng.choice([",00", ".00", ",5", ",50", ".25", "00"])
+            if rng.random() < 0.15:
+                text = text.replace(".", rng.choice([" ", ". ", ",", ""]), 1)
+            pieces.append(rng.choice(["", "Rp", "Rp ", "IDR ", "rp."]) + text)
+        elif kind < 0.75:
+            pieces.append("".join(rng.choice("0123456789.,  ") for _ in range(rng.randint(1, 14))))
+        elif kind < 0.95:
+            pieces.append(rng.choice(["TOTAL", "Jumlah", "Tagihan", "Rp", "x", "No.", "Tgl", "IDR", ":", "-", "\t", "\n"]))
+        else:
+            pieces.append("".join(rng.choice("0123456789٣².,  ") for _ in range(rng.randint(1, 10))))
+    return rng.choice([" ", "", "  "]).join(pieces)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--cases", type=int, default=200_000, help="Random lines checked for equivalence")
+    parser.add_argument("--lines", type=int, default=20_000, help="Lines in the timing corpus")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=11)
+    parser.add_argument("--json", action="store_true", help="Output JSON only")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    for _ in range(args.cases):
+        line = random_line(rng)
+        for raw in (line, line.lower()):
+            if legacy_amounts_from_line(raw) != OCRService._amounts_from_line(raw):
+                print(f"amounts differ for {raw!r}", file=sys.stderr)
+                sys.exit(1)
+            if legacy_parse_amount(raw) != parse_amount(raw):
+                print(f"parse_amount differs for {raw!r}", file=sys.stderr)
+                sys.exit(1)
+
+    corpus = [random_line(rng).lower() for _ in range(args.lines)]
+    timings = {}
+    for name, fn in (("regex", legacy_amounts_from_line), ("tokenizer", OCRService._amounts_from_line)):
+        best = float("inf")
+        for _ in range(max(args.repeat, 1)):
+            t0 = time.perf_counter()
+            for line in corpus:
+                fn(line)
+            best = min(best, time.perf_counter() - t0)
+        timings[name] = best
+
+    report = {
+        "cases_checked": args.cases,
+        "lines": len(corpus),
+        "regex_ms": round(timings["regex"] * 1000.0, 2),
+        "tokenizer_ms": round(timings["tokenizer"] * 1000.0, 2),
+        "speedup": round(timings["regex"] / timings["tokenizer"], 2) if timings["tokenizer"] else None,
+    }
+    if args.json:
+        print(json.dumps(report))
+        return
+    print(
+        f"{report['cases_checked']} random lines match. {report['lines']} lines: regex {report['regex_ms']} ms, "
+        f"tokenizer {report['tokenizer_ms']} ms ({report['speedup']}x)"
+    )
+
+
+if __name__ == "__main__":
+    main()
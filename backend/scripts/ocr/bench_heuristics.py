@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""Benchmark the mypyc-compiled receipt heuristics against the interpreted source.
+
+Lines come from ``--fixtures``: engine ``--json`` outputs (the per-page ``raw_text`` lists
+are used) or plain text files with one recorded OCR line per row. Without fixtures a
+synthetic corpus of OCR-like lines is generated. Both builds must return identical
+results on every line before they are timed; build the extension first with
+``python3 build_heuristics.py``.
+"""
+import argparse
+import importlib.util
+import json
+import os
+import random
+import sys
+import time
+from importlib.machinery import SourceFileLoader
+from types import ModuleType
+from typing import Any, Callable, Dict, List
+
+import receipt_heuristics
+from bench_amounts import random_line
+from paddle_ocr_v3 import FUZZY_ANCHOR_WORDS, FUZZY_KEYWORDS, FUZZY_MIN_TOKEN_LENGTH, FUZZY_TOKEN_RE
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def load_interpreted() -> ModuleType:
+    path = os.path.join(SCRIPT_DIR, "receipt_heuristics.py")
+    loader = SourceFileLoader("receipt_heuristics_interpreted", path)
+    spec = importlib.util.spec_from_loader(loader.name, loader)
+    module = importlib.util.module_from_spec(spec)
+    loader.exec_module(module)
+    return module
+
+
+def load_fixture_lines(paths: List[str]) -> List[str]:
+    lines: List[str] = []
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as handle:
+            if not path.endswith(".json"):
+                lines.extend(row.rstrip("\n") for row in handle if row.strip())
+                continue
+            result = json.load(handle)
+        for page in result.get("per_page", []):
+            raw_text = page.get("raw_text", [])
+            lines.extend(raw_text.splitlines() if isinstance(raw_text, str) else raw_text)
+    return lines
+
+
+def synthetic_lines(rng: random.Random, count: int) -> List[str]:
+    words = FUZZY_ANCHOR_WORDS + ["tota1", "jumiah", "tagiham", "pembayarn", "keterangan", "pelanggan"]
+    return [f"{rng.choice(words)} {random_line(rng)}" if rng.random() < 0.5 else random_line(rng) for _ in range(count)]
+
+
+def workload(module: ModuleType) -> Callable[[str], Any]:
+    anchors = list(FUZZY_ANCHOR_WORDS)
+    max_distance = max(FUZZY_KEYWORDS.max_distance, 1)
+
+    def run(line: str) -> Any:
+        text = line.lower()
+        fuzzy = [
+            module.edit_distance(token, word, max_distance)
+            for token in FUZZY_TOKEN_RE.findall(text)
+            if len(token) >= FUZZY_MIN_TOKEN_LENGTH
+            for word in anchors
+        ]
+        return module.amounts_from_line(text), module.amounts_in_text(text), module.parse_amount(text), fuzzy
+
+    return run
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--fixtures", nargs="*", default=[], help="Engine JSON outputs or text files of OCR lines")
+    parser.add_argument("--lines", type=int, default=20_000, help="Synthetic lines when no fixtures are given")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=13)
+    parser.add_argument("--json", action="store_true", help="Output JSON only")
+    args = parser.parse_args()
+
+    corpus = load_fixture_lines(args.fixtures) or synthetic_lines(random.Random(args.seed), args.lines)
+    builds: Dict[str, ModuleType] = {"interpreted": load_interpreted()}
+    if receipt_heuristics.COMPILED:
+        builds["compiled"] = receipt_heuristics
+    else:
+        print("Compiled receipt_heuristics not found; timing the interpreted build only", file=sys.stderr)
+
+    runners = {name: workload(module) for name, module in builds.items()}
+    if "compiled" in runners:
+        for line in corpus:
+            if runners["compiled"](line) != runners["interpreted"](line):
+                print(f"compiled and interpreted builds differ for {line!r}", file=sys.stderr)
+                sys.exit(1)
+
+    timings: Dict[str, float] = {}
+    for name, run in runners.items():
+        best = float("inf")
+        for _ in range(max(args.repeat, 1)):
+            t0 = time.perf_counter()
+            for line in corpus:
+                run(line)
+            best = min(best, time.perf_counter() - t0)
+        timings[name] = best
+
+    report: Dict[str, Any] = {
+        "lines": len(corpus),
+        "source": "fixtures" if args.fixtures else "synthetic",
+        "interpreted_ms": round(timings["interpreted"] * 1000.0, 2),
+        "interpreted_lines_per_s": round(len(corpus) / timings["interpreted"]) if timings["interpreted"] else None,
+        "compiled_ms": None,
+        "compiled_lines_per_s": None,
+        "speedup": None,
+    }
+    if "compiled" in timings:
+        report["compiled_ms"] = round(timings["compiled"] * 1000.0, 2)
+        report["compiled_lines_per_s"] = round(len(corpus) / timings["compiled"]) if timings["compiled"] else None
+        report["speedup"] = round(timings["interpreted"] / timings["compiled"], 2) if timings["compiled"] else None
+    if args.json:
+        print(json.dumps(report))
+        return
+    compiled = f"compiled {report['compiled_ms']} ms ({report['speedup']}x)" if report["compiled_ms"] is not None else "compiled n/a"
+    print(f"{report['lines']} {report['source']} lines: interpreted {report['interpreted_ms']} ms, {compiled}")
+
+
+if __name__ == "__main__":
+    main()
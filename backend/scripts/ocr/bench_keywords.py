@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""Microbenchmark the compiled keyword matcher against per-keyword substring scans.
+
+Synthesizes dense summary pages (report title, table header and many ledger rows) and
+times answering every keyword class for every line plus the joined page text, once
+with ``any(kw in text ...)`` per list and once with ``KEYWORDS.scan``. The two answers
+are compared on every text so a vocabulary change that breaks equivalence shows up here.
+"""
+import argparse
+import json
+import random
+import sys
+import time
+from typing import Dict, List, Set
+
+from paddle_ocr_v3 import KEYWORDS
+
+LEDGER_WORDS = [
+    "bayar listrik",
+    "pembelian atk",
+    "honor narasumber",
+    "konsumsi rapat",
+    "transport",
+    "belanja bahan",
+    "pajak ppn",
+    "biaya admin bank",
+    "sewa gedung",
+    "jumlah",
+    "total bayar",
+    "saldo akhir",
+]
+HEADER_LINES = [
+    "LAPORAN PERTANGGUNG JAWABAN",
+    "REKAPITULASI PENGELUARAN",
+    "No  Tanggal  Uraian  Pemasukan  Pengeluaran  Saldo",
+]
+
+
+def synth_page(rng: random.Random, rows: int) -> List[str]:
+    lines = list(HEADER_LINES)
+    for idx in range(rows):
+        words = " ".join(rng.sample(LEDGER_WORDS, 2))
+        amount = f"{rng.randint(1, 900) * 1000:,}".replace(",", ".")
+        lines.append(f"{idx + 1} {rng.randint(1, 28):02d}/0{rng.randint(1, 9)} {words} Rp {amount}")
+    lines.append(f"JUMLAH TOTAL Rp {rng.randint(1, 90) * 1_000_000:,}".replace(",", "."))
+    return lines
+
+
+def naive_scan(text: str) -> Dict[str, Set[str]]:
+    return {name: {kw for kw in words if kw in text} for name, words in KEYWORDS.groups.items()}
+
+
+def compiled_scan(text: str) -> Dict[str, Set[str]]:
+    hits = KEYWORDS.scan(text)
+    return {name: set(hits.keywords & words) for name, words in KEYWORDS.groups.items()}
+
+
+def texts_for(pages: List[List[str]]) -> List[str]:
+    texts: List[str] = []
+    for page in pages:
+        lowered = [line.lower() for line in page]
+        texts.extend(lowered)
+        texts.extend(line.replace("0", "o") for line in lowered)
+        texts.append("\n".join(lowered))
+    return texts
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pages", type=int, default=50)
+    parser.add_argument("--rows", type=int, default=60, help="Ledger rows per page")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--json", action="store_true", help="Output JSON only")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    texts = texts_for([synth_page(rng, args.rows) for _ in range(args.pages)])
+
+    mismatches = [text for text in texts if naive_scan(text) != compiled_scan(text)]
+    if mismatches:
+        print(f"Matcher disagrees with substring scan on {len(mismatches)} texts, e.g. {mismatches[0]!r}", file=sys.stderr)
+        sys.exit(1)
+
+    timings: Dict[str, float] = {}
+    for name, scan in (("substring", naive_scan), ("compiled", compiled_scan)):
+        best = float("inf")
+        for _ in range(max(args.repeat, 1)):
+            t0 = time.perf_counter()
+            for text in texts:
+                scan(text)
+            best = min(best, time.perf_counter() - t0)
+        timings[name] = best
+
+    report = {
+        "texts": len(texts),
+        "substring_ms": round(timings["substring"] * 1000.0, 2),
+        "compiled_ms": round(timings["compiled"] * 1000.0, 2),
+        "speedup": round(timings["substring"] / timings["compiled"], 2) if timings["compiled"] else None,
+    }
+    if args.json:
+        print(json.dumps(report))
+        return
+    print(
+        f"{report['texts']} texts: substring {report['substring_ms']} ms, "
+        f"compiled {report['compiled_ms']} ms ({report['speedup']}x)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""Benchmark OCR backends and model precisions (startup, latency, RSS, accuracy) on local receipts.
+
+Variants are ``backend[:precision]`` pairs, e.g. ``paddle,onnx:fp32,onnx:int8``. With
+``--manifest`` (a JSON object mapping receipt paths to their expected grand total) the
+full pipeline is also run per file and the total hit rate is reported, so FP32 and INT8
+can be compared on a fixed local corpus before picking one per deployment.
+"""
+import argparse
+import json
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import time
+from collections import Counter
+from typing import Any, Dict, List
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    idx = min(int(round((len(ordered) - 1) * pct)), len(ordered) - 1)
+    return ordered[idx]
+
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss is reported in kilobytes on Linux.
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+
+
+def run_worker(
+    variant: str,
+    inputs: List[str],
+    repeat: int,
+    conf_threshold: float,
+    expected: Dict[str, Any],
+) -> Dict[str, Any]:
+    started = time.perf_counter()
+    sys.path.insert(0, SCRIPT_DIR)
+    from paddle_ocr_v3 import OCRService
+
+    service = OCRService()
+    processor = service.processor
+    processor.ocr  # force model load so startup includes it
+    startup_s = time.perf_counter() - started
+    rss_after_load = _peak_rss_mb()
+
+    pages = []
+    for path in inputs:
+        for page_idx, image in enumerate(OCRService._load_pages(path), start=1):
+            pages.append((f"{os.path.basename(path)}#{page_idx}", image))
+
+    latencies_ms: List[float] = []
+    texts: Dict[str, List[str]] = {}
+    if pages:
+        processor.run(pages[0][1], handwritten=False, conf_threshold=conf_threshold)  # warm-up
+
+    for _ in range(max(repeat, 1)):
+        for name, image in pages:
+            t0 = time.perf_counter()
+            lines = processor.run(image, handwritten=False, conf_threshold=conf_threshold)
+            latencies_ms.append((time.perf_counter() - t0) * 1000.0)
+            texts[name] = [line["text"] for line in lines]
+
+    total_hits = 0
+    total_latencies_ms: List[float] = []
+    for path, expected_total in expected.items():
+        t0 = time.perf_counter()
+        result = service.process(path)
+        total_latencies_ms.append((time.perf_counter() - t0) * 1000.0)
+        if result.get("grand_total") == expected_total:
+            total_hits += 1
+
+    return {
+        "variant": variant,
+        "startup_s": round(startup_s, 3),
+        "rss_after_load_mb": round(rss_after_load, 1),
+        "peak_rss_mb": round(_peak_rss_mb(), 1),
+        "pages": len(pages),
+        "latency_ms": {
+            "mean": round(statistics.mean(latencies_ms), 1) if latencies_ms else 0.0,
+            "p50": round(_percentile(latencies_ms, 0.5), 1),
+            "p95": round(_percentile(latencies_ms, 0.95), 1),
+        },
+        "total_accuracy": round(total_hits / len(expected), 4) if expected else None,
+        "file_latency_ms": round(statistics.mean(total_latencies_ms), 1) if total_latencies_ms else None,
+        "texts": texts,
+    }
+
+
+def _text_agreement(reference: Dict[str, List[str]], other: Dict[str, List[str]]) -> float:
+    matched = 0
+    total = 0
+    for name, ref_lines in reference.items():
+        ref_counts = Counter(t.strip().lower() for t in ref_lines)
+        other_counts = Counter(t.strip().lower() for t in other.get(name, []))
+        matched += sum((ref_counts & other_counts).values())
+        total += sum(ref_counts.values())
+    return matched / total if total else 0.0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--input", nargs="*", default=[], help="Receipt images or PDFs to OCR")
+    parser.add_argument("--variants", default="paddle,onnx", help="Comma-separated backend[:precision] list")
+    parser.add_argument("--manifest", help="JSON file mapping receipt paths to expected grand totals")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed passes over all pages")
+    parser.add_argument("--conf-threshold", type=float, default=0.35)
+    parser.add_argument("--json", action="store_true", help="Output JSON only")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    expected: Dict[str, Any] = {}
+    if args.manifest:
+        with open(args.manifest, "r", encoding="utf-8") as handle:
+            manifest_dir = os.path.dirname(os.path.abspath(args.manifest))
+            expected = {os.path.join(manifest_dir, path): total for path, total in json.load(handle).items()}
+    inputs = args.input or list(expected.keys())
+    if not inputs:
+        parser.error("--input or --manifest is required")
+
+    if args.worker:
+        print(json.dumps(run_worker(args.worker, inputs, args.repeat, args.conf_threshold, expected)))
+        return
+
+    # Each variant runs in its own interpreter so import cost and RSS are not shared.
+    reports: List[Dict[str, Any]] = []
+    for variant in [v.strip() for v in args.variants.split(",") if v.strip()]:
+        backend, _, precision = variant.partition(":")
+        cmd = [
+            sys.executable,
+            os.path.abspath(__file__),
+            "--worker",
+            variant,
+            "--repeat",
+            str(args.repeat),
+            "--conf-threshold",
+            str(args.conf_threshold),
+            "--input",
+            *inputs,
+        ]
+        if args.manifest:
+            cmd.extend(["--manifest", args.manifest])
+        env = {**os.environ, "OCR_BACKEND": backend, "OCR_MODEL_PRECISION": precision or "fp32"}
+        proc = subprocess.run(cmd, capture_output=True, text=True, env=env)
+        if proc.returncode != 0:
+            print(f"[{variant}] failed: {proc.stderr.strip()}", file=sys.stderr)
+            continue
+        reports.append(json.loads(proc.stdout.strip().splitlines()[-1]))
+
+    if reports:
+        reference = reports[0]["texts"]
+        for report in reports:
+            report["text_agreement"] = round(_text_agreement(reference, report["texts"]), 4)
+
+    if args.json:
+        print(json.dumps([{k: v for k, v in r.items() if k != "texts"} for r in reports], indent=2))
+        return
+
+    print(
+        f"{'variant':<12} {'startup s':>10} {'mean ms':>9} {'p50 ms':>8} {'p95 ms':>8} "
+        f"{'peak MB':>9} {'agree':>7} {'totals':>7}"
+    )
+    for r in reports:
+        lat = r["latency_ms"]
+        totals = f"{r['total_accuracy']:.2%}" if r["total_accuracy"] is not None else "-"
+        print(
+            f"{r['variant']:<12} {r['startup_s']:>10.2f} {lat['mean']:>9.1f} {lat['p50']:>8.1f} "
+            f"{lat['p95']:>8.1f} {r['peak_rss_mb']:>9.1f} {r['text_agreement']:>7.2%} {totals:>7}"
+        )
+
+
+if __name__ == "__main__":
+    main()
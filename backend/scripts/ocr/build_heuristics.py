@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""Compile receipt_heuristics.py with mypyc into an extension module next to it.
+
+Optional: ``pip install -r requirements-mypyc.txt`` then ``python3 build_heuristics.py``. The
+engine imports the compiled module automatically when present and the plain source otherwise;
+delete the ``receipt_heuristics.*.so`` file to go back to the interpreted version. The build
+needs the Python development headers, which the backend image does not ship, so it is not
+part of it.
+
+With the pinned mypy on CPython 3.11.7, ``python3 bench_heuristics.py`` (20,000 synthetic
+lines, best of 5) measured interpreted 739 ms vs compiled 485 ms (1.52x) and, on reruns,
+up to 1.57x; ``python3 bench_heuristics.py --lines 50000`` measured 1966 ms vs 1309 ms (1.50x).
+"""
+import os
+import sys
+import tempfile
+
+try:
+    from mypyc.build import mypycify
+    from setuptools import setup
+except Exception as exc:
+    print(f"Missing mypyc build dependency: {exc}", file=sys.stderr)
+    raise
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def main() -> None:
+    os.chdir(SCRIPT_DIR)
+    # Intermediate C sources and objects go to a scratch directory; only the extension is kept.
+    with tempfile.TemporaryDirectory() as build_dir:
+        setup(
+            name="receipt-heuristics",
+            ext_modules=mypycify(["receipt_heuristics.py"], opt_level="3", target_dir=build_dir),
+            script_args=["build_ext", "--inplace", "--build-temp", build_dir, "--build-lib", build_dir],
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""Export the PaddleOCR det/cls/rec inference models to ONNX for ``OCR_BACKEND=onnx``.
+
+Needs the ONNX extras (``pip install -r requirements-onnx.txt``). The models are the ones the
+paddle backend loads, ``PaddleOCR(use_angle_cls=True, lang="latin")`` from paddleocr 2.7.3:
+PaddleOCR is created once so it downloads them into ``~/.paddleocr``, then each model
+directory is converted with the paddle2onnx command line, as in
+
+    paddle2onnx --model_dir <model dir> --model_filename inference.pdmodel \\
+        --params_filename inference.pdiparams --save_file det.onnx \\
+        --opset_version 11 --enable_onnx_checker True
+
+The output directory (``OCR_ONNX_MODEL_DIR``, default ``models/onnx``) ends up holding
+``det.onnx``, ``cls.onnx``, ``rec.onnx`` and the recognizer's ``rec_dict.txt``. Run
+``quantize_int8.py`` afterwards for the INT8 variants. ``--numeric-model-dir`` also converts
+a digits-only recognizer to ``numeric_rec.onnx`` for ``OCR_NUMERIC_REC_MODEL``.
+"""
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+from typing import Any, Dict
+
+from onnx_backend import default_model_dir
+from paddle_ocr_v3 import _load_paddleocr
+
+ONNX_OPSET = 11
+
+
+def paddle_model_dirs() -> Dict[str, Any]:
+    """Model directories and character dict of the engine the paddle backend creates."""
+    PaddleOCR = _load_paddleocr()
+    engine = PaddleOCR(use_angle_cls=True, lang="latin", use_gpu=False, show_log=False)
+    args = engine.args
+    return {
+        "det": args.det_model_dir,
+        "cls": args.cls_model_dir,
+        "rec": args.rec_model_dir,
+        "rec_dict": args.rec_char_dict_path,
+    }
+
+
+def convert(model_dir: str, save_file: str) -> None:
+    command = shutil.which("paddle2onnx")
+    if command is None:
+        print("paddle2onnx not found; pip install -r requirements-onnx.txt", file=sys.stderr)
+        sys.exit(1)
+    subprocess.run(
+        [
+            command,
+            "--model_dir",
+            model_dir,
+            "--model_filename",
+            "inference.pdmodel",
+            "--params_filename",
+            "inference.pdiparams",
+            "--save_file",
+            save_file,
+            "--opset_version",
+            str(ONNX_OPSET),
+            "--enable_onnx_checker",
+            "True",
+        ],
+        check=True,
+    )
+    print(f"{model_dir} -> {save_file}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output-dir", default=default_model_dir(), help="Directory for det/cls/rec.onnx and rec_dict.txt")
+    parser.add_argument("--numeric-model-dir", help="Paddle inference directory of a digits-only recognizer")
+    args = parser.parse_args()
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    sources = paddle_model_dirs()
+    for stage in ("det", "cls", "rec"):
+        convert(sources[stage], os.path.join(args.output_dir, f"{stage}.onnx"))
+    shutil.copyfile(sources["rec_dict"], os.path.join(args.output_dir, "rec_dict.txt"))
+    if args.numeric_model_dir:
+        convert(args.numeric_model_dir, os.path.join(args.output_dir, "numeric_rec.onnx"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""Text-box helpers shared by the OCR backends and the staged recognition pipeline."""
+import sys
+from typing import Any, List, Sequence
+
+import numpy as np
+
+try:
+    import cv2
+except Exception as exc:
+    print(f"Missing opencv dependency: {exc}", file=sys.stderr)
+    raise
+
+
+def sorted_boxes(dt_boxes: Sequence[Any]) -> List[np.ndarray]:
+    """Sort boxes top-to-bottom, then left-to-right within the same text row."""
+    boxes = sorted(dt_boxes, key=lambda box: (box[0][1], box[0][0]))
+    for i in range(len(boxes) - 1):
+        for j in range(i, -1, -1):
+            if abs(boxes[j + 1][0][1] - boxes[j][0][1]) < 10 and boxes[j + 1][0][0] < boxes[j][0][0]:
+                boxes[j], boxes[j + 1] = boxes[j + 1], boxes[j]
+            else:
+                break
+    return boxes
+
+
+def rotate_crop(image: np.ndarray, points: np.ndarray) -> np.ndarray:
+    """Perspective-crop a quadrilateral text box into an upright strip."""
+    points = np.asarray(points, dtype=np.float32)
+    crop_width = int(max(np.linalg.norm(points[0] - points[1]), np.linalg.norm(points[2] - points[3])))
+    crop_height = int(max(np.linalg.norm(points[0] - points[3]), np.linalg.norm(points[1] - points[2])))
+    crop_width = max(crop_width, 1)
+    crop_height = max(crop_height, 1)
+    target = np.float32([[0, 0], [crop_width, 0], [crop_width, crop_height], [0, crop_height]])
+    matrix = cv2.getPerspectiveTransform(points, target)
+    crop = cv2.warpPerspective(
+        image,
+        matrix,
+        (crop_width, crop_height),
+        borderMode=cv2.BORDER_REPLICATE,
+        flags=cv2.INTER_CUBIC,
+    )
+    if crop.shape[0] / max(crop.shape[1], 1) >= 1.5:
+        crop = np.rot90(crop)
+    return crop
@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""ONNX Runtime backend for PP-OCR det/cls/rec models (CPU execution provider).
+
+The models come from ``export_onnx.py``; onnxruntime is installed from ``requirements-onnx.txt``.
+"""
+import math
+import os
+import sys
+from typing import Any, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    import cv2
+except Exception as exc:
+    print(f"Missing opencv dependency: {exc}", file=sys.stderr)
+    raise
+
+from ocr_boxes import rotate_crop, sorted_boxes
+
+DET_LIMIT_SIDE_LEN = 960
+DET_THRESH = 0.3
+DET_BOX_THRESH = 0.6
+DET_UNCLIP_RATIO = 1.5
+DET_MAX_CANDIDATES = 1000
+DET_MIN_SIZE = 3
+
+CLS_IMAGE_SHAPE = (3, 48, 192)
+CLS_LABELS = ["0", "180"]
+CLS_THRESH = 0.9
+
+REC_IMAGE_SHAPE = (3, 48, 320)
+REC_BATCH_NUM = 6
+
+DROP_SCORE = 0.5
+
+
+def _load_onnxruntime() -> Any:
+    # Optional dependency (requirements-onnx.txt): only imported once an ONNX engine is built.
+    try:
+        import onnxruntime
+    except Exception as exc:
+        print(f"Missing onnxruntime dependency: {exc}", file=sys.stderr)
+        raise
+    return onnxruntime
+
+
+def load_char_dict(path: str) -> List[str]:
+    with open(path, "rb") as handle:
+        chars = [line.decode("utf-8").strip("\n").strip("\r\n") for line in handle]
+    # Index 0 is the CTC blank; PP-OCR rec models append a trailing space class.
+    return ["blank"] + chars + [" "]
+
+
+def default_model_dir() -> str:
+    return os.getenv("OCR_ONNX_MODEL_DIR") or os.path.join(os.path.dirname(os.path.abspath(__file__)), "models", "onnx")
+
+
+def model_path(model_dir: str, stage: str, precision: str = "fp32") -> str:
+    """Resolve ``<stage>.onnx`` or its post-training-quantized ``<stage>_int8.onnx`` sibling."""
+    fp32_path = os.path.join(model_dir, f"{stage}.onnx")
+    if precision != "int8":
+        return fp32_path
+    int8_path = os.path.join(model_dir, f"{stage}_int8.onnx")
+    if os.path.exists(int8_path):
+        return int8_path
+    print(f"INT8 {stage} model not found at {int8_path}; falling back to {fp32_path}", file=sys.stderr)
+    return fp32_path
+
+
+class OnnxOCR:
+    """Run exported PP-OCR models with onnxruntime, mirroring ``PaddleOCR.ocr`` output shapes."""
+
+    def __init__(
+        self,
+        det_model_path: Optional[str],
+        rec_model_path: str,
+        rec_char_dict_path: str,
+        cls_model_path: Optional[str] = None,
+        num_threads: int = 0,
+    ) -> None:
+        ort = _load_onnxruntime()
+        options = ort.SessionOptions()
+        if num_threads > 0:
+            options.intra_op_num_threads = num_threads
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        providers = ["CPUExecutionProvider"]
+
+        self.det_session = None
+        if det_model_path:
+            self.det_session = ort.InferenceSession(det_model_path, sess_options=options, providers=providers)
+        self.rec_session = ort.InferenceSession(rec_model_path, sess_options=options, providers=providers)
+        self.cls_session = None
+        if cls_model_path and os.path.exists(cls_model_path):
+            self.cls_session = ort.InferenceSession(cls_model_path, sess_options=options, providers=providers)
+        self.use_angle_cls = self.cls_session is not None
+        self.characters = load_char_dict(rec_char_dict_path)
+
+    @classmethod
+    def from_env(cls, precision: str = "fp32") -> "OnnxOCR":
+        model_dir = default_model_dir()
+        dict_path = os.getenv("OCR_ONNX_REC_DICT") or os.path.join(model_dir, "rec_dict.txt")
+        try:
+            num_threads = int(os.getenv("OCR_ONNX_THREADS") or 0)
+        except ValueError:
+            num_threads = 0
+        return cls(
+            det_model_path=model_path(model_dir, "det", precision),
+            rec_model_path=model_path(model_dir, "rec", precision),
+            rec_char_dict_path=dict_path,
+            cls_model_path=os.path.join(model_dir, "cls.onnx"),
+            num_threads=num_threads,
+        )
+
+    def ocr(self, img: Any, det: bool = True, rec: bool = True, cls: bool = True) -> List[Any]:
+        if det:
+            dt_boxes = self.detect(img)
+            if not dt_boxes:
+                return [None]
+            if not rec:
+                return [[box.tolist() for box in dt_boxes]]
+
+            crops = [rotate_crop(img, box) for box in dt_boxes]
+            if cls and self.use_angle_cls:
+                crops, _ = self.classify(crops)
+            rec_res = self.recognize(crops)
+            result = [
+                [box.tolist(), (text, score)]
+                for box, (text, score) in zip(dt_boxes, rec_res)
+                if score >= DROP_SCORE
+            ]
+            return [result or None]
+
+        crops = img if isinstance(img, list) else [img]
+        if crops and isinstance(crops[0], list):
+            crops = crops[0]
+        cls_res: List[Tuple[str, float]] = []
+        if cls and self.use_angle_cls:
+            crops, cls_res = self.classify(crops)
+        if not rec:
+            return [cls_res]
+        return [self.recognize(crops)]
+
+    # Detection ---------------------------------------------------------------
+
+    def detect(self, image: np.ndarray) -> List[np.ndarray]:
+        if self.det_session is None:
+            raise RuntimeError("OnnxOCR was created without a detection model")
+        src_h, src_w = image.shape[:2]
+        tensor, (ratio_h, ratio_w) = self._det_preprocess(image)
+        input_name = self.det_session.get_inputs()[0].name
+        pred = self.det_session.run(None, {input_name: tensor})[0][0, 0]
+
+        bitmap = (pred > DET_THRESH).astype(np.uint8)
+        contours, _ = cv2.findContours(bitmap * 255, cv2.RETR_LIST, cv2.CHAIN_APPROX_SIMPLE)
+
+        boxes: List[np.ndarray] = []
+        for contour in contours[:DET_MAX_CANDIDATES]:
+            points, short_side = self._mini_box(contour)
+            if short_side < DET_MIN_SIZE:
+                continue
+            if self._box_score(pred, points) < DET_BOX_THRESH:
+                continue
+
+            expanded = self._unclip(points)
+            points, short_side = self._mini_box(expanded.reshape(-1, 1, 2))
+            if short_side < DET_MIN_SIZE + 2:
+                continue
+
+            points[:, 0] = np.clip(np.round(points[:, 0] / ratio_w), 0, src_w - 1)
+            points[:, 1] = np.clip(np.round(points[:, 1] / ratio_h), 0, src_h - 1)
+            points = self._order_clockwise(points)
+            width = int(np.linalg.norm(points[0] - points[1]))
+            height = int(np.linalg.norm(points[0] - points[3]))
+            if width <= 3 or height <= 3:
+                continue
+            boxes.append(points.astype(np.float32))
+
+        return sorted_boxes(np.array(boxes)) if boxes else []
+
+    @staticmethod
+    def _det_preprocess(image: np.ndarray) -> Tuple[np.ndarray, Tuple[float, float]]:
+        height, width = image.shape[:2]
+        ratio = 1.0
+        if max(height, width) > DET_LIMIT_SIDE_LEN:
+            ratio = DET_LIMIT_SIDE_LEN / max(height, width)
+        resize_h = max(int(round(height * ratio / 32) * 32), 32)
+        resize_w = max(int(round(width * ratio / 32) * 32), 32)
+        resized = cv2.resize(image, (resize_w, resize_h))
+
+        mean = np.array([0.485, 0.456, 0.406], dtype=np.float32)
+        std = np.array([0.229, 0.224, 0.225], dtype=np.float32)
+        normalized = (resized.astype(np.float32) / 255.0 - mean) / std
+        tensor = normalized.transpose(2, 0, 1)[np.newaxis, ...]
+        return np.ascontiguousarray(tensor), (resize_h / height, resize_w / width)
+
+    @staticmethod
+    def _mini_box(contour: np.ndarray) -> Tuple[np.ndarray, float]:
+        rect = cv2.minAreaRect(contour)
+        points = cv2.boxPoints(rect)
+        return points, min(rect[1])
+
+    @staticmethod
+    def _box_score(pred: np.ndarray, points: np.ndarray) -> float:
+        height, width = pred.shape
+        xmin = int(np.clip(np.floor(points[:, 0].min()), 0, width - 1))
+        xmax = int(np.clip(np.ceil(points[:, 0].max()), 0, width - 1))
+        ymin = int(np.clip(np.floor(points[:, 1].min()), 0, height - 1))
+        ymax = int(np.clip(np.ceil(points[:, 1].max()), 0, height - 1))
+        mask = np.zeros((ymax - ymin + 1, xmax - xmin + 1), dtype=np.uint8)
+        shifted = points.copy()
+        shifted[:, 0] -= xmin
+        shifted[:, 1] -= ymin
+        cv2.fillPoly(mask, shifted.reshape(1, -1, 2).astype(np.int32), 1)
+        return float(cv2.mean(pred[ymin : ymax + 1, xmin : xmax + 1], mask)[0])
+
+    @staticmethod
+    def _unclip(points: np.ndarray) -> np.ndarray:
+        # DB unclip offsets the polygon by area * ratio / perimeter; for the
+        # rectangular boxes we keep this equals growing each side by that distance.
+        (cx, cy), (w, h), angle = cv2.minAreaRect(points.astype(np.float32))
+        area = w * h
+        perimeter = 2 * (w + h)
+        distance = area * DET_UNCLIP_RATIO / perimeter if perimeter else 0.0
+        return cv2.boxPoints(((cx, cy), (w + 2 * distance, h + 2 * distance), angle))
+
+    @staticmethod
+    def _order_clockwise(points: np.ndarray) -> np.ndarray:
+        ordered = points[np.argsort(points[:, 0])]
+        left = ordered[:2]
+        right = ordered[2:]
+        top_left, bottom_left = left[np.argsort(left[:, 1])]
+        top_right, bottom_right = right[np.argsort(right[:, 1])]
+        return np.array([top_left, top_right, bottom_right, bottom_left], dtype=np.float32)
+
+    # Angle classification -----------------------------------------------------
+
+    def classify(self, crops: Sequence[np.ndarray]) -> Tuple[List[np.ndarray], List[Tuple[str, float]]]:
+        crops = list(crops)
+        results: List[Tuple[str, float]] = [("0", 0.0)] * len(crops)
+        if not crops or self.cls_session is None:
+            return crops, results
+
+        input_name = self.cls_session.get_inputs()[0].name
+        for start in range(0, len(crops), REC_BATCH_NUM):
+            batch_idx = list(range(start, min(start + REC_BATCH_NUM, len(crops))))
+            batch = np.stack([self._resize_norm(crops[i], CLS_IMAGE_SHAPE, CLS_IMAGE_SHAPE[2]) for i in batch_idx])
+            probs = self.cls_session.run(None, {input_name: batch})[0]
+            for offset, i in enumerate(batch_idx):
+                label_idx = int(np.argmax(probs[offset]))
+                label = CLS_LABELS[label_idx]
+                score = float(probs[offset][label_idx])
+                results[i] = (label, score)
+                if label == "180" and score > CLS_THRESH:
+                    crops[i] = cv2.rotate(np.ascontiguousarray(crops[i]), cv2.ROTATE_180)
+        return crops, results
+
+    # Recognition --------------------------------------------------------------
+
+    def recognize(self, crops: Sequence[np.ndarray]) -> List[Tuple[str, float]]:
+        results: List[Tuple[str, float]] = [("", 0.0)] * len(crops)
+        if not crops:
+            return results
+
+        # Batch similar aspect ratios together, as PaddleOCR does, to limit padding.
+        order = np.argsort([crop.shape[1] / max(crop.shape[0], 1) for crop in crops])
+        _, img_h, img_w = REC_IMAGE_SHAPE
+        input_name = self.rec_session.get_inputs()[0].name
+        for start in range(0, len(crops), REC_BATCH_NUM):
+            batch_idx = order[start : start + REC_BATCH_NUM]
+            max_ratio = img_w / img_h
+            for i in batch_idx:
+                max_ratio = max(max_ratio, crops[i].shape[1] / max(crops[i].shape[0], 1))
+            target_w = int(img_h * max_ratio)
+            batch = np.stack([self._resize_norm(crops[i], REC_IMAGE_SHAPE, target_w) for i in batch_idx])
+            probs = self.rec_session.run(None, {input_name: batch})[0]
+            for offset, i in enumerate(batch_idx):
+                results[i] = self._ctc_decode(probs[offset])
+        return results
+
+    def _ctc_decode(self, probs: np.ndarray) -> Tuple[str, float]:
+        indexes = probs.argmax(axis=1)
+        scores = probs.max(axis=1)
+        keep = indexes != 0
+        keep[1:] &= indexes[1:] != indexes[:-1]
+        chars = [self.characters[i] for i in indexes[keep] if i < len(self.characters)]
+        if not chars:
+            return "", 0.0
+        return "".join(chars), float(np.mean(scores[keep]))
+
+    @staticmethod
+    def _resize_norm(crop: np.ndarray, image_shape: Tuple[int, int, int], target_w: int) -> np.ndarray:
+        channels, img_h, _ = image_shape
+        height, width = crop.shape[:2]
+        ratio = width / max(height, 1)
+        resized_w = min(target_w, int(math.ceil(img_h * ratio)))
+        resized = cv2.resize(np.ascontiguousarray(crop), (max(resized_w, 1), img_h)).astype(np.float32)
+        if resized.ndim == 2:
+            resized = np.repeat(resized[:, :, np.newaxis], channels, axis=2)
+        resized = (resized.transpose(2, 0, 1) / 255.0 - 0.5) / 0.5
+        padded = np.zeros((channels, img_h, target_w), dtype=np.float32)
+        padded[:, :, : resized.shape[2]] = resized
+        return padded
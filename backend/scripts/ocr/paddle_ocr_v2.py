@@ -123,6 +123,7 @@ RESI_TAGIHAN_MARKERS = [
     "pospay",
 ]
 SUMMARY_TEMPLATE_CATEGORY = "saldo_pengeluaran_summary"
+SUMMARY_COLUMN_HEADERS = ["pemasukan", "pengeluaran", "saldo"]
 SUMMARY_TEMPLATE_PAGE_KEYWORDS = [
     "laporan",
     "pertanggung jawaban",
@@ -223,6 +224,43 @@ def x_center(bbox: List[float]) -> float:
     return sum(xs) / len(xs) if xs else 0.0
 
 
+def text_x(line: Dict[str, Any], start: int, end: int) -> float:
+    """Approximate x position of ``line["text"][start:end]`` by scaling its offset to the box width."""
+    xs = line["bbox"][0::2]
+    if not xs:
+        return 0.0
+    left, right = min(xs), max(xs)
+    length = max(len(line["text"]), 1)
+    return left + (right - left) * ((start + end) / 2.0) / length
+
+
+def amount_spans(text: str) -> List[Tuple[int, int, int]]:
+    """Return ``(start, end, amount)`` for each valid amount token in ``text``, left to right."""
+    spans: List[Tuple[int, int, int]] = []
+    for match in AMOUNT_RE.finditer(text):
+        value = parse_amount(match.group(1))
+        if value is not None and MIN_AMOUNT <= value <= MAX_VALID_AMOUNT:
+            spans.append((match.start(1), match.end(1), value))
+            continue
+        # Adjacent table cells ("1.250.000 750.000") read as one space-grouped number;
+        # retry the pieces separately.
+        for piece in re.finditer(r"\S+", match.group(1)):
+            value = parse_amount(piece.group(0))
+            if value is not None and MIN_AMOUNT <= value <= MAX_VALID_AMOUNT:
+                spans.append((match.start(1) + piece.start(), match.start(1) + piece.end(), value))
+
+    # Noisy runs only count where no regular token was read.
+    for match in NOISY_AMOUNT_RE.finditer(text):
+        if any(start < match.end() and match.start() < end for start, end, _value in spans):
+            continue
+        value = parse_amount(match.group(0))
+        if value is None or value < MIN_AMOUNT or value > MAX_VALID_AMOUNT:
+            continue
+        spans.append((match.start(), match.end(), value))
+    spans.sort()
+    return spans
+
+
 class OCRProcessor:
     """OCR processing and preprocessing pipeline."""
 
@@ -544,6 +582,84 @@ class TotalExtractor:
         return score
 
 
+class SummaryTableColumns:
+    """Assign already-recognized amounts to the pemasukan / pengeluaran / saldo columns.
+
+    Each amount token is placed at its x-projection inside its box (text offset scaled to the
+    box width), so a whole table row read as one box still splits into its cells. Projections
+    below the header are clustered on x gaps and each cluster goes to the nearest header cell
+    within ``tolerance``.
+    """
+
+    def __init__(self, header_cells: Dict[str, Tuple[float, float]], tolerance: float) -> None:
+        self.header_cells = header_cells
+        self.header_y = max(y for _x, y in header_cells.values())
+        self.tolerance = tolerance
+
+    @classmethod
+    def detect(
+        cls,
+        lines: List[Dict[str, Any]],
+        page_width: int,
+        header_hint_x: Optional[float] = None,
+    ) -> Optional["SummaryTableColumns"]:
+        if not lines:
+            return None
+        ordered = sorted(lines, key=lambda l: y_center(l["bbox"]))
+        header = next((line for line in ordered if "pengeluaran" in line["text"].lower()), None)
+        if header is not None:
+            header_y = y_center(header["bbox"])
+        elif header_hint_x is not None:
+            header_y = y_center(ordered[0]["bbox"])
+        else:
+            return None
+
+        # The other headers are looked up only on the pengeluaran header's row, so a
+        # "Saldo Awal" line above the table or a "saldo akhir" line below it is no column header.
+        header_cells: Dict[str, Tuple[float, float]] = {}
+        for line in ordered:
+            if abs(y_center(line["bbox"]) - header_y) > 40.0:
+                continue
+            text = line["text"].lower()
+            for name in SUMMARY_COLUMN_HEADERS:
+                start = text.find(name)
+                if name in header_cells or start < 0:
+                    continue
+                header_cells[name] = (text_x(line, start, start + len(name)), y_center(line["bbox"]))
+        if "pengeluaran" not in header_cells:
+            header_cells["pengeluaran"] = (float(header_hint_x), header_y)
+        return cls(header_cells, max(page_width * 0.14, 90))
+
+    def column_amounts(self, lines: List[Dict[str, Any]], column: str) -> List[Tuple[int, Dict[str, Any], float]]:
+        """Return ``(amount, line, x)`` for every amount below the header assigned to ``column``."""
+        tokens: List[Tuple[float, int, Dict[str, Any]]] = []
+        for line in lines:
+            if y_center(line["bbox"]) <= self.header_y:
+                continue
+            text = line["text"].lower()
+            for start, end, amount in amount_spans(text):
+                tokens.append((text_x(line, start, end), amount, line))
+        if not tokens:
+            return []
+
+        tokens.sort(key=lambda item: item[0])
+        gap = max(self.tolerance * 0.35, 25.0)
+        clusters: List[List[Tuple[float, int, Dict[str, Any]]]] = [[tokens[0]]]
+        for token in tokens[1:]:
+            if token[0] - clusters[-1][-1][0] > gap:
+                clusters.append([])
+            clusters[-1].append(token)
+
+        assigned: List[Tuple[int, Dict[str, Any], float]] = []
+        for cluster in clusters:
+            centroid = sum(x for x, _amount, _line in cluster) / len(cluster)
+            name, (header_x, _header_y) = min(self.header_cells.items(), key=lambda item: abs(item[1][0] - centroid))
+            if name != column or abs(header_x - centroid) > self.tolerance:
+                continue
+            assigned.extend((amount, line, x) for x, amount, line in cluster)
+        return assigned
+
+
 class OCRService:
     """End-to-end OCR pipeline."""
 
@@ -563,8 +679,9 @@ class OCRService:
         if not pages:
             return {"error": "No pages to process", "grand_total": None}
 
-        focus_page_indexes = self._find_summary_focus_page_indexes(pages)
-        summary_template = self._detect_summary_template(pages, focus_page_indexes)
+        summary_lines: Dict[int, List[Dict[str, Any]]] = {}
+        focus_page_indexes = self._find_summary_focus_page_indexes(pages, summary_lines)
+        summary_template = self._detect_summary_template(pages, focus_page_indexes, summary_lines)
         if summary_template is not None:
             detected_page = summary_template["page"]
             detected_total = summary_template["total"]
@@ -734,10 +851,22 @@ class OCRService:
 
         return score
 
-    def _find_summary_focus_page_indexes(self, pages: List[Image.Image]) -> List[int]:
+    def _summary_page_lines(
+        self, pages: List[Image.Image], page_idx: int, cache: Optional[Dict[int, List[Dict[str, Any]]]]
+    ) -> List[Dict[str, Any]]:
+        if cache is not None and page_idx in cache:
+            return cache[page_idx]
+        lines = self.processor.run(pages[page_idx], handwritten=False, conf_threshold=0.35)
+        if cache is not None:
+            cache[page_idx] = lines
+        return lines
+
+    def _find_summary_focus_page_indexes(
+        self, pages: List[Image.Image], page_lines: Optional[Dict[int, List[Dict[str, Any]]]] = None
+    ) -> List[int]:
         scored_indexes: List[Tuple[int, float]] = []
         for page_idx, image in enumerate(pages):
-            lines = self.processor.run(image, handwritten=False, conf_threshold=0.35)
+            lines = self._summary_page_lines(pages, page_idx, page_lines)
             if self._has_summary_focus_keyword(lines):
                 score = self._score_summary_page(lines, image.width, image.height)
                 scored_indexes.append((page_idx, score))
@@ -752,6 +881,7 @@ class OCRService:
         self,
         pages: List[Image.Image],
         focus_page_indexes: Optional[List[int]] = None,
+        page_lines: Optional[Dict[int, List[Dict[str, Any]]]] = None,
     ) -> Optional[Dict[str, Any]]:
         if not pages:
             return None
@@ -765,7 +895,7 @@ class OCRService:
 
         for page_idx in candidate_indexes:
             image = pages[page_idx]
-            lines = self.processor.run(image, handwritten=False, conf_threshold=0.35)
+            lines = self._summary_page_lines(pages, page_idx, page_lines)
             candidate_pages.append((page_idx, image, lines))
             if header_hint_x is None:
                 header_lines = [line for line in lines if "pengeluaran" in line["text"].lower()]
@@ -776,7 +906,7 @@ class OCRService:
             if not lines:
                 continue
 
-            extracted = self._extract_pengeluaran_summary_total(lines, image.width, image, header_hint_x)
+            extracted = self._extract_pengeluaran_summary_total(lines, image.width, header_hint_x)
             if extracted is None:
                 continue
 
@@ -795,7 +925,6 @@ class OCRService:
         self,
         lines: List[Dict[str, Any]],
         page_width: int,
-        image: Optional[Image.Image] = None,
         header_hint_x: Optional[float] = None,
     ) -> Optional[Tuple[int, float, List[float]]]:
         text_joined = "\n".join(line["text"].lower() for line in lines)
@@ -1014,16 +1143,10 @@ class OCRService:
                         score -= 0.08
                 column_candidates.append((amount, min(score, 0.97), line["bbox"], yc))
 
-        # Extra OCR pass focused on the pengeluaran column area (fallback only).
-        if image is not None and len(column_candidates) < 2:
-            column_candidates.extend(
-                self._ocr_pengeluaran_column_candidates(
-                    image=image,
-                    header_x=header_x,
-                    header_y=header_y,
-                    page_width=page_width,
-                )
-            )
+        # Fallback: assign every recognized amount to a table column by x-projection and
+        # read the pengeluaran column from there, instead of OCR-ing a column crop again.
+        if len(column_candidates) < 2:
+            column_candidates.extend(self._table_column_candidates(lines, page_width, header_hint_x))
 
         if not column_candidates:
             return phrase_best
@@ -1044,52 +1167,24 @@ class OCRService:
         best_amount, best_conf, best_bbox, _ = bottom_candidates[0]
         return best_amount, best_conf, best_bbox
 
-    def _ocr_pengeluaran_column_candidates(
-        self,
-        image: Image.Image,
-        header_x: float,
-        header_y: float,
+    @staticmethod
+    def _table_column_candidates(
+        lines: List[Dict[str, Any]],
         page_width: int,
+        header_hint_x: Optional[float],
     ) -> List[Tuple[int, float, List[float], float]]:
-        candidates: List[Tuple[int, float, List[float], float]] = []
+        table = SummaryTableColumns.detect(lines, page_width, header_hint_x)
+        if table is None:
+            return []
 
-        col_half_width = max(int(page_width * 0.14), 90)
-        x1 = max(int(header_x) - col_half_width, 0)
-        x2 = min(int(header_x) + col_half_width, image.width)
-        y1 = max(int(header_y), 0)
-        y2 = image.height
-        if x2 <= x1 or y2 <= y1:
-            return candidates
-
-        crop = image.crop((x1, y1, x2, y2))
-        focused_lines = self.processor.run(crop, handwritten=False, conf_threshold=0.18)
-        if not focused_lines:
-            return candidates
-
-        focused_lines = sorted(focused_lines, key=lambda l: y_center(l["bbox"]))
-        for idx, line in enumerate(focused_lines):
+        candidates: List[Tuple[int, float, List[float], float]] = []
+        for amount, line, _x in table.column_amounts(lines, "pengeluaran"):
             line_text = line["text"].lower()
             line_conf = min(float(line.get("confidence", 0.0)), 1.0)
-
-            merged_texts = [line_text]
-            if idx + 1 < len(focused_lines):
-                next_text = focused_lines[idx + 1]["text"].lower()
-                merged_texts.append(f"{line_text} {next_text}")
-
-            for candidate_text in merged_texts:
-                for amount in self._amounts_from_line(candidate_text):
-                    bbox = list(line["bbox"])
-                    for i in range(0, len(bbox), 2):
-                        bbox[i] += x1
-                    for i in range(1, len(bbox), 2):
-                        bbox[i] += y1
-
-                    yc = y_center(bbox)
-                    score = 0.82 + line_conf * 0.14
-                    if "total" in candidate_text or "jumlah" in candidate_text:
-                        score += 0.04
-                    candidates.append((amount, min(score, 0.99), bbox, yc))
-
+            score = 0.82 + line_conf * 0.14
+            if "total" in line_text or "jumlah" in line_text:
+                score += 0.04
+            candidates.append((amount, min(score, 0.99), line["bbox"], y_center(line["bbox"])))
         return candidates
 
     def _process_page(self, image: Image.Image) -> Dict[str, Any]:
@@ -6,7 +6,9 @@ import logging
 import os
 import re
 import sys
-from typing import Any, Dict, List, Optional, Tuple
+import time
+import zlib
+from typing import Any, Callable, Dict, FrozenSet, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Set, Tuple
 
 import numpy as np
 
@@ -16,12 +18,6 @@ except Exception as exc:
     print(f"Missing opencv dependency: {exc}", file=sys.stderr)
     raise
 
-try:
-    from paddleocr import PaddleOCR
-except Exception as exc:
-    print(f"Missing paddleocr dependency: {exc}", file=sys.stderr)
-    raise
-
 try:
     from PIL import Image, ImageOps
 except Exception as exc:
@@ -33,21 +29,24 @@ try:
 except Exception:
     convert_from_path = None
 
+from ocr_boxes import rotate_crop, sorted_boxes
+from receipt_heuristics import (
+    MAX_VALID_AMOUNT,
+    MIN_AMOUNT,
+    amounts_from_line,
+    amounts_in_text,
+    edit_distance,
+    emv_amount,
+)
+
 LOG = logging.getLogger("ocr_v2")
 logging.basicConfig(level=logging.INFO, format="[%(levelname)s] %(message)s")
 
-MAX_AMOUNT = 100_000_000
-MIN_AMOUNT = 1_000
-MAX_VALID_AMOUNT = 100_000_000
 MIN_HANDWRITTEN_AMOUNT = 10_000
 MIN_SCORE_THRESHOLD = 0.6
 RETAIL_MIN_SCORE_THRESHOLD = 0.5
 
-AMOUNT_RE = re.compile(
-    r"(?:(?:rp|idr)\s*)?(\d{1,3}(?:[.,\s]\d{3})+(?:[.,]\d{2})?|\d+(?:[.,]\d{2})?)",
-    re.IGNORECASE,
-)
-NOISY_AMOUNT_RE = re.compile(r"\d[\d.,\s]{3,}\d")
+NUMERIC_LINE_RE = re.compile(r"[\d.,\s]+")
 
 TOTAL_KEYWORDS = [
     "total",
@@ -138,6 +137,56 @@ BLOCKED_BILLING_TOKENS = [
     "tax",
     "subtotal",
 ]
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+OCR_BACKENDS = {"paddle", "onnx"}
+MODEL_PRECISIONS = {"fp32", "int8"}
+ORIENTATION_MODES = {"page", "box"}
+ORIENTATION_SAMPLE_SIZE = 12
+ORIENTATION_AGREEMENT = 0.8
+EARLY_EXIT_DEFAULT_CONFIDENCE = 0.95
+EARLY_EXIT_DEFAULT_BANDS = 4
+PREPROCESS_MAX_WIDTH = 1600
+SEGMENT_GUTTER_X = 5.0
+SEGMENT_GUTTER_Y = 5.0
+SEGMENT_MIN_GROUP_LINES = 3
+SEGMENT_MIN_CLUSTERS = 3
+SUMMARY_LOWRES_DEFAULT_WIDTH = 800
+BLANK_PAGE_DEFAULT_INK_RATIO = 0.0005
+BLANK_PAGE_THUMBNAIL_SIDE = 512
+BLANK_PAGE_INK_CONTRAST = 60
+BLANK_PAGE_BACKGROUND_WINDOW = 31
+QR_RECEIPT_MARGIN_X = 1.0
+QR_RECEIPT_MARGIN_Y = 2.5
+QR_OUTSIDE_INK_RATIO = 0.002
+TEMPLATE_HEADER_BAND = 0.3
+TEMPLATE_HASH_SIZE = 16
+TEMPLATE_MAX_DISTANCE = 24
+TEMPLATE_HEADER_WIDTH = 800
+TEMPLATE_HEADER_MIN_WORDS = 3
+TEMPLATE_HEADER_MIN_SIMILARITY = 0.6
+TEMPLATE_HEADER_WORD_RE = re.compile(r"[A-Z]{3,}")
+TEMPLATE_MAX_ASPECT_DELTA = 0.05
+TEMPLATE_PADDING_X = 0.04
+TEMPLATE_PADDING_Y = 0.04
+TEMPLATE_MAX_MISSES = 3
+TEMPLATE_LIBRARY_SIZE = 200
+TRIAGE_WIDTH = 1000
+TRIAGE_LOW_CONTRAST = 90.0
+TRIAGE_MIN_SHARPNESS = 50.0
+TRIAGE_PEN_STROKE_WIDTH = 3.0
+TRIAGE_PEN_STROKE_VARIATION = 0.25
+SUMMARY_ROI_ROW_BELOW = 120
+SUMMARY_ROI_PADDING = 24
+REC_DROP_SCORE = 0.5
+ROW_OVERLAP_RATIO = 0.5
+CLASSIFIER_MEMO_SIZE = 64
+DUPLICATE_BOX_IOU = 0.6
+CLS_ROTATE_THRESHOLD = 0.9
+NUMERIC_BOX_MIN_ASPECT = 2.0
+NUMERIC_BOX_MAX_ASPECT = 10.0
+NUMERIC_BOX_MIN_RIGHT_RATIO = 0.6
+NUMERIC_COLUMN_TOLERANCE = 1.0
+NUMERIC_REC_MIN_CONFIDENCE = 0.8
 SUMMARY_TEMPLATE_CATEGORY = "saldo_pengeluaran_summary"
 SUMMARY_TEMPLATE_PAGE_KEYWORDS = [
     "laporan",
@@ -146,77 +195,214 @@ SUMMARY_TEMPLATE_PAGE_KEYWORDS = [
     "rekap",
     "rekapitulasi",
 ]
+SUMMARY_REPORT_TERMS = [
+    "laporan",
+    "laporan pertanggung jawaban",
+    "laporan pertanggungjawaban",
+    "pertanggung jawaban",
+    "pertanggungjawaban",
+    "pertanggung",
+    "jawab",
+    "rekap",
+    "rekapitulasi",
+    "pengeluaran",
+    "saldo",
+    "jumlah",
+    "total",
+]
+SUMMARY_TABLE_TERMS = ["saldo", "debet", "kredit", "jumlah", "total"]
+TOTAL_BAYAR_ANCHORS = ["total bayar", "total pembayaran", "jumlah pembayaran"]
+BILLING_TERMS = ["tagihan", "jumlah tagihan", "total tagihan", "total admin", "bayar", "pembayaran"]
+STRONG_BILLING_ANCHORS = ["jumlah tagihan", "total tagihan", "total bayar", "total pembayaran", "grand total", "total"]
+WEAK_BILLING_ANCHORS = ["tagihan"]
+PAGE_BILLING_ANCHORS = frozenset(TOTAL_BAYAR_ANCHORS + ["jumlah tagihan", "total tagihan"])
+TOTAL_BAYAR_BLOCKED_TOKENS = ["npwp", "resi", "telepon", "pelanggan", "tanggal", "jam"]
 
 
-def parse_amount(raw: str) -> Optional[int]:
-    text = raw.lower().replace("rp", "").replace("idr", "")
-    text = text.replace(" ", "").strip()
-    if not text:
-        return None
+class KeywordHits:
+    """Keywords found in one text, queryable by keyword class."""
 
-    text = re.sub(r"[^0-9.,]", "", text)
-    if not text:
-        return None
+    __slots__ = ("keywords", "_groups")
 
-    # OCR can split thousand groups oddly, e.g. 168.00,00 instead of 168.000,00.
-    # Normalize this specific malformed pattern before generic parsing.
-    if re.match(r"^\d{1,3}[.,]\d{2}[.,]00$", text):
-        parts = re.split(r"[.,]", text)
-        if len(parts) == 3:
-            text = f"{parts[0]}{parts[1]}0,00"
-
-    decimal_sep_match = re.search(r"([.,])(\d{2})$", text)
-    decimal_sep = decimal_sep_match.group(1) if decimal_sep_match else None
-    decimal_tail = decimal_sep_match.group(2) if decimal_sep_match else None
-
-    if "," in text and "." in text:
-        last_comma = text.rfind(",")
-        last_dot = text.rfind(".")
-        if last_comma > last_dot:
-            text = text.replace(".", "").replace(",", ".")
-        else:
-            text = text.replace(",", "")
-    elif "." in text and "," not in text:
-        parts = text.split(".")
-        if len(parts) > 2:
-            text = text.replace(".", "")
-        else:
-            right = parts[1] if len(parts) == 2 else ""
-            if len(right) == 3:
-                text = text.replace(".", "")
-    elif "," in text and "." not in text:
-        parts = text.split(",")
-        if len(parts) > 2:
-            text = text.replace(",", "")
-        else:
-            right = parts[1] if len(parts) == 2 else ""
-            if len(right) <= 2:
-                text = text.replace(",", ".")
-            else:
-                text = text.replace(",", "")
+    def __init__(self, keywords: FrozenSet[str], groups: Dict[str, FrozenSet[str]]) -> None:
+        self.keywords = keywords
+        self._groups = groups
 
-    if decimal_sep and decimal_tail == "00":
-        stripped = re.sub(r"\D", "", text)
-        if len(stripped) >= 3 and stripped.endswith("00"):
-            text = stripped[:-2]
+    def __contains__(self, keyword: str) -> bool:
+        return keyword in self.keywords
 
-    text = text.replace(".", "")
-    text = text.replace(",", "")
+    def has(self, group: str) -> bool:
+        return not self.keywords.isdisjoint(self._groups[group])
 
-    if not text.isdigit():
-        digits_only = re.sub(r"\D", "", text)
-        if digits_only.isdigit():
-            text = digits_only
-        else:
+    def count(self, group: str) -> int:
+        return len(self.keywords & self._groups[group])
+
+    def __or__(self, other: "KeywordHits") -> "KeywordHits":
+        return KeywordHits(self.keywords | other.keywords, self._groups)
+
+
+class KeywordMatcher:
+    """Find the keywords of every marker list in a single regex pass over a text.
+
+    The vocabulary is compiled as a prefix trie inside one lookahead, so each position
+    reports its longest keyword; the shorter keywords that are prefixes of it are added
+    from a precomputed table. The result equals testing ``kw in text`` for every keyword.
+    """
+
+    def __init__(self, groups: Dict[str, Sequence[str]]) -> None:
+        self.groups = {name: frozenset(words) for name, words in groups.items()}
+        vocabulary = sorted(set().union(*self.groups.values()))
+        self._implied = {kw: frozenset(other for other in vocabulary if kw.startswith(other)) for kw in vocabulary}
+        self._pattern = re.compile("(?=(" + self._trie_pattern(vocabulary) + "))")
+
+    def scan(self, text: str) -> KeywordHits:
+        found: set = set()
+        for match in self._pattern.finditer(text):
+            found |= self._implied[match.group(1)]
+        return KeywordHits(frozenset(found), self.groups)
+
+    @staticmethod
+    def _trie_pattern(words: Sequence[str]) -> str:
+        trie: Dict[str, Any] = {}
+        for word in words:
+            node = trie
+            for ch in word:
+                node = node.setdefault(ch, {})
+            node[""] = {}
+
+        def build(node: Dict[str, Any]) -> str:
+            branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+            if not branches:
+                return ""
+            body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+            # A keyword ending here is a prefix of the longer branches; the greedy
+            # optional tries the longer keyword first.
+            return "(?:" + body + ")?" if "" in node else body
+
+        return build(trie)
+
+
+KEYWORDS = KeywordMatcher(
+    {
+        "total": TOTAL_KEYWORDS,
+        "retail_rank": RETAIL_RANK_KEYWORDS,
+        "negative_near": NEGATIVE_NEAR,
+        "negative_context": V3_NEGATIVE_CONTEXT,
+        "blocked_billing": BLOCKED_BILLING_TOKENS,
+        "total_bayar_blocked": TOTAL_BAYAR_BLOCKED_TOKENS,
+        "retail": RETAIL_MARKERS,
+        "institutional": INSTITUTIONAL_MARKERS,
+        "payment": PAYMENT_MARKERS,
+        "simple": SIMPLE_MARKERS,
+        "resi_tagihan": RESI_TAGIHAN_MARKERS,
+        "summary_page": SUMMARY_TEMPLATE_PAGE_KEYWORDS,
+        "summary_report": SUMMARY_REPORT_TERMS,
+        "summary_table": SUMMARY_TABLE_TERMS,
+        "total_bayar": TOTAL_BAYAR_ANCHORS,
+        "billing": BILLING_TERMS,
+        "strong_billing": STRONG_BILLING_ANCHORS,
+        "weak_billing": WEAK_BILLING_ANCHORS,
+    }
+)
+
+
+# Anchor words the cheap strategies key on; OCR misreads of these ("tota1", "jumiah",
+# "tagiham") are also matched as the canonical word. Negative/blocking words stay exact.
+FUZZY_ANCHOR_WORDS = ["total", "bayar", "pembayaran", "jumlah", "tagihan", "sebesar", "pengeluaran"]
+FUZZY_MIN_TOKEN_LENGTH = 5
+FUZZY_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+class FuzzyKeywordIndex:
+    """SymSpell-style deletion index that resolves OCR-garbled tokens to anchor words.
+
+    Each vocabulary word is stored under every string reachable by deleting up to
+    ``max_distance`` characters. A token is looked up through its own deletions, so the
+    cost depends on the token length only; candidates are confirmed with an exact edit
+    distance and used only when exactly one word matches.
+    """
+
+    def __init__(self, words: Sequence[str], max_distance: int = 1, min_length: int = FUZZY_MIN_TOKEN_LENGTH) -> None:
+        self.words = frozenset(words)
+        self.max_distance = max_distance
+        self.min_length = min_length
+        self._deletes: Dict[str, set] = {}
+        for word in self.words:
+            for variant in self._deletions(word, max_distance):
+                self._deletes.setdefault(variant, set()).add(word)
+        self._resolved: Dict[str, Optional[str]] = {}
+
+    @classmethod
+    def from_env(cls, words: Sequence[str]) -> "FuzzyKeywordIndex":
+        raw = (os.getenv("OCR_FUZZY_KEYWORD_DISTANCE") or "1").strip()
+        try:
+            distance = max(0, min(int(raw), 2))
+        except ValueError:
+            distance = 1
+        return cls(words, max_distance=distance)
+
+    @staticmethod
+    def _deletions(word: str, distance: int) -> set:
+        variants = {word}
+        frontier = {word}
+        for _ in range(distance):
+            frontier = {variant[:i] + variant[i + 1 :] for variant in frontier for i in range(len(variant))}
+            variants |= frontier
+        return variants
+
+    def resolve(self, token: str) -> Optional[str]:
+        if token in self.words:
+            return token
+        if self.max_distance <= 0 or len(token) < self.min_length or token.isdigit():
             return None
+        if token not in self._resolved:
+            candidates: set = set()
+            for variant in self._deletions(token, self.max_distance):
+                candidates |= self._deletes.get(variant, set())
+            matches = [word for word in candidates if edit_distance(token, word, self.max_distance) <= self.max_distance]
+            self._resolved[token] = matches[0] if len(matches) == 1 else None
+        return self._resolved[token]
 
-    if not text.isdigit():
-        return None
+    def repair(self, text: str, letters_only: bool = False) -> str:
+        """Replace garbled anchor words in lowercase ``text`` with their canonical spelling.
 
-    value = int(text)
-    if value <= 0 or value > MAX_AMOUNT:
-        return None
-    return value
+        ``letters_only`` leaves tokens containing digits alone, for text that deliberately
+        does not get the digit-for-letter OCR normalization.
+        """
+        if self.max_distance <= 0:
+            return text
+
+        def fix(match: "re.Match[str]") -> str:
+            token = match.group(0)
+            if letters_only and not token.isalpha():
+                return token
+            return self.resolve(token) or token
+
+        return FUZZY_TOKEN_RE.sub(fix, text)
+
+
+FUZZY_KEYWORDS = FuzzyKeywordIndex.from_env(FUZZY_ANCHOR_WORDS)
+
+
+def scan_keywords(text: str, normalized: bool = False) -> KeywordHits:
+    """Keyword hits of ``text`` plus those of its fuzzy-repaired form, so repair only adds hits.
+
+    Digit misreads ("tota1") are only repaired in ``normalized`` (``0->o``) text.
+    """
+    hits = KEYWORDS.scan(text)
+    repaired = FUZZY_KEYWORDS.repair(text, letters_only=not normalized)
+    if repaired != text:
+        hits = hits | KEYWORDS.scan(repaired)
+    return hits
+
+
+def _load_paddleocr() -> Any:
+    try:
+        from paddleocr import PaddleOCR
+    except Exception as exc:
+        print(f"Missing paddleocr dependency: {exc}", file=sys.stderr)
+        raise
+    return PaddleOCR
 
 
 def y_center(bbox: List[float]) -> float:
@@ -229,17 +415,482 @@ def x_center(bbox: List[float]) -> float:
     return sum(xs) / len(xs) if xs else 0.0
 
 
+class Line:
+    """One recognized text box.
+
+    Supports the ``line["text"]`` / ``line.get(...)`` access of the original dict records,
+    and caches the derived values every strategy asks for (lowercased and ``0->o``
+    normalized text and their keyword hits, centers, height, parsed amounts) on first use.
+    """
+
+    FIELDS = ("text", "confidence", "bbox", "box_points")
+    __slots__ = FIELDS + (
+        "_text_lower",
+        "_text_norm",
+        "_hits",
+        "_hits_norm",
+        "_x_center",
+        "_y_center",
+        "_height",
+        "_amounts",
+        "_numeric",
+    )
+
+    def __init__(self, text: str, confidence: float, bbox: List[float], box_points: Any = None) -> None:
+        self.text = text
+        self.confidence = confidence
+        self.bbox = bbox
+        self.box_points = box_points
+        self._text_lower: Optional[str] = None
+        self._text_norm: Optional[str] = None
+        self._hits: Optional[KeywordHits] = None
+        self._hits_norm: Optional[KeywordHits] = None
+        self._x_center: Optional[float] = None
+        self._y_center: Optional[float] = None
+        self._height: Optional[float] = None
+        self._amounts: Optional[List[int]] = None
+        self._numeric: Optional[bool] = None
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self.FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.FIELDS
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key) if key in self.FIELDS else default
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {key: getattr(self, key) for key in self.FIELDS}
+
+    def scaled(self, factor: float) -> "Line":
+        bbox = [coord * factor for coord in self.bbox]
+        box_points = self.box_points
+        if isinstance(box_points, list):
+            box_points = [[pt[0] * factor, pt[1] * factor] for pt in box_points]
+        return Line(self.text, self.confidence, bbox, box_points)
+
+    def shifted(self, offset_x: float, offset_y: float) -> "Line":
+        bbox = [coord + (offset_x if i % 2 == 0 else offset_y) for i, coord in enumerate(self.bbox)]
+        box_points = self.box_points
+        if isinstance(box_points, list):
+            box_points = [[pt[0] + offset_x, pt[1] + offset_y] for pt in box_points]
+        return Line(self.text, self.confidence, bbox, box_points)
+
+    @property
+    def text_lower(self) -> str:
+        if self._text_lower is None:
+            self._text_lower = self.text.lower()
+        return self._text_lower
+
+    @property
+    def text_norm(self) -> str:
+        if self._text_norm is None:
+            self._text_norm = self.text_lower.replace("0", "o")
+        return self._text_norm
+
+    @property
+    def hits(self) -> KeywordHits:
+        if self._hits is None:
+            self._hits = scan_keywords(self.text_lower)
+        return self._hits
+
+    @property
+    def hits_norm(self) -> KeywordHits:
+        if self._hits_norm is None:
+            self._hits_norm = scan_keywords(self.text_norm, normalized=True)
+        return self._hits_norm
+
+    @property
+    def x_center(self) -> float:
+        if self._x_center is None:
+            self._x_center = x_center(self.bbox)
+        return self._x_center
+
+    @property
+    def y_center(self) -> float:
+        if self._y_center is None:
+            self._y_center = y_center(self.bbox)
+        return self._y_center
+
+    @property
+    def height(self) -> float:
+        if self._height is None:
+            self._height = ReceiptClassifier._bbox_height(self.bbox)
+        return self._height
+
+    @property
+    def amounts(self) -> List[int]:
+        if self._amounts is None:
+            self._amounts = OCRService._amounts_from_line(self.text_lower)
+        return self._amounts
+
+    @property
+    def is_numeric(self) -> bool:
+        if self._numeric is None:
+            self._numeric = NUMERIC_LINE_RE.fullmatch(self.text_lower) is not None
+        return self._numeric
+
+
+class PageGeometry:
+    """Columnar view of a page's boxes: an N x 8 coordinate array plus derived centers and heights."""
+
+    def __init__(self, lines: Sequence[Line]) -> None:
+        self.boxes = np.array([line.bbox for line in lines], dtype=np.float64).reshape(len(lines), 8)
+        xs = self.boxes[:, 0::2]
+        ys = self.boxes[:, 1::2]
+        self.x_centers = xs.mean(axis=1)
+        self.y_centers = ys.mean(axis=1)
+        self.heights = ys.max(axis=1, initial=-np.inf) - ys.min(axis=1, initial=np.inf)
+
+    def order(self, axis: str) -> np.ndarray:
+        centers = self.x_centers if axis == "x" else self.y_centers
+        return np.argsort(centers, kind="stable")
+
+    def largest_gap(self, axis: str) -> Tuple[np.ndarray, float, Optional[int]]:
+        """Return the sorted order along ``axis`` and the widest gap between consecutive centers."""
+        order = self.order(axis)
+        centers = (self.x_centers if axis == "x" else self.y_centers)[order]
+        if len(centers) < 2:
+            return order, 0.0, None
+        gaps = np.diff(centers)
+        split = int(np.argmax(gaps))
+        if gaps[split] <= 0:
+            return order, 0.0, None
+        return order, float(gaps[split]), split + 1
+
+
+class SpatialIndex:
+    """A page's lines sorted once top to bottom, with bisect lookups by pixel position."""
+
+    def __init__(self, lines: "LineSet") -> None:
+        order = lines.geometry.order("y")
+        self.ordered = lines.take(order)
+        self.y_centers = lines.geometry.y_centers[order]
+        self.x_centers = lines.geometry.x_centers[order]
+        # The sorted set is its own index, so strategies handed ``ordered`` never re-sort.
+        self.ordered.__dict__["_spatial"] = self
+
+    def __len__(self) -> int:
+        return len(self.ordered)
+
+    def span(self, y_from: float, y_to: float) -> range:
+        """Positions in ``ordered`` whose vertical center lies within [y_from, y_to]."""
+        lo = int(np.searchsorted(self.y_centers, y_from, side="left"))
+        hi = int(np.searchsorted(self.y_centers, y_to, side="right"))
+        return range(lo, max(lo, hi))
+
+    def column(self, center_x: float, tolerance: float, below_y: float) -> "LineSet":
+        """Lines strictly below ``below_y`` whose center lies within ``tolerance`` of ``center_x``."""
+        start = int(np.searchsorted(self.y_centers, below_y, side="right"))
+        in_column = np.abs(self.x_centers[start:] - center_x) <= tolerance
+        return self.ordered.take(np.flatnonzero(in_column) + start)
+
+
+class TokenIndex:
+    """Inverted index from keyword to the positions of the lines containing it.
+
+    Positions refer to ``spatial.ordered`` of the indexed set. ``normalized=True`` looks keywords
+    up in the ``0->o`` normalized text, the OCR-tolerant variant some anchors are matched on.
+    """
+
+    def __init__(self, ordered: "LineSet") -> None:
+        self._raw: Dict[str, List[int]] = {}
+        self._normalized: Dict[str, List[int]] = {}
+        for pos, line in enumerate(ordered):
+            for keyword in line.hits.keywords:
+                self._raw.setdefault(keyword, []).append(pos)
+            for keyword in line.hits_norm.keywords:
+                self._normalized.setdefault(keyword, []).append(pos)
+
+    def positions(self, keywords: Iterable[str], normalized: bool = False) -> List[int]:
+        table = self._normalized if normalized else self._raw
+        found: set = set()
+        for keyword in keywords:
+            found.update(table.get(keyword, ()))
+        return sorted(found)
+
+    def has_any(self, keywords: Iterable[str], normalized: bool = False) -> bool:
+        table = self._normalized if normalized else self._raw
+        return any(keyword in table for keyword in keywords)
+
+
+class RowIndex:
+    """Lines clustered into visual rows by overlapping vertical extent.
+
+    A line joins the current row when it overlaps the row's first line vertically by at least
+    ``ROW_OVERLAP_RATIO`` of the shorter height. Rows run top to bottom and hold positions of
+    ``spatial.ordered`` left to right, so a label whose amount was detected as a separate box
+    is paired with it by one row lookup.
+    """
+
+    def __init__(self, ordered: "LineSet") -> None:
+        boxes = ordered.geometry.boxes
+        ys = boxes[:, 1::2]
+        tops = ys.min(axis=1, initial=np.inf)
+        bottoms = ys.max(axis=1, initial=-np.inf)
+        x_centers = ordered.geometry.x_centers
+        self.rows: List[List[int]] = []
+        self.row_at: List[int] = []
+        row_top = row_bottom = 0.0
+        for pos in range(len(ordered)):
+            top, bottom = float(tops[pos]), float(bottoms[pos])
+            if self.rows:
+                overlap = min(bottom, row_bottom) - max(top, row_top)
+                if overlap > 0 and overlap >= ROW_OVERLAP_RATIO * min(bottom - top, row_bottom - row_top):
+                    self.rows[-1].append(pos)
+                    self.row_at.append(len(self.rows) - 1)
+                    continue
+            self.rows.append([pos])
+            self.row_at.append(len(self.rows) - 1)
+            row_top, row_bottom = top, bottom
+        for row in self.rows:
+            row.sort(key=lambda pos: x_centers[pos])
+        self._x_starts = boxes[:, 0::2].min(axis=1, initial=np.inf)
+        self._x_centers = x_centers
+
+    def right_of(self, pos: int) -> List[int]:
+        """Positions of the other lines in ``pos``'s row that start right of its center."""
+        center = self._x_centers[pos]
+        return [other for other in self.rows[self.row_at[pos]] if other != pos and self._x_starts[other] > center]
+
+    def duplicates(self, ordered: "LineSet") -> set:
+        """Positions of lines that repeat a higher-confidence detection of the same text in their row."""
+        dropped: set = set()
+        boxes = ordered.geometry.boxes
+        xs, ys = boxes[:, 0::2], boxes[:, 1::2]
+        for row in self.rows:
+            for i, first in enumerate(row):
+                for second in row[i + 1:]:
+                    if first in dropped or second in dropped:
+                        continue
+                    a_text = ordered[first].text_lower.replace(" ", "")
+                    b_text = ordered[second].text_lower.replace(" ", "")
+                    if a_text not in b_text and b_text not in a_text:
+                        continue
+                    inter_w = min(xs[first].max(), xs[second].max()) - max(xs[first].min(), xs[second].min())
+                    inter_h = min(ys[first].max(), ys[second].max()) - max(ys[first].min(), ys[second].min())
+                    if inter_w <= 0 or inter_h <= 0:
+                        continue
+                    inter = inter_w * inter_h
+                    area_a = (xs[first].max() - xs[first].min()) * (ys[first].max() - ys[first].min())
+                    area_b = (xs[second].max() - xs[second].min()) * (ys[second].max() - ys[second].min())
+                    union = area_a + area_b - inter
+                    if union <= 0 or inter / union < DUPLICATE_BOX_IOU:
+                        continue
+                    keep_first = ordered[first]["confidence"] >= ordered[second]["confidence"]
+                    dropped.add(second if keep_first else first)
+        return dropped
+
+
+class PageAnalysis:
+    """Whole-page text features shared by the classifier and the summary-page checks.
+
+    ``text`` is the lowercased page text and ``normalized_text`` the same text reduced to
+    single-spaced alphanumeric words; report keyword flags are read from the latter.
+    """
+
+    SUMMARY_TITLE_RE = re.compile(r"lapor|rekap|pertanggung|jawab", re.IGNORECASE)
+
+    def __init__(self, lines: "LineSet") -> None:
+        self._lines = lines
+        self.text = "\n".join(line.text_lower for line in lines)
+        normalized_text = re.sub(r"[^a-z0-9]+", " ", self.text)
+        self.normalized_text = re.sub(r"\s+", " ", normalized_text).strip()
+        self.hits = KEYWORDS.scan(self.normalized_text)
+        self.has_laporan = "laporan" in self.hits
+        self.has_rekap = "rekap" in self.hits or "rekapitulasi" in self.hits
+        self.has_pengeluaran = "pengeluaran" in self.hits
+        self.has_saldo = "saldo" in self.hits
+        # Every spelling of "pertanggung jawaban" contains both fragments.
+        self.has_pertanggungjawaban = "pertanggung" in self.hits and "jawab" in self.hits
+        self.has_generic_total = "jumlah" in self.hits or "total" in self.hits
+        # Words survive normalization intact, so these terms match as they would on ``text``.
+        self.has_table_terms = self.hits.has("summary_table")
+        self._text_hits: Optional[KeywordHits] = None
+        self._amount_density: Optional[int] = None
+
+    @property
+    def is_summary_focus(self) -> bool:
+        return self.hits.has("summary_page") or self.has_pertanggungjawaban
+
+    @property
+    def text_hits(self) -> KeywordHits:
+        """OCR-tolerant keyword hits of the raw page text, as used for category markers."""
+        if self._text_hits is None:
+            self._text_hits = scan_keywords(self.text)
+        return self._text_hits
+
+    @property
+    def amount_density(self) -> int:
+        if self._amount_density is None:
+            self._amount_density = sum(len(line.amounts) for line in self._lines)
+        return self._amount_density
+
+    @property
+    def header_indexes(self) -> List[int]:
+        """Positions (in line order) of the lines naming the pengeluaran column."""
+        return [idx for idx, line in enumerate(self._lines) if "pengeluaran" in line.text_lower]
+
+    @property
+    def title_lines(self) -> List[Line]:
+        return [line for line in self._lines if self.SUMMARY_TITLE_RE.search(line.text)]
+
+
+class LineSet(tuple):
+    """Immutable sequence of a page's (or group's) lines with lazily built page-level views."""
+
+    @classmethod
+    def of(cls, lines: Sequence[Line]) -> "LineSet":
+        return lines if isinstance(lines, LineSet) else cls(lines)
+
+    @property
+    def geometry(self) -> PageGeometry:
+        cached = self.__dict__.get("_geometry")
+        if cached is None:
+            cached = self.__dict__["_geometry"] = PageGeometry(self)
+        return cached
+
+    @property
+    def spatial(self) -> SpatialIndex:
+        cached = self.__dict__.get("_spatial")
+        if cached is None:
+            cached = self.__dict__["_spatial"] = SpatialIndex(self)
+        return cached
+
+    @property
+    def analysis(self) -> PageAnalysis:
+        cached = self.__dict__.get("_analysis")
+        if cached is None:
+            cached = self.__dict__["_analysis"] = PageAnalysis(self)
+        return cached
+
+    @property
+    def tokens(self) -> TokenIndex:
+        ordered = self.spatial.ordered
+        cached = ordered.__dict__.get("_tokens")
+        if cached is None:
+            cached = ordered.__dict__["_tokens"] = TokenIndex(ordered)
+        return cached
+
+    @property
+    def rotation(self) -> int:
+        """Degrees the page was turned before these lines were read; 0 unless the reader recorded it."""
+        return self.__dict__.get("_rotation", 0)
+
+    @property
+    def rows(self) -> RowIndex:
+        ordered = self.spatial.ordered
+        cached = ordered.__dict__.get("_rows")
+        if cached is None:
+            cached = ordered.__dict__["_rows"] = RowIndex(ordered)
+        return cached
+
+    def take(self, indexes: Sequence[int]) -> "LineSet":
+        return LineSet(self[int(i)] for i in indexes)
+
+    def deduplicated(self) -> "LineSet":
+        """Drop repeated detections of the same text over the same box, keeping the most confident."""
+        ordered = self.spatial.ordered
+        dropped = self.rows.duplicates(ordered)
+        if not dropped:
+            return self
+        dropped_ids = {id(ordered[pos]) for pos in dropped}
+        return LineSet(line for line in self if id(line) not in dropped_ids)
+
+
+class BandRead(NamedTuple):
+    """Lines recognized so far by ``OCRProcessor.iter_bands`` and every box detected on the page."""
+
+    lines: List[Line]
+    page_boxes: List[np.ndarray]
+
+
 class OCRProcessor:
     """OCR processing and preprocessing pipeline."""
 
-    def __init__(self) -> None:
-        self.ocr = PaddleOCR(use_angle_cls=True, lang="latin", use_gpu=False, show_log=False)
+    def __init__(self, backend: Optional[str] = None, precision: Optional[str] = None) -> None:
+        self.backend = backend if backend in OCR_BACKENDS else self._ocr_backend()
+        self.precision = precision if precision in MODEL_PRECISIONS else self._model_precision()
+        self.numeric_rec_model = os.getenv("OCR_NUMERIC_REC_MODEL") or None
+        self.orientation_mode = self._orientation_mode()
+        self.last_rotation = 0
+        self._engine: Any = None
+        self._numeric_engine: Any = None
+
+    @staticmethod
+    def _ocr_backend() -> str:
+        backend = (os.getenv("OCR_BACKEND") or "paddle").strip().lower()
+        return backend if backend in OCR_BACKENDS else "paddle"
 
-    def preprocess(self, image: Image.Image, handwritten: bool) -> Image.Image:
+    @staticmethod
+    def _model_precision() -> str:
+        precision = (os.getenv("OCR_MODEL_PRECISION") or "fp32").strip().lower()
+        return precision if precision in MODEL_PRECISIONS else "fp32"
+
+    @staticmethod
+    def _orientation_mode() -> str:
+        """``box`` (default) angle-classifies every box; ``page`` is opt-in.
+
+        Page mode classifies only the widest boxes and turns the whole page when they agree.
+        It tells upright from upside down only (0 or 180 degrees); when the sample is split,
+        every box is classified as in box mode.
+        """
+        mode = (os.getenv("OCR_ORIENTATION_MODE") or "box").strip().lower()
+        return mode if mode in ORIENTATION_MODES else "box"
+
+    @property
+    def ocr(self) -> Any:
+        # Engines are created on first use so pages resolved without OCR never pay the model load.
+        if self._engine is None:
+            self._engine = self._create_engine()
+        return self._engine
+
+    @property
+    def numeric_ocr(self) -> Any:
+        if self._numeric_engine is None and self.numeric_rec_model:
+            self._numeric_engine = self._create_numeric_engine()
+        return self._numeric_engine
+
+    def _create_engine(self) -> Any:
+        if self.backend == "onnx":
+            from onnx_backend import OnnxOCR
+
+            return OnnxOCR.from_env(precision=self.precision)
+
+        if self.precision != "fp32":
+            LOG.warning("OCR_MODEL_PRECISION=%s is only supported by the onnx backend; using fp32", self.precision)
+        PaddleOCR = _load_paddleocr()
+        return PaddleOCR(use_angle_cls=True, lang="latin", use_gpu=False, show_log=False)
+
+    def _create_numeric_engine(self) -> Any:
+        """Digits-only recognizer (restricted charset) used for amount-looking boxes."""
+        dict_path = os.getenv("OCR_NUMERIC_REC_DICT") or os.path.join(SCRIPT_DIR, "numeric_dict.txt")
+        if self.backend == "onnx":
+            from onnx_backend import OnnxOCR
+
+            return OnnxOCR(det_model_path=None, rec_model_path=self.numeric_rec_model, rec_char_dict_path=dict_path)
+
+        # Only the recognizer is needed: a full PaddleOCR instance would also load det models.
+        # Importing paddleocr puts its bundled ``tools`` package on the path.
+        _load_paddleocr()
+        from paddleocr.paddleocr import parse_args
+        from tools.infer.predict_rec import TextRecognizer
+
+        params = parse_args(mMain=False)
+        params.rec_model_dir = self.numeric_rec_model
+        params.rec_char_dict_path = dict_path
+        params.use_gpu = False
+        params.show_log = False
+        return TextRecognizer(params)
+
+    def preprocess(self, image: Image.Image, handwritten: bool, max_width: int = PREPROCESS_MAX_WIDTH) -> Image.Image:
         image = image.convert("RGB")
-        if image.width > 1600:
-            ratio = 1600 / image.width
-            new_size = (1600, int(image.height * ratio))
+        ratio = self.frame_scale(image, max_width)
+        if ratio < 1.0:
+            new_size = (max_width, int(image.height * ratio))
             image = image.resize(new_size)
 
         image = ImageOps.autocontrast(image)
@@ -261,15 +912,82 @@ class OCRProcessor:
 
         return image
 
-    def run(self, image: Image.Image, handwritten: bool, conf_threshold: float) -> List[Dict[str, Any]]:
+    @staticmethod
+    def frame_scale(image: Image.Image, max_width: int = PREPROCESS_MAX_WIDTH) -> float:
+        """Factor from ``image`` pixels to the coordinates ``run`` reports boxes in."""
+        return max_width / image.width if image.width > max_width else 1.0
+
+    def run(
+        self,
+        image: Image.Image,
+        handwritten: bool,
+        conf_threshold: float,
+        max_width: int = PREPROCESS_MAX_WIDTH,
+    ) -> List[Line]:
+        engine = self.ocr
+        self.last_rotation = 0
         try:
-            prepared = self.preprocess(image, handwritten)
+            prepared = self.preprocess(image, handwritten, max_width)
             np_img = np.array(prepared)
-            result = self.ocr.ocr(np_img, cls=True)
+            if self._use_staged_pipeline():
+                result = self._ocr_staged(np_img)
+            else:
+                result = engine.ocr(np_img, cls=True)
         except Exception as exc:
             LOG.warning("OCR failed: %s", exc)
             return []
 
+        return self._lines_from_result(result, conf_threshold)
+
+    def iter_bands(
+        self,
+        image: Image.Image,
+        handwritten: bool,
+        conf_threshold: float,
+        bands: int,
+    ) -> Iterator[BandRead]:
+        """Detect the whole page, then recognize it in horizontal bands from the bottom up.
+
+        Each step yields every line read so far in reading order, with the page's detected
+        boxes, so callers can stop as soon as they have what they need; exhausting the
+        iterator reads the full page.
+        """
+        self.ocr  # load outside the try so a missing engine still raises, as in run()
+        self.last_rotation = 0
+        try:
+            np_img = np.array(self.preprocess(image, handwritten))
+            np_img, boxes, per_box_cls = self._prepare_boxes(np_img)
+        except Exception as exc:
+            LOG.warning("OCR failed: %s", exc)
+            return
+        if not boxes:
+            yield BandRead([], boxes)
+            return
+
+        bands = max(bands, 1)
+        band_height = np_img.shape[0] / bands
+        box_bands = [min(int(float(box[:, 1].mean()) / band_height), bands - 1) for box in boxes]
+        recognized: Dict[int, Tuple[str, float]] = {}
+        for band in range(bands - 1, -1, -1):
+            band_idx = [idx for idx, box_band in enumerate(box_bands) if box_band == band]
+            if not band_idx:
+                continue
+            try:
+                rec_res = self._read_boxes(np_img, [boxes[idx] for idx in band_idx], per_box_cls)
+            except Exception as exc:
+                LOG.warning("OCR failed: %s", exc)
+                return
+            recognized.update(zip(band_idx, rec_res))
+            result = [
+                [
+                    [boxes[idx].tolist(), recognized[idx]]
+                    for idx in sorted(recognized)
+                    if recognized[idx][1] >= REC_DROP_SCORE
+                ]
+            ]
+            yield BandRead(self._lines_from_result(result, conf_threshold), boxes)
+
+    def _lines_from_result(self, result: Any, conf_threshold: float) -> List[Line]:
         normalized = self._normalize_result(result)
         lines = []
         for line in normalized:
@@ -280,15 +998,164 @@ class OCRProcessor:
             conf = float(line[1][1]) if len(line[1]) > 1 else 0.0
             if not text or conf < conf_threshold:
                 continue
-            lines.append(
-                {
-                    "text": text,
-                    "confidence": conf,
-                    "bbox": [coord for pt in box for coord in pt],
-                    "box_points": box,
-                }
-            )
-        return lines
+            lines.append(Line(text, conf, [coord for pt in box for coord in pt], box))
+        return LineSet(lines).deduplicated()
+
+    def _use_staged_pipeline(self) -> bool:
+        return self.numeric_rec_model is not None or self.orientation_mode == "page"
+
+    def _ocr_staged(self, np_img: np.ndarray) -> List[Any]:
+        """Run det, cls and rec as separate calls so recognition can be routed per box."""
+        np_img, boxes, per_box_cls = self._prepare_boxes(np_img)
+        if not boxes:
+            return [[]]
+        rec_res = self._read_boxes(np_img, boxes, per_box_cls)
+        return [
+            [
+                [box.tolist(), (text, score)]
+                for box, (text, score) in zip(boxes, rec_res)
+                if score >= REC_DROP_SCORE
+            ]
+        ]
+
+    def _prepare_boxes(self, np_img: np.ndarray) -> Tuple[np.ndarray, List[np.ndarray], bool]:
+        """Detect boxes and settle page orientation; returns whether boxes still need per-box cls."""
+        boxes = self._detect(np_img)
+        per_box_cls = True
+        if boxes and self.orientation_mode == "page":
+            rotation = self._page_rotation(np_img, boxes)
+            if rotation is not None:
+                per_box_cls = False
+                if rotation == 180:
+                    np_img, boxes = self._rotate_page_180(np_img, boxes)
+                    self.last_rotation = 180
+        return np_img, boxes, per_box_cls
+
+    def _read_boxes(self, np_img: np.ndarray, boxes: List[np.ndarray], per_box_cls: bool) -> List[Tuple[str, float]]:
+        crops = [rotate_crop(np_img, box) for box in boxes]
+        if per_box_cls:
+            crops = self._classify_crops(crops)
+        return self._recognize(crops, boxes, np_img.shape[1])
+
+    def _detect(self, np_img: np.ndarray) -> List[np.ndarray]:
+        detected = self.ocr.ocr(np_img, det=True, rec=False, cls=False)
+        boxes = detected[0] if detected else None
+        if boxes is None or len(boxes) == 0:
+            return []
+        return sorted_boxes([np.array(box, dtype=np.float32) for box in boxes])
+
+    def _page_rotation(self, np_img: np.ndarray, boxes: List[np.ndarray]) -> Optional[int]:
+        """Vote on page orientation from the widest boxes; None when the sample disagrees."""
+        widest = sorted(boxes, key=lambda box: float(box[:, 0].max() - box[:, 0].min()), reverse=True)
+        sample = [rotate_crop(np_img, box) for box in widest[:ORIENTATION_SAMPLE_SIZE]]
+        _, labels = self._classify(sample)
+        if not labels:
+            return 0
+
+        flipped = sum(1 for label, score in labels if "180" in label and score > CLS_ROTATE_THRESHOLD)
+        flipped_ratio = flipped / len(labels)
+        if flipped_ratio >= ORIENTATION_AGREEMENT:
+            return 180
+        if flipped_ratio <= 1 - ORIENTATION_AGREEMENT:
+            return 0
+        LOG.info("Page orientation sample disagrees (%d/%d flipped); classifying every box", flipped, len(labels))
+        return None
+
+    @staticmethod
+    def _rotate_page_180(np_img: np.ndarray, boxes: List[np.ndarray]) -> Tuple[np.ndarray, List[np.ndarray]]:
+        height, width = np_img.shape[:2]
+        rotated = np.ascontiguousarray(np_img[::-1, ::-1])
+        rotated_boxes = []
+        for box in boxes:
+            mapped = np.stack([width - 1 - box[:, 0], height - 1 - box[:, 1]], axis=1)
+            # The old bottom-right corner becomes the new top-left one.
+            rotated_boxes.append(mapped[[2, 3, 0, 1]].astype(np.float32))
+        return rotated, sorted_boxes(rotated_boxes)
+
+    def _classify_crops(self, crops: List[np.ndarray]) -> List[np.ndarray]:
+        if not crops:
+            return crops
+        crops, _ = self._classify(crops)
+        return crops
+
+    def _classify(self, crops: List[np.ndarray]) -> Tuple[List[np.ndarray], List[Tuple[str, float]]]:
+        """Angle-classify crops without recognizing them; crops labelled 180 come back turned upright.
+
+        ``PaddleOCR.ocr(det=False, rec=False, cls=True)`` still runs the recognizer on every crop,
+        so the classifier is called directly.
+        """
+        engine = self.ocr
+        if self.backend == "onnx":
+            return engine.classify(crops)
+        # PaddleOCR's classifier turns crops over above its own cls_thresh, which CLS_ROTATE_THRESHOLD mirrors.
+        crops, labels, _ = engine.text_classifier(list(crops))
+        return crops, [(label, float(score)) for label, score in labels]
+
+    def _recognize(self, crops: List[np.ndarray], boxes: List[np.ndarray], page_width: int) -> List[Tuple[str, float]]:
+        results: List[Tuple[str, float]] = [("", 0.0)] * len(crops)
+        general_idx: List[int] = []
+        numeric_idx: List[int] = []
+        amount_shaped = self._amount_shaped_boxes(boxes, page_width) if self.numeric_rec_model else set()
+        for idx in range(len(boxes)):
+            if idx in amount_shaped:
+                numeric_idx.append(idx)
+            else:
+                general_idx.append(idx)
+
+        if numeric_idx:
+            numeric_res = self._recognize_numeric([crops[i] for i in numeric_idx])
+            for idx, (text, score) in zip(numeric_idx, numeric_res):
+                if score >= NUMERIC_REC_MIN_CONFIDENCE and any(ch.isdigit() for ch in text):
+                    results[idx] = (text, float(score))
+                else:
+                    # Low confidence usually means the box holds letters; let the general model read it.
+                    general_idx.append(idx)
+            general_idx.sort()
+
+        if general_idx:
+            general_res = self.ocr.ocr([[crops[i] for i in general_idx]], det=False, rec=True, cls=False)
+            for idx, (text, score) in zip(general_idx, general_res[0] if general_res else []):
+                results[idx] = (text, float(score))
+        return results
+
+    def _recognize_numeric(self, crops: List[np.ndarray]) -> List[Tuple[str, float]]:
+        engine = self.numeric_ocr
+        if self.backend == "onnx":
+            return engine.recognize(crops)
+        rec_res, _ = engine(crops)
+        return rec_res
+
+    @staticmethod
+    def _amount_shaped_boxes(boxes: List[np.ndarray], page_width: int) -> Set[int]:
+        """Indexes of boxes shaped like an amount column entry.
+
+        Amounts are short single-run boxes ending near the right edge, right-aligned with
+        another such box on a different row; labels, headers and item names are left to the
+        general model.
+        """
+        candidates = []
+        for idx, box in enumerate(boxes):
+            width = float(box[:, 0].max() - box[:, 0].min())
+            height = float(box[:, 1].max() - box[:, 1].min())
+            if height <= 0:
+                continue
+            aspect = width / height
+            if aspect < NUMERIC_BOX_MIN_ASPECT or aspect > NUMERIC_BOX_MAX_ASPECT:
+                continue
+            right = float(box[:, 0].max())
+            if right < page_width * NUMERIC_BOX_MIN_RIGHT_RATIO:
+                continue
+            candidates.append((idx, right, float(box[:, 1].mean()), height))
+
+        shaped: Set[int] = set()
+        for idx, right, y_mid, height in candidates:
+            for other, other_right, other_y, _ in candidates:
+                if other == idx or abs(other_y - y_mid) < height:
+                    continue
+                if abs(other_right - right) <= height * NUMERIC_COLUMN_TOLERANCE:
+                    shaped.add(idx)
+                    break
+        return shaped
 
     @staticmethod
     def _normalize_result(result: Any) -> List[Any]:
@@ -300,48 +1167,156 @@ class OCRProcessor:
         return result
 
 
+class PageQuality(NamedTuple):
+    """Image measurements taken before OCR and the preprocessing profile chosen from them."""
+
+    sharpness: float
+    contrast: float
+    stroke_width: float
+    stroke_variation: float
+    profile: str
+
+
+class ImageQualityAnalyzer:
+    """Pick the preprocessing profile of a page before its first OCR pass.
+
+    Low-contrast pages and pen-written pages (thick strokes of uneven width, still sharp
+    enough to binarize) get the ``handwritten`` binarization profile; everything else,
+    including blurry photos that thresholding would break up, reads as ``standard``.
+    """
+
+    def analyze(self, image: Image.Image) -> PageQuality:
+        # Measured at a fixed width so stroke widths compare across scan resolutions.
+        gray = np.asarray(image.convert("L"))
+        if gray.shape[1] != TRIAGE_WIDTH:
+            height = max(int(gray.shape[0] * TRIAGE_WIDTH / gray.shape[1]), 1)
+            gray = cv2.resize(gray, (TRIAGE_WIDTH, height), interpolation=cv2.INTER_AREA)
+
+        sharpness = float(cv2.Laplacian(gray, cv2.CV_64F).var())
+        # Wide percentiles: ink often covers only a few percent of a receipt page.
+        low, high = np.percentile(gray, (0.5, 99.5))
+        contrast = float(high - low)
+        stroke_width, stroke_variation = self._stroke_stats(gray)
+
+        if not stroke_width:
+            profile = "standard"
+        elif contrast < TRIAGE_LOW_CONTRAST:
+            profile = "handwritten"
+        elif (
+            sharpness >= TRIAGE_MIN_SHARPNESS
+            and stroke_width >= TRIAGE_PEN_STROKE_WIDTH
+            and stroke_variation >= TRIAGE_PEN_STROKE_VARIATION
+        ):
+            profile = "handwritten"
+        else:
+            profile = "standard"
+        return PageQuality(
+            round(sharpness, 2), round(contrast, 2), round(stroke_width, 2), round(stroke_variation, 3), profile
+        )
+
+    @staticmethod
+    def _stroke_stats(gray: np.ndarray) -> Tuple[float, float]:
+        """Median stroke width and its coefficient of variation, from the distance-transform ridge."""
+        _, ink = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU)
+        dist = cv2.distanceTransform(ink, cv2.DIST_L2, 3)
+        ridge = (dist > 0) & (dist >= cv2.dilate(dist, np.ones((3, 3), np.uint8)))
+        widths = dist[ridge] * 2.0
+        if not widths.size:
+            return 0.0, 0.0
+        mean = float(widths.mean())
+        return float(np.median(widths)), float(widths.std() / mean) if mean else 0.0
+
+
+class ReceiptFeatures(NamedTuple):
+    """Signals the classifier decides on, computed once per line set."""
+
+    line_count: int
+    avg_confidence: float
+    height_variance: float
+    short_ratio: float
+    numeric_ratio: float
+    has_tagihan: bool
+    retail_score: int
+    institutional_score: int
+    payment_score: int
+    simple_score: int
+    resi_tagihan_score: int
+
+
 class ReceiptClassifier:
-    """Classify receipt category using keyword and heuristic signals."""
+    """Classify receipt category using keyword and heuristic signals.
+
+    Features are cached on the line set and categories are memoized per set of lines, so the
+    page, each group and the extraction step can all ask without recomputing.
+    """
 
-    def classify(self, lines: List[Dict[str, Any]]) -> str:
+    def __init__(self) -> None:
+        self._memo: Dict[FrozenSet[Line], str] = {}
+
+    def features(self, lines: List[Line]) -> ReceiptFeatures:
+        lines = LineSet.of(lines)
+        cached = lines.__dict__.get("_features")
+        if cached is not None:
+            return cached
+
+        count = len(lines)
+        hits = lines.analysis.text_hits
+        cached = lines.__dict__["_features"] = ReceiptFeatures(
+            line_count=count,
+            avg_confidence=sum(line.confidence for line in lines) / count if count else 0.0,
+            height_variance=float(np.var(lines.geometry.heights)) if count else 0.0,
+            short_ratio=sum(len(line.text_lower) <= 6 for line in lines) / max(count, 1),
+            numeric_ratio=sum(line.is_numeric for line in lines) / max(count, 1),
+            has_tagihan="tagihan" in hits,
+            retail_score=hits.count("retail"),
+            institutional_score=hits.count("institutional"),
+            payment_score=hits.count("payment"),
+            simple_score=hits.count("simple"),
+            resi_tagihan_score=hits.count("resi_tagihan"),
+        )
+        return cached
+
+    def classify(self, lines: List[Line]) -> str:
         if not lines:
             return "unknown"
 
-        texts = [l["text"].lower() for l in lines]
-        avg_conf = sum(l["confidence"] for l in lines) / len(lines)
+        lines = LineSet.of(lines)
+        cached = lines.__dict__.get("_category")
+        if cached is not None:
+            return cached
+
+        # Line objects hash by identity, so equal keys are the very same OCR lines.
+        key = frozenset(lines)
+        category = self._memo.get(key)
+        if category is None:
+            category = self._decide(self.features(lines))
+            self._memo[key] = category
+            if len(self._memo) > CLASSIFIER_MEMO_SIZE:
+                self._memo.pop(next(iter(self._memo)))
+        lines.__dict__["_category"] = category
+        return category
 
-        heights = [self._bbox_height(l["bbox"]) for l in lines]
-        variance = np.var(heights) if heights else 0.0
-        short_boxes = sum(1 for t in texts if len(t) <= 6)
-        numeric_lines = sum(1 for t in texts if re.fullmatch(r"[\d.,\s]+", t))
-        density_short = short_boxes / max(len(texts), 1)
-        ratio_numeric = numeric_lines / max(len(texts), 1)
-
-        combined_text = "\n".join(texts)
-        if "tagihan" in combined_text:
+    @staticmethod
+    def _decide(features: ReceiptFeatures) -> str:
+        if features.has_tagihan:
             return "resi_tagihan"
-        retail_score = sum(1 for kw in RETAIL_MARKERS if kw in combined_text)
-        institutional_score = sum(1 for kw in INSTITUTIONAL_MARKERS if kw in combined_text)
-        payment_score = sum(1 for kw in PAYMENT_MARKERS if kw in combined_text)
-        simple_score = sum(1 for kw in SIMPLE_MARKERS if kw in combined_text)
-        resi_tagihan_score = sum(1 for kw in RESI_TAGIHAN_MARKERS if kw in combined_text)
 
-        if avg_conf < 0.75 and variance > 200 and density_short > 0.25:
+        if features.avg_confidence < 0.75 and features.height_variance > 200 and features.short_ratio > 0.25:
             return "handwritten"
 
-        if retail_score >= 2:
+        if features.retail_score >= 2:
             return "retail_printed"
 
-        if institutional_score >= 1:
+        if features.institutional_score >= 1:
             return "institutional_kuitansi"
 
-        if payment_score >= 2 and retail_score == 0:
+        if features.payment_score >= 2 and features.retail_score == 0:
             return "digital_payment"
 
-        if simple_score >= 1 and ratio_numeric > 0.3:
+        if features.simple_score >= 1 and features.numeric_ratio > 0.3:
             return "simple_proof"
 
-        if resi_tagihan_score >= 3:
+        if features.resi_tagihan_score >= 3:
             return "resi_tagihan"
 
         return "unknown"
@@ -353,44 +1328,39 @@ class ReceiptClassifier:
 
 
 class ReceiptSegmenter:
-    """Split a page into up to two receipt groups (horizontal first, then vertical fallback)."""
+    """Split a page into receipt groups.
 
-    def segment(self, lines: List[Dict[str, Any]], page_height: int, page_width: int) -> List[List[Dict[str, Any]]]:
+    Sheets with several receipts taped on them are cut along empty gutters (recursive XY-cut)
+    into any number of groups. Other pages keep the two-way split (horizontal first, then
+    vertical).
+    """
+
+    def segment(self, lines: List[Line], page_height: int, page_width: int) -> List[List[Line]]:
         if not lines:
             return []
 
-        lines_sorted = sorted(lines, key=lambda l: x_center(l["bbox"]))
-        x_centers = [x_center(l["bbox"]) for l in lines_sorted]
+        lines = LineSet.of(lines)
+        receipts = self._xy_cut(lines)
+        if len(receipts) >= SEGMENT_MIN_CLUSTERS:
+            return receipts
 
-        max_x_gap = 0
-        x_split_idx = None
-        for i in range(1, len(x_centers)):
-            gap = x_centers[i] - x_centers[i - 1]
-            if gap > max_x_gap:
-                max_x_gap = gap
-                x_split_idx = i
+        geometry = lines.geometry
+        x_order, max_x_gap, x_split_idx = geometry.largest_gap("x")
+        lines_sorted = lines.take(x_order)
 
         # Primary split: left/right receipts
         if max_x_gap > page_width * 0.2 and x_split_idx is not None:
-            group1 = lines_sorted[:x_split_idx]
-            group2 = lines_sorted[x_split_idx:]
+            group1 = LineSet(lines_sorted[:x_split_idx])
+            group2 = LineSet(lines_sorted[x_split_idx:])
             groups = [group1, group2]
         else:
             # Fallback split: top/bottom receipts
-            lines_y_sorted = sorted(lines, key=lambda l: y_center(l["bbox"]))
-            y_centers = [y_center(l["bbox"]) for l in lines_y_sorted]
-
-            max_y_gap = 0
-            y_split_idx = None
-            for i in range(1, len(y_centers)):
-                gap = y_centers[i] - y_centers[i - 1]
-                if gap > max_y_gap:
-                    max_y_gap = gap
-                    y_split_idx = i
+            y_order, max_y_gap, y_split_idx = geometry.largest_gap("y")
+            lines_y_sorted = lines.take(y_order)
 
             if max_y_gap > page_height * 0.12 and y_split_idx is not None:
-                group1 = lines_y_sorted[:y_split_idx]
-                group2 = lines_y_sorted[y_split_idx:]
+                group1 = LineSet(lines_y_sorted[:y_split_idx])
+                group2 = LineSet(lines_y_sorted[y_split_idx:])
                 groups = [group1, group2]
             else:
                 groups = [lines_sorted]
@@ -400,18 +1370,107 @@ class ReceiptSegmenter:
 
         return groups[:2]
 
+    @classmethod
+    def has_gutter(cls, boxes: List[np.ndarray]) -> bool:
+        """Whether detected boxes leave a gutter wide enough to separate two receipts."""
+        if len(boxes) < 2:
+            return False
+        stacked = np.stack([np.asarray(box, dtype=np.float32).reshape(-1, 2) for box in boxes])
+        xs, ys = stacked[:, :, 0], stacked[:, :, 1]
+        line_height = max(float(np.median(ys.max(axis=1) - ys.min(axis=1))), 1.0)
+        x_gap, _ = cls._gutter(xs.min(axis=1), xs.max(axis=1))
+        y_gap, _ = cls._gutter(ys.min(axis=1), ys.max(axis=1))
+        return x_gap >= SEGMENT_GUTTER_X * line_height or y_gap >= SEGMENT_GUTTER_Y * line_height
+
+    @staticmethod
+    def _gutter(lo: np.ndarray, hi: np.ndarray) -> Tuple[float, float]:
+        """Widest band no [lo, hi] extent crosses, and the coordinate in its middle."""
+        order = np.argsort(lo, kind="stable")
+        starts = lo[order]
+        reach = np.maximum.accumulate(hi[order])
+        gaps = starts[1:] - reach[:-1]
+        if not len(gaps):
+            return 0.0, 0.0
+        split = int(np.argmax(gaps))
+        return float(gaps[split]), float((reach[split] + starts[split + 1]) / 2.0)
+
+    def _xy_cut(self, lines: LineSet) -> List[LineSet]:
+        """Cut the page recursively along empty gutters into any number of receipts.
+
+        A cut needs a gutter at least ``SEGMENT_GUTTER_X`` / ``SEGMENT_GUTTER_Y`` line heights
+        wide that no box crosses, so the space between a receipt's labels and its amount column
+        (bridged by the header, separators and footer) does not split it. Only pieces that hold
+        a receipt of their own count: at least ``SEGMENT_MIN_GROUP_LINES`` lines and a total
+        anchor with an amount on its row. The rest (headers, item blocks, logos, stamps) are
+        attached to the nearest receipt, and a page with fewer than ``SEGMENT_MIN_CLUSTERS``
+        receipts is left to the two-way split. Receipts come back top to bottom, then left to right.
+        """
+        count = len(lines)
+        if count < SEGMENT_MIN_GROUP_LINES * SEGMENT_MIN_CLUSTERS:
+            return []
+
+        geometry = lines.geometry
+        xs, ys = geometry.boxes[:, 0::2], geometry.boxes[:, 1::2]
+        x0, x1 = xs.min(axis=1), xs.max(axis=1)
+        y0, y1 = ys.min(axis=1), ys.max(axis=1)
+        line_height = max(float(np.median(geometry.heights)), 1.0)
+
+        leaves: List[np.ndarray] = []
+        pending = [np.arange(count)]
+        while pending:
+            idx = pending.pop()
+            x_gap, x_at = self._gutter(x0[idx], x1[idx])
+            y_gap, y_at = self._gutter(y0[idx], y1[idx])
+            x_score = x_gap / (SEGMENT_GUTTER_X * line_height)
+            y_score = y_gap / (SEGMENT_GUTTER_Y * line_height)
+            if max(x_score, y_score) < 1.0:
+                leaves.append(idx)
+                continue
+            side = geometry.x_centers[idx] < x_at if x_score >= y_score else geometry.y_centers[idx] < y_at
+            pending.extend([idx[side], idx[~side]])
+
+        is_receipt = [self._is_receipt(lines.take(leaf)) for leaf in leaves]
+        real = [list(leaf) for leaf, receipt in zip(leaves, is_receipt) if receipt]
+        if len(real) < SEGMENT_MIN_CLUSTERS:
+            return []
+
+        centers = [(geometry.x_centers[group].mean(), geometry.y_centers[group].mean()) for group in real]
+        for leaf, receipt in zip(leaves, is_receipt):
+            if receipt:
+                continue
+            gx, gy = geometry.x_centers[leaf].mean(), geometry.y_centers[leaf].mean()
+            nearest = min(range(len(real)), key=lambda i: (centers[i][0] - gx) ** 2 + (centers[i][1] - gy) ** 2)
+            real[nearest] = real[nearest] + list(leaf)
+
+        band = SEGMENT_GUTTER_Y * line_height
+        real.sort(key=lambda group: (round(float(y0[group].min()) / band), float(x0[group].min())))
+        return [lines.take(sorted(group)) for group in real]
+
+    @staticmethod
+    def _is_receipt(piece: LineSet) -> bool:
+        """Whether a cut-out piece carries its own total: an anchor with an amount on its row."""
+        if len(piece) < SEGMENT_MIN_GROUP_LINES:
+            return False
+        priced = [line for line in piece if line.amounts]
+        return any(
+            abs(line.y_center - anchor.y_center) < max(anchor.height, 1.0)
+            for anchor in piece
+            if anchor.hits_norm.has("total")
+            for line in priced
+        )
+
     @staticmethod
-    def _merge_smallest(groups: List[List[Dict[str, Any]]]) -> List[List[Dict[str, Any]]]:
+    def _merge_smallest(groups: List[List[Line]]) -> List[List[Line]]:
         groups = sorted(groups, key=len)
         smallest = groups.pop(0)
-        groups[0].extend(smallest)
+        groups[0] = LineSet(groups[0] + smallest)
         return groups
 
 
 class TotalExtractor:
     """Extract total amount from a receipt group."""
 
-    def extract(self, lines: List[Dict[str, Any]], page_height: int) -> Optional[Dict[str, Any]]:
+    def extract(self, lines: List[Line], page_height: int) -> Optional[Dict[str, Any]]:
         if not lines:
             return None
 
@@ -429,10 +1488,10 @@ class TotalExtractor:
             LOG.warning("Total extraction failed: %s", exc)
             return None
 
-    def _stage_keyword(self, lines: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    def _stage_keyword(self, lines: List[Line]) -> Optional[Dict[str, Any]]:
         for line in lines:
-            text = line["text"].lower()
-            if not self._keyword_match(text):
+            text = line.text_lower
+            if not line.hits_norm.has("total"):
                 continue
             amounts = self._amounts_in_text(text)
             if not amounts:
@@ -444,21 +1503,21 @@ class TotalExtractor:
             return {"total": amount, "confidence": score, "bbox": line["bbox"]}
         return None
 
-    def _stage_position(self, lines: List[Dict[str, Any]], page_height: int) -> Optional[Dict[str, Any]]:
+    def _stage_position(self, lines: List[Line], page_height: int) -> Optional[Dict[str, Any]]:
         bottom_threshold = page_height * 0.6
         candidates: List[Tuple[float, int, float, List[float]]] = []
         keyword_candidates: List[Tuple[float, int, float, List[float]]] = []
         for line in lines:
-            text = line["text"].lower()
-            if any(k in text for k in NEGATIVE_NEAR):
+            text = line.text_lower
+            if line.hits.has("negative_near"):
                 continue
             if re.search(r"\b\d{9,}\b", text):
                 continue
-            has_keyword = self._keyword_match(text)
+            has_keyword = line.hits_norm.has("total")
             for amount in self._amounts_in_text(text):
                 if amount < MIN_AMOUNT or amount > MAX_VALID_AMOUNT:
                     continue
-                yc = y_center(line["bbox"])
+                yc = line.y_center
                 if yc < bottom_threshold:
                     continue
                 conf = float(line.get("confidence", 0.0))
@@ -480,20 +1539,24 @@ class TotalExtractor:
             return None
         return {"total": amount, "confidence": score, "bbox": bbox}
 
-    def _stage_keyword_neighbor(self, lines: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
-        ordered = sorted(lines, key=lambda l: y_center(l["bbox"]))
+    def _stage_keyword_neighbor(self, lines: List[Line]) -> Optional[Dict[str, Any]]:
+        lines = LineSet.of(lines)
+        ordered = lines.spatial.ordered
         candidates: List[Tuple[int, float, List[float]]] = []
 
-        for idx, line in enumerate(ordered):
-            text = line["text"].lower()
-            if not self._keyword_match(text):
-                continue
+        rows = lines.rows
+        for idx in lines.tokens.positions(KEYWORDS.groups["total"], normalized=True):
+            line = ordered[idx]
 
             # If same-line keyword extraction exists, stage_keyword has handled it already.
-            for next_idx in range(idx + 1, min(idx + 6, len(ordered))):
+            # An amount split into its own box on the label's row is read there, at no distance;
+            # only labels without one fall back to the following lines.
+            same_row = [(pos, idx) for pos in rows.right_of(idx) if ordered[pos].amounts]
+            neighbors = same_row or [(next_idx, next_idx) for next_idx in range(idx + 1, min(idx + 6, len(ordered)))]
+            for next_idx, distance_idx in neighbors:
                 next_line = ordered[next_idx]
-                next_text = next_line["text"].lower()
-                if any(k in next_text for k in NEGATIVE_NEAR):
+                next_text = next_line.text_lower
+                if next_line.hits.has("negative_near"):
                     continue
                 for amount in self._amounts_in_text(next_text):
                     if amount < MIN_AMOUNT or amount > MAX_VALID_AMOUNT:
@@ -502,7 +1565,7 @@ class TotalExtractor:
                     score += min(float(line.get("confidence", 0.0)), 1.0) * 0.15
                     score += min(float(next_line.get("confidence", 0.0)), 1.0) * 0.15
                     score += (amount / MAX_VALID_AMOUNT) * 0.12
-                    distance_penalty = (next_idx - idx) * 0.03
+                    distance_penalty = (distance_idx - idx) * 0.03
                     score -= distance_penalty
                     candidates.append((amount, score, next_line["bbox"]))
 
@@ -515,28 +1578,9 @@ class TotalExtractor:
             return None
         return {"total": amount, "confidence": round(min(score, 1.0), 4), "bbox": bbox}
 
-    @staticmethod
-    def _keyword_match(text: str) -> bool:
-        normalized = text.replace("0", "o")
-        for kw in TOTAL_KEYWORDS:
-            if kw in normalized:
-                return True
-        return False
-
     @staticmethod
     def _amounts_in_text(text: str) -> List[int]:
-        amounts = []
-        for match in AMOUNT_RE.finditer(text):
-            raw = match.group(1)
-            value = parse_amount(raw)
-            if value is None:
-                continue
-            if value < MIN_AMOUNT or value > MAX_VALID_AMOUNT:
-                continue
-            if len(str(value)) > 12:
-                continue
-            amounts.append(value)
-        return amounts
+        return amounts_in_text(text)
 
     @staticmethod
     def _score(keyword: bool, bottom: bool, confidence: float) -> float:
@@ -550,6 +1594,440 @@ class TotalExtractor:
         return score
 
 
+PAGE_SCOPE = "page"
+STRATEGY_DEMOTE_MIN_EVALUATIONS = 200
+STRATEGY_STATS_WINDOW = 5000
+BILLING_SCOPES = frozenset({"resi_tagihan", "unknown"})
+
+
+class ExtractionStrategy(NamedTuple):
+    """A total extraction strategy and when it is worth running.
+
+    ``categories`` lists the receipt categories (or ``PAGE_SCOPE`` for the whole-page override)
+    it applies to. A strategy with ``anchors`` can only produce a total when one of them occurs
+    in the lines, so it is skipped otherwise. ``ordered`` strategies read lines top to bottom
+    and are handed ``spatial.ordered``, which lets a group and a page with the same lines share
+    one memoized result.
+    """
+
+    name: str
+    run: Callable[["OCRService", "LineSet", int], Optional[Dict[str, Any]]]
+    categories: FrozenSet[str]
+    anchors: FrozenSet[str] = frozenset()
+    normalized: bool = False
+    ordered: bool = False
+
+
+# Registry order is the cascade order within a category.
+EXTRACTION_STRATEGIES = [
+    ExtractionStrategy(
+        "handwritten_max",
+        lambda svc, lines, page_height: svc._extract_max_currency_total(lines, 0.6, MIN_HANDWRITTEN_AMOUNT),
+        frozenset({"handwritten"}),
+    ),
+    ExtractionStrategy(
+        "retail_ranked",
+        lambda svc, lines, page_height: svc._extract_retail_v3_ranked(lines, page_height),
+        frozenset({"retail_printed"}),
+    ),
+    ExtractionStrategy(
+        "digital_payment_max",
+        lambda svc, lines, page_height: svc._extract_max_currency_total(lines, 0.7),
+        frozenset({"digital_payment"}),
+    ),
+    ExtractionStrategy(
+        "simple_proof_max",
+        lambda svc, lines, page_height: svc._extract_max_currency_total(lines, 0.6),
+        frozenset({"simple_proof"}),
+    ),
+    ExtractionStrategy(
+        "kuitansi_sebesar",
+        lambda svc, lines, page_height: svc._extract_sebesar_total(lines),
+        frozenset({"institutional_kuitansi"}),
+        anchors=frozenset({"sebesar"}),
+    ),
+    ExtractionStrategy(
+        "total_bayar",
+        lambda svc, lines, page_height: svc._extract_total_bayar(lines),
+        BILLING_SCOPES | {PAGE_SCOPE},
+        anchors=frozenset(KEYWORDS.groups["total_bayar"] | {"jumlah tagihan", "total tagihan", "total"}),
+        normalized=True,
+        ordered=True,
+    ),
+    ExtractionStrategy(
+        "explicit_jumlah_tagihan",
+        lambda svc, lines, page_height: svc._extract_explicit_jumlah_tagihan(lines),
+        BILLING_SCOPES | {PAGE_SCOPE},
+        anchors=frozenset({"total bayar", "total pembayaran", "jumlah tagihan"}),
+        ordered=True,
+    ),
+    ExtractionStrategy(
+        "tagihan_anchor",
+        lambda svc, lines, page_height: svc._extract_tagihan_anchor_total(lines),
+        BILLING_SCOPES | {PAGE_SCOPE},
+        anchors=frozenset({"tagihan"}),
+        ordered=True,
+    ),
+    ExtractionStrategy(
+        "billing_anchor",
+        lambda svc, lines, page_height: svc._extract_unknown_billing_total(lines),
+        BILLING_SCOPES,
+        anchors=frozenset(KEYWORDS.groups["strong_billing"] | KEYWORDS.groups["weak_billing"]),
+        ordered=True,
+    ),
+    ExtractionStrategy(
+        "keyword_stages",
+        lambda svc, lines, page_height: svc.extractor.extract(lines, page_height),
+        frozenset({"institutional_kuitansi", "unknown"}),
+    ),
+]
+
+
+class StrategyEngine:
+    """Run the strategies registered for a category and stop at the first accepted total.
+
+    Results are memoized per (strategy, line set, page height) until ``reset``, and every
+    strategy keeps counters of real invocations, memo hits, anchor skips, accepted results
+    and time spent.
+
+    Per-category hit rates and costs are also kept so they can be persisted to
+    ``OCR_STRATEGY_STATS_PATH``. Since the first accepted total wins, the registry order is
+    a precision order and hit rates do not reorder it: a strategy that accepts often is not
+    more often right. ``OCR_STRATEGY_ORDER=adaptive`` (opt-in; ``fixed`` is the default)
+    only moves strategies that were evaluated at least ``STRATEGY_DEMOTE_MIN_EVALUATIONS``
+    times in a category without ever accepting to the end of its cascade. They still run
+    whenever nothing ahead of them accepts, so a receipt that needs one is still read; what
+    changes with the stats file is only how many strategies a typical page evaluates.
+    """
+
+    def __init__(
+        self,
+        owner: "OCRService",
+        strategies: Sequence[ExtractionStrategy],
+        order: Optional[str] = None,
+        stats_path: Optional[str] = None,
+    ) -> None:
+        self.owner = owner
+        self.strategies = list(strategies)
+        self.order = order or self._order_mode()
+        self.stats_path = stats_path if stats_path is not None else self._stats_path()
+        self.stats: Dict[str, Dict[str, float]] = {
+            strategy.name: {"calls": 0, "memo_hits": 0, "anchor_skips": 0, "accepted": 0, "seconds": 0.0}
+            for strategy in self.strategies
+        }
+        self.history = self._load_history(self.stats_path) if self.stats_path else {}
+        self.session: Dict[str, Dict[str, Dict[str, float]]] = {}
+        self._cascades: Dict[str, List[ExtractionStrategy]] = {}
+        self._memo: Dict[Tuple[str, "LineSet", int], Optional[Dict[str, Any]]] = {}
+
+    @staticmethod
+    def _order_mode() -> str:
+        mode = (os.getenv("OCR_STRATEGY_ORDER") or "fixed").strip().lower()
+        return mode if mode in {"fixed", "adaptive"} else "fixed"
+
+    @staticmethod
+    def _stats_path() -> Optional[str]:
+        return (os.getenv("OCR_STRATEGY_STATS_PATH") or "").strip() or None
+
+    @staticmethod
+    def _load_history(path: str) -> Dict[str, Dict[str, Dict[str, float]]]:
+        try:
+            with open(path, "r", encoding="utf-8") as handle:
+                data = json.load(handle)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as exc:
+            LOG.warning("Ignoring strategy stats %s: %s", path, exc)
+            return {}
+        categories = data.get("categories") if isinstance(data, dict) else None
+        return categories if isinstance(categories, dict) else {}
+
+    def reset(self) -> None:
+        self._memo.clear()
+
+    def applicable(self, category: str) -> List[ExtractionStrategy]:
+        cascade = self._cascades.get(category)
+        if cascade is None:
+            cascade = [strategy for strategy in self.strategies if category in strategy.categories]
+            if self.order == "adaptive":
+                cascade = self._demote_unproductive(category, cascade)
+            self._cascades[category] = cascade
+        return cascade
+
+    def _demote_unproductive(self, category: str, cascade: List[ExtractionStrategy]) -> List[ExtractionStrategy]:
+        history = self.history.get(category, {})
+        kept: List[ExtractionStrategy] = []
+        demoted: List[ExtractionStrategy] = []
+        for strategy in cascade:
+            counters = history.get(strategy.name) or {}
+            evaluations = float(counters.get("evaluations", 0))
+            unproductive = evaluations >= STRATEGY_DEMOTE_MIN_EVALUATIONS and not float(counters.get("accepted", 0))
+            (demoted if unproductive else kept).append(strategy)
+        return kept + demoted
+
+    def run(self, category: str, lines: Sequence[Line], page_height: int) -> Optional[Dict[str, Any]]:
+        lines = LineSet.of(lines)
+        session = self.session.setdefault(category, {})
+        for strategy in self.applicable(category):
+            started = time.perf_counter()
+            result = self._evaluate(strategy, lines, page_height)
+            counters = session.setdefault(strategy.name, {"evaluations": 0, "accepted": 0, "seconds": 0.0})
+            counters["evaluations"] += 1
+            counters["seconds"] += time.perf_counter() - started
+            if result is not None:
+                counters["accepted"] += 1
+                self.stats[strategy.name]["accepted"] += 1
+                return result
+        return None
+
+    def report(self) -> Dict[str, Dict[str, float]]:
+        return {
+            name: {**{k: v for k, v in counters.items() if k != "seconds"}, "ms": round(counters["seconds"] * 1000.0, 3)}
+            for name, counters in self.stats.items()
+        }
+
+    def save(self) -> None:
+        """Merge this run's per-category counters into the stats file, if one is configured."""
+        if not self.stats_path or not self.session:
+            return
+        # Re-read so runs that finished since startup are not overwritten.
+        merged = self._load_history(self.stats_path)
+        for category, strategies in self.session.items():
+            stored = merged.setdefault(category, {})
+            for name, counters in strategies.items():
+                entry = stored.setdefault(name, {"evaluations": 0, "accepted": 0, "seconds": 0.0})
+                for key, value in counters.items():
+                    entry[key] = entry.get(key, 0) + value
+            if max(entry["evaluations"] for entry in stored.values()) > STRATEGY_STATS_WINDOW:
+                # Halve old evidence so the order follows a changing document mix.
+                for entry in stored.values():
+                    for key in entry:
+                        entry[key] = entry[key] / 2
+        tmp_path = f"{self.stats_path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as handle:
+                json.dump({"version": 1, "categories": merged}, handle)
+            os.replace(tmp_path, self.stats_path)
+        except OSError as exc:
+            LOG.warning("Could not save strategy stats to %s: %s", self.stats_path, exc)
+            return
+        self.session = {}
+
+    def _evaluate(self, strategy: ExtractionStrategy, lines: "LineSet", page_height: int) -> Optional[Dict[str, Any]]:
+        counters = self.stats[strategy.name]
+        if strategy.anchors and not lines.tokens.has_any(strategy.anchors, normalized=strategy.normalized):
+            counters["anchor_skips"] += 1
+            return None
+
+        target = lines.spatial.ordered if strategy.ordered else lines
+        # Lines compare by identity, so equal keys mean the very same OCR lines in the same order.
+        key = (strategy.name, target, page_height)
+        if key in self._memo:
+            counters["memo_hits"] += 1
+            return self._memo[key]
+
+        started = time.perf_counter()
+        result = strategy.run(self.owner, target, page_height)
+        counters["seconds"] += time.perf_counter() - started
+        counters["calls"] += 1
+        self._memo[key] = result
+        return result
+
+
+class TemplateLibrary:
+    """Layouts of recurring issuers, learned from pages whose total was already found.
+
+    A template is the 256-bit dHash fingerprint of the page header band, the words printed in
+    that band, the page aspect ratio, the anchor keyword labelling the total and the
+    page-relative region around that row. The fingerprint only shortlists templates: a mostly
+    white header band hashes alike for most issuers, so the band is OCR'd at low resolution
+    and a template is used only when its header words agree. The page is then read only
+    inside the region; the read counts only if the anchor shows up there with an amount on
+    its row, so a wrong match costs the header band and one small crop before the usual
+    full-page OCR. Templates live in ``OCR_TEMPLATE_PATH`` (disabled when unset); ones that
+    keep failing are dropped.
+    """
+
+    ANCHOR_WORDS = KEYWORDS.groups["total"] | KEYWORDS.groups["total_bayar"] | KEYWORDS.groups["strong_billing"]
+
+    def __init__(self, path: Optional[str] = None) -> None:
+        self.path = path if path is not None else self._library_path()
+        self.templates: Dict[str, Dict[str, Any]] = self._load(self.path) if self.path else {}
+        self._learned: Dict[str, Dict[str, Any]] = {}
+        self._outcomes: Dict[str, Dict[str, int]] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.path)
+
+    @staticmethod
+    def _library_path() -> Optional[str]:
+        return (os.getenv("OCR_TEMPLATE_PATH") or "").strip() or None
+
+    @staticmethod
+    def _load(path: str) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(path, "r", encoding="utf-8") as handle:
+                data = json.load(handle)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as exc:
+            LOG.warning("Ignoring template library %s: %s", path, exc)
+            return {}
+        templates = data.get("templates") if isinstance(data, dict) else None
+        if not isinstance(templates, list):
+            return {}
+        # Summary templates and ones saved without header words by older versions are dropped.
+        return {
+            t["name"]: t
+            for t in templates
+            if isinstance(t, dict)
+            and "name" in t
+            and t.get("header")
+            and t.get("category") != SUMMARY_TEMPLATE_CATEGORY
+        }
+
+    @staticmethod
+    def fingerprint(image: Image.Image) -> Tuple[int, float]:
+        """256-bit difference hash of the header band, and the page aspect ratio."""
+        pixels = np.asarray(
+            TemplateLibrary.header_band(image)
+            .convert("L")
+            .resize((TEMPLATE_HASH_SIZE + 1, TEMPLATE_HASH_SIZE), Image.BILINEAR),
+            dtype=np.int16,
+        )
+        bits = (pixels[:, 1:] > pixels[:, :-1]).flatten()
+        return int("".join("1" if bit else "0" for bit in bits), 2), image.height / max(image.width, 1)
+
+    @staticmethod
+    def header_band(image: Image.Image) -> Image.Image:
+        return image.crop((0, 0, image.width, max(int(image.height * TEMPLATE_HEADER_BAND), 1)))
+
+    @staticmethod
+    def header_words(lines: Sequence[Line], band_height: float) -> FrozenSet[str]:
+        """Words of three or more letters on the lines centred within ``band_height``."""
+        return frozenset(
+            word
+            for line in lines
+            if line.y_center <= band_height
+            for word in TEMPLATE_HEADER_WORD_RE.findall(line.text.upper())
+        )
+
+    @staticmethod
+    def same_header(template: Dict[str, Any], words: FrozenSet[str]) -> bool:
+        """Whether ``words`` agree with the template's header words (Jaccard similarity)."""
+        known = frozenset(template.get("header", ()))
+        union = known | words
+        return bool(union) and len(known & words) / len(union) >= TEMPLATE_HEADER_MIN_SIMILARITY
+
+    def match(self, image: Image.Image) -> List[Dict[str, Any]]:
+        """Templates whose fingerprint is close to the page's, nearest first."""
+        if not self.templates:
+            return []
+        return self._candidates(*self.fingerprint(image))
+
+    def _candidates(self, digest: int, aspect: float) -> List[Dict[str, Any]]:
+        scored: List[Tuple[int, Dict[str, Any]]] = []
+        for template in self.templates.values():
+            if abs(template["aspect"] - aspect) > TEMPLATE_MAX_ASPECT_DELTA * aspect:
+                continue
+            distance = bin(int(template["fingerprint"], 16) ^ digest).count("1")
+            if distance <= TEMPLATE_MAX_DISTANCE:
+                scored.append((distance, template))
+        return [template for _distance, template in sorted(scored, key=lambda item: item[0])]
+
+    def learn(self, image: Image.Image, lines: Sequence[Line], total: Dict[str, Any], category: str) -> None:
+        """Save the layout of a page whose ``total`` came from ``lines`` read in the preprocessed frame.
+
+        LPJ summary pages are never learned: their total replaces the per-receipt totals of the
+        other pages, which only summary detection can decide.
+        """
+        if not self.enabled or not total.get("bbox") or category == SUMMARY_TEMPLATE_CATEGORY:
+            return
+        ordered = LineSet.of(lines).spatial.ordered
+        amount_pos = next((pos for pos, line in enumerate(ordered) if line.bbox == total["bbox"]), None)
+        if amount_pos is None:
+            return
+        rows = ordered.rows
+        labels = [
+            (max(words, key=len), pos)
+            for pos in rows.rows[rows.row_at[amount_pos]]
+            for words in [ordered[pos].hits.keywords & self.ANCHOR_WORDS]
+            if words
+        ]
+        if not labels:
+            return
+        anchor, label_pos = max(labels, key=lambda item: len(item[0]))
+
+        frame = OCRProcessor.frame_scale(image)
+        width, height = image.width * frame, image.height * frame
+        header = self.header_words(ordered, height * TEMPLATE_HEADER_BAND)
+        # Without enough header text a match could not be confirmed, so nothing is learned.
+        if len(header) < TEMPLATE_HEADER_MIN_WORDS:
+            return
+        xs = ordered[label_pos].bbox[0::2] + ordered[amount_pos].bbox[0::2]
+        ys = ordered[label_pos].bbox[1::2] + ordered[amount_pos].bbox[1::2]
+        region = [
+            max(min(xs) / width - TEMPLATE_PADDING_X, 0.0),
+            max(min(ys) / height - TEMPLATE_PADDING_Y, 0.0),
+            min(max(xs) / width + TEMPLATE_PADDING_X, 1.0),
+            min(max(ys) / height + TEMPLATE_PADDING_Y, 1.0),
+        ]
+
+        digest, aspect = self.fingerprint(image)
+        # Relearning a known layout replaces its region instead of adding a near-duplicate.
+        known = next((t for t in self._candidates(digest, aspect) if self.same_header(t, header)), None)
+        if known is not None:
+            name = known["name"]
+        else:
+            name = f"tpl-{digest:064x}-{zlib.crc32(' '.join(sorted(header)).encode()):08x}"
+        template = {
+            "name": name,
+            "fingerprint": f"{digest:064x}",
+            "header": sorted(header),
+            "aspect": round(aspect, 4),
+            "anchor": anchor,
+            "region": [round(value, 4) for value in region],
+            "category": category,
+            "hits": known.get("hits", 0) if known is not None else 0,
+            "misses": 0,
+        }
+        self.templates[name] = template
+        self._learned[name] = template
+        self._outcomes.pop(name, None)
+
+    def record(self, template: Dict[str, Any], hit: bool) -> None:
+        outcome = self._outcomes.setdefault(template["name"], {"hits": 0, "misses": 0})
+        outcome["hits" if hit else "misses"] += 1
+
+    def save(self) -> None:
+        """Merge learned templates and hit/miss counts into the library file, if one is configured."""
+        if not self.path or not (self._learned or self._outcomes):
+            return
+        # Re-read so templates saved by other runs since startup are kept.
+        merged = self._load(self.path)
+        merged.update(self._learned)
+        for name, outcome in self._outcomes.items():
+            template = merged.get(name)
+            if template is None:
+                continue
+            template["hits"] = template.get("hits", 0) + outcome["hits"]
+            template["misses"] = template.get("misses", 0) + outcome["misses"]
+            if template["misses"] >= TEMPLATE_MAX_MISSES and template["misses"] > template["hits"]:
+                del merged[name]
+        kept = sorted(merged.values(), key=lambda t: t.get("hits", 0), reverse=True)[:TEMPLATE_LIBRARY_SIZE]
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as handle:
+                json.dump({"version": 1, "templates": kept}, handle)
+            os.replace(tmp_path, self.path)
+        except OSError as exc:
+            LOG.warning("Could not save template library to %s: %s", self.path, exc)
+            return
+        self._learned = {}
+        self._outcomes = {}
+
+
 class OCRService:
     """End-to-end OCR pipeline."""
 
@@ -557,20 +2035,132 @@ class OCRService:
         self.processor = OCRProcessor()
         self.classifier = ReceiptClassifier()
         self.segmenter = ReceiptSegmenter()
+        self.quality = ImageQualityAnalyzer()
         self.extractor = TotalExtractor()
+        self.strategies = StrategyEngine(self, EXTRACTION_STRATEGIES)
+        self.templates = TemplateLibrary()
 
     @staticmethod
     def _summary_template_mode() -> str:
         mode = (os.getenv("OCR_SUMMARY_TEMPLATE_MODE") or "strict").strip().lower()
         return mode if mode in {"strict", "lenient"} else "strict"
 
+    @staticmethod
+    def _early_exit_enabled() -> bool:
+        return (os.getenv("OCR_EARLY_EXIT") or "").strip().lower() in {"1", "true", "yes", "on"}
+
+    @staticmethod
+    def _early_exit_confidence() -> float:
+        try:
+            return float(os.getenv("OCR_EARLY_EXIT_CONFIDENCE") or EARLY_EXIT_DEFAULT_CONFIDENCE)
+        except ValueError:
+            return EARLY_EXIT_DEFAULT_CONFIDENCE
+
+    @staticmethod
+    def _early_exit_bands() -> int:
+        try:
+            return max(int(os.getenv("OCR_EARLY_EXIT_BANDS") or EARLY_EXIT_DEFAULT_BANDS), 1)
+        except ValueError:
+            return EARLY_EXIT_DEFAULT_BANDS
+
+    @staticmethod
+    def _summary_roi_enabled() -> bool:
+        return (os.getenv("OCR_SUMMARY_ROI") or "").strip().lower() in {"1", "true", "yes", "on"}
+
+    @staticmethod
+    def _summary_lowres_width() -> int:
+        try:
+            return max(int(os.getenv("OCR_SUMMARY_LOWRES_WIDTH") or SUMMARY_LOWRES_DEFAULT_WIDTH), 200)
+        except ValueError:
+            return SUMMARY_LOWRES_DEFAULT_WIDTH
+
+    @staticmethod
+    def _quality_triage_enabled() -> bool:
+        return (os.getenv("OCR_QUALITY_TRIAGE") or "").strip().lower() in {"1", "true", "yes", "on"}
+
+    @staticmethod
+    def _qr_fast_path_enabled() -> bool:
+        return (os.getenv("OCR_QR_FAST_PATH") or "").strip().lower() in {"1", "true", "yes", "on"}
+
+    @staticmethod
+    def _blank_page_skip_enabled() -> bool:
+        return (os.getenv("OCR_BLANK_PAGE_SKIP") or "").strip().lower() in {"1", "true", "yes", "on"}
+
+    @staticmethod
+    def _blank_page_ink_ratio() -> float:
+        try:
+            return max(float(os.getenv("OCR_BLANK_PAGE_INK_RATIO") or BLANK_PAGE_DEFAULT_INK_RATIO), 0.0)
+        except ValueError:
+            return BLANK_PAGE_DEFAULT_INK_RATIO
+
+    @staticmethod
+    def _page_ink_ratio(image: Image.Image) -> float:
+        ink = OCRService._ink_cells(image)
+        return float(np.count_nonzero(ink)) / ink.size if ink.size else 0.0
+
+    @staticmethod
+    def _ink_cells(image: Image.Image) -> np.ndarray:
+        """Thumbnail mask of cells clearly darker than the paper around them.
+
+        The thumbnail keeps the darkest pixel of each block, so thin pen strokes survive the
+        downscale. The background of each cell is the brightest cell within
+        ``BLANK_PAGE_BACKGROUND_WINDOW`` cells, so a receipt photographed on a dark table is
+        measured against its own paper (the table edge around it reads as ink, which only errs
+        towards running OCR), while a uniformly grey separator sheet still counts as blank. Ink
+        cells without an inked neighbour are ignored as specks.
+        """
+        gray = np.asarray(image.convert("L"))
+        factor = max(-(-max(gray.shape) // BLANK_PAGE_THUMBNAIL_SIDE), 1)
+        rows, cols = gray.shape[0] // factor, gray.shape[1] // factor
+        if not rows or not cols:
+            return np.zeros((0, 0), dtype=bool)
+        thumb = gray[: rows * factor, : cols * factor].reshape(rows, factor, cols, factor).min(axis=(1, 3))
+        window = cv2.getStructuringElement(cv2.MORPH_RECT, (BLANK_PAGE_BACKGROUND_WINDOW, BLANK_PAGE_BACKGROUND_WINDOW))
+        background = cv2.dilate(thumb, window)
+        ink = thumb.astype(np.int16) < background.astype(np.int16) - BLANK_PAGE_INK_CONTRAST
+        # Strokes span neighbouring cells; isolated dust and scanner specks do not.
+        touching = np.zeros_like(ink)
+        touching[1:] |= ink[:-1]
+        touching[:-1] |= ink[1:]
+        touching[:, 1:] |= ink[:, :-1]
+        touching[:, :-1] |= ink[:, 1:]
+        return ink & touching
+
+    def _blank_page_indexes(self, pages: List[Image.Image]) -> List[int]:
+        threshold = self._blank_page_ink_ratio()
+        if not self._blank_page_skip_enabled() or threshold <= 0:
+            return []
+        return [idx for idx, image in enumerate(pages) if self._page_ink_ratio(image) < threshold]
+
     def process(self, input_path: str) -> Dict[str, Any]:
         pages = self._load_pages(input_path)
         if not pages:
             return {"error": "No pages to process", "grand_total": None}
 
-        focus_page_indexes = self._find_summary_focus_page_indexes(pages)
-        summary_template = self._detect_summary_template(pages, focus_page_indexes)
+        blank_indexes = self._blank_page_indexes(pages)
+        resolved: Dict[int, Dict[str, Any]] = {
+            idx: {"skipped": "blank", "page_total": 0, "receipt_count": 0, "raw_text": []} for idx in blank_indexes
+        }
+        qr_fast_path = self._qr_fast_path_enabled()
+        for idx, image in enumerate(pages):
+            if idx in resolved:
+                continue
+            fast_result = self._qr_page_result(image) if qr_fast_path else None
+            if fast_result is None and self.templates.enabled:
+                fast_result = self._template_page_result(image)
+            if fast_result is not None:
+                resolved[idx] = fast_result
+        result = self._process_pages(pages, resolved)
+        result["skipped_pages"] = len(blank_indexes)
+        return result
+
+    def _process_pages(self, pages: List[Image.Image], resolved: Dict[int, Dict[str, Any]]) -> Dict[str, Any]:
+        """Run the summary passes and per-page extraction; ``resolved`` pages are never OCRed."""
+        # Both summary passes read pages at the same threshold; share lines (and their analysis).
+        # Resolved pages enter the cache with no lines, so neither pass OCRs them.
+        summary_lines: Dict[int, LineSet] = {idx: LineSet() for idx in resolved}
+        focus_page_indexes = self._find_summary_focus_page_indexes(pages, summary_lines)
+        summary_template = self._detect_summary_template(pages, focus_page_indexes, summary_lines)
         if summary_template is not None:
             detected_page = summary_template["page"]
             detected_total = summary_template["total"]
@@ -629,8 +2219,10 @@ class OCRService:
         page_confidences = []
 
         for idx, image in enumerate(pages, start=1):
-            page_result = self._process_page(image)
+            page_result = resolved.get(idx - 1) or self._process_page(image)
             per_page.append({"page": idx, **page_result})
+            if page_result.get("skipped"):
+                continue
 
             all_text.extend(page_result.get("raw_text", []))
             page_confidences.append(page_result.get("avg_confidence", 0.0))
@@ -665,32 +2257,150 @@ class OCRService:
             "raw_text": "\n".join(all_text),
         }
 
+    def _qr_page_result(self, image: Image.Image) -> Optional[Dict[str, Any]]:
+        """Page result read from the QRIS/EMVCo codes on the page, or None to fall back to OCR.
+
+        Only payloads with a valid CRC and an amount (dynamic codes) count; each distinct code
+        is one receipt. The page is only resolved this way when it holds nothing but those QR
+        receipts; any other receipt beside them sends the whole page to OCR.
+        """
+        amounts: List[int] = []
+        regions: List[Tuple[float, float, float, float]] = []
+        for payload, region in self._decode_qr_codes(image):
+            amount = emv_amount(payload)
+            if amount is not None:
+                amounts.append(amount)
+                regions.append(region)
+        if not amounts or not self._only_qr_receipts(image, regions):
+            return None
+        return {
+            "page_total": sum(amounts),
+            "receipt_count": len(amounts),
+            "receipts": [{"total": amount, "confidence": 1.0} for amount in amounts],
+            "categories": ["digital_payment"] * len(amounts),
+            "avg_confidence": 1.0,
+            "raw_text": [],
+            "source": "qr",
+        }
+
+    def _template_page_result(self, image: Image.Image) -> Optional[Dict[str, Any]]:
+        """Page result read from the total region of a known layout, or None to fall back to OCR."""
+        candidates = self.templates.match(image)
+        if not candidates:
+            return None
+        # A close fingerprint only shortlists layouts; the header text has to name the same issuer.
+        band = TemplateLibrary.header_band(image)
+        header_lines = self.processor.run(band, handwritten=False, conf_threshold=0.6, max_width=TEMPLATE_HEADER_WIDTH)
+        words = TemplateLibrary.header_words(
+            header_lines, band.height * self.processor.frame_scale(band, TEMPLATE_HEADER_WIDTH)
+        )
+        template = next((t for t in candidates if TemplateLibrary.same_header(t, words)), None)
+        if template is None:
+            return None
+        x0, y0, x1, y1 = template["region"]
+        box = (int(x0 * image.width), int(y0 * image.height), int(x1 * image.width) + 1, int(y1 * image.height) + 1)
+        crop = image.crop(box)
+        # The region is small, so it is read at native resolution like the summary Total row.
+        lines = LineSet.of(self.processor.run(crop, handwritten=False, conf_threshold=0.6, max_width=crop.width))
+        found = self._template_total(lines, template["anchor"], crop.height / 2.0)
+        self.templates.record(template, found is not None)
+        if found is None:
+            return None
+        amount, confidence = found
+        return {
+            "page_total": amount,
+            "receipt_count": 1,
+            "receipts": [{"total": amount, "confidence": round(confidence, 4)}],
+            "categories": [template.get("category", "unknown")],
+            "avg_confidence": self._avg_conf(lines),
+            "raw_text": [l["text"] for l in lines],
+            "source": "template",
+            "template": template["name"],
+        }
+
+    @staticmethod
+    def _template_total(lines: LineSet, anchor: str, middle: float) -> Optional[Tuple[int, float]]:
+        """Amount on the row of the ``anchor`` label nearest ``middle``, the learned row's height."""
+        ordered = lines.spatial.ordered
+        rows = ordered.rows
+        candidates: List[Tuple[float, int, float]] = []
+        for pos, line in enumerate(ordered):
+            hits = line.hits.keywords & TemplateLibrary.ANCHOR_WORDS
+            if not hits or max(hits, key=len) != anchor:
+                continue
+            partners = [ordered[other] for other in rows.right_of(pos) if ordered[other].amounts]
+            source = line if line.amounts else (partners[0] if partners else None)
+            if source is None:
+                continue
+            confidence = min(line.confidence, source.confidence)
+            candidates.append((abs(line.y_center - middle), max(source.amounts), confidence))
+        if not candidates:
+            return None
+        _distance, amount, confidence = min(candidates, key=lambda item: item[0])
+        return amount, confidence
+
     @staticmethod
-    def _has_summary_focus_keyword(lines: List[Dict[str, Any]]) -> bool:
-        text_joined = "\n".join(line["text"].lower() for line in lines)
-        normalized_text = re.sub(r"[^a-z0-9]+", " ", text_joined)
-        normalized_text = re.sub(r"\s+", " ", normalized_text).strip()
-        if any(keyword in normalized_text for keyword in SUMMARY_TEMPLATE_PAGE_KEYWORDS):
+    def _only_qr_receipts(image: Image.Image, regions: List[Tuple[float, float, float, float]]) -> bool:
+        """Whether all ink on the page lies around the given QR codes (page-relative boxes).
+
+        A QR receipt's text sits above and below its code, so each code is widened by
+        ``QR_RECEIPT_MARGIN_X`` code widths on both sides and ``QR_RECEIPT_MARGIN_Y`` code
+        heights above and below; more than ``QR_OUTSIDE_INK_RATIO`` of the page inked outside
+        those areas means another receipt shares the page.
+        """
+        ink = OCRService._ink_cells(image)
+        if not ink.size:
             return True
-        return "pertanggung" in normalized_text and "jawab" in normalized_text
+        rows, cols = ink.shape
+        outside = ink.copy()
+        for x0, y0, x1, y1 in regions:
+            width, height = x1 - x0, y1 - y0
+            top = max(int((y0 - height * QR_RECEIPT_MARGIN_Y) * rows), 0)
+            bottom = min(int(np.ceil((y1 + height * QR_RECEIPT_MARGIN_Y) * rows)), rows)
+            left = max(int((x0 - width * QR_RECEIPT_MARGIN_X) * cols), 0)
+            right = min(int(np.ceil((x1 + width * QR_RECEIPT_MARGIN_X) * cols)), cols)
+            outside[top:bottom, left:right] = False
+        return float(np.count_nonzero(outside)) / ink.size <= QR_OUTSIDE_INK_RATIO
+
+    @staticmethod
+    def _decode_qr_codes(image: Image.Image) -> List[Tuple[str, Tuple[float, float, float, float]]]:
+        """Distinct QR payloads on the page with their page-relative bounding boxes."""
+        gray = np.asarray(image.convert("L"))
+        if gray.shape[1] > PREPROCESS_MAX_WIDTH:
+            height = max(int(gray.shape[0] * PREPROCESS_MAX_WIDTH / gray.shape[1]), 1)
+            gray = cv2.resize(gray, (PREPROCESS_MAX_WIDTH, height), interpolation=cv2.INTER_AREA)
+        try:
+            found, decoded, points, _codes = cv2.QRCodeDetector().detectAndDecodeMulti(gray)
+        except cv2.error as exc:
+            LOG.warning("QR decoding failed: %s", exc)
+            return []
+        if not found:
+            return []
+        rows, cols = gray.shape
+        codes: Dict[str, Tuple[float, float, float, float]] = {}
+        for payload, corners in zip(decoded, points):
+            # The same code can be reported twice; keep the first of each payload.
+            if not payload or payload in codes:
+                continue
+            xs, ys = corners[:, 0], corners[:, 1]
+            codes[payload] = (float(xs.min()) / cols, float(ys.min()) / rows, float(xs.max()) / cols, float(ys.max()) / rows)
+        return list(codes.items())
+
+    @staticmethod
+    def _has_summary_focus_keyword(lines: List[Line]) -> bool:
+        return LineSet.of(lines).analysis.is_summary_focus
 
-    def _score_summary_page(self, lines: List[Dict[str, Any]], page_width: int, page_height: int) -> float:
+    def _score_summary_page(self, lines: List[Line], page_width: int, page_height: int) -> float:
         if not lines:
             return 0.0
 
-        text_joined = "\n".join(line["text"].lower() for line in lines)
-        normalized_text = re.sub(r"[^a-z0-9]+", " ", text_joined)
-        normalized_text = re.sub(r"\s+", " ", normalized_text).strip()
-
-        has_laporan = "laporan" in normalized_text
-        has_rekap = "rekap" in normalized_text or "rekapitulasi" in normalized_text
-        has_pengeluaran = "pengeluaran" in normalized_text
-        has_pertanggungjawaban = (
-            "pertanggung jawaban" in normalized_text
-            or "pertanggungjawaban" in normalized_text
-            or ("pertanggung" in normalized_text and "jawab" in normalized_text)
-        )
-        has_generic_total = "jumlah" in normalized_text or "total" in normalized_text
+        lines = LineSet.of(lines)
+        analysis = lines.analysis
+        has_laporan = analysis.has_laporan
+        has_rekap = analysis.has_rekap
+        has_pengeluaran = analysis.has_pengeluaran
+        has_pertanggungjawaban = analysis.has_pertanggungjawaban
+        has_generic_total = analysis.has_generic_total
 
         score = 0.0
         if has_laporan or has_rekap:
@@ -702,46 +2412,130 @@ class OCRService:
         if has_generic_total and not (has_laporan or has_rekap or has_pengeluaran or has_pertanggungjawaban):
             score -= 0.2
 
-        keyword_lines = [
-            line
-            for line in lines
-            if re.search(r"lapor|rekap|pertanggung|jawab", line["text"], re.IGNORECASE)
-        ]
-        pengeluaran_lines = [line for line in lines if "pengeluaran" in line["text"].lower()]
-        if keyword_lines and pengeluaran_lines:
-            title_line = sorted(keyword_lines, key=lambda line: y_center(line["bbox"]))[0]
-            pengeluaran_line = sorted(pengeluaran_lines, key=lambda line: y_center(line["bbox"]))[0]
-            title_y = y_center(title_line["bbox"])
-            header_y = y_center(pengeluaran_line["bbox"])
+        keyword_lines = analysis.title_lines
+        index = lines.spatial
+        header_positions = lines.tokens.positions(["pengeluaran"])
+        if keyword_lines and header_positions:
+            title_line = sorted(keyword_lines, key=lambda line: line.y_center)[0]
+            title_y = title_line.y_center
+            header_y = index.y_centers[header_positions[0]]
             if title_y < page_height * 0.45 and (title_y + 20.0) < header_y < page_height * 0.75:
                 score += 0.25
 
-        if pengeluaran_lines:
-            header = sorted(pengeluaran_lines, key=lambda line: y_center(line["bbox"]))[0]
-            header_x = x_center(header["bbox"])
-            header_y = y_center(header["bbox"])
+        if header_positions:
+            header_pos = header_positions[0]
             x_tolerance = max(page_width * 0.2, 90)
-
-            column_amount_hits = 0
-            for line in lines:
-                yc = y_center(line["bbox"])
-                if yc <= header_y:
-                    continue
-                xc = x_center(line["bbox"])
-                if abs(xc - header_x) > x_tolerance:
-                    continue
-                if self._amounts_from_line(line["text"].lower()):
-                    column_amount_hits += 1
+            column = index.column(index.x_centers[header_pos], x_tolerance, index.y_centers[header_pos])
+            column_amount_hits = sum(1 for line in column if line.amounts)
 
             if column_amount_hits >= 2:
                 score += min(0.3, 0.18 + (column_amount_hits - 2) * 0.04)
 
         return score
 
-    def _find_summary_focus_page_indexes(self, pages: List[Image.Image]) -> List[int]:
+    def _summary_page_lines(
+        self, pages: List[Image.Image], page_idx: int, cache: Optional[Dict[int, LineSet]]
+    ) -> LineSet:
+        if cache is not None and page_idx in cache:
+            return cache[page_idx]
+        if self._summary_roi_enabled():
+            lines = self._run_lowres(pages[page_idx])
+        else:
+            lines = self.processor.run(pages[page_idx], handwritten=False, conf_threshold=0.35)
+        if cache is not None:
+            cache[page_idx] = lines
+        return lines
+
+    def _run_lowres(self, image: Image.Image) -> LineSet:
+        """OCR a downscaled copy of the page, reporting boxes in the full-resolution frame.
+
+        The page rotation the pass settled on is kept on the returned lines (``LineSet.rotation``)
+        so later crops of this page are cut from the same frame.
+        """
+        width = self._summary_lowres_width()
+        if image.width <= width:
+            lines = LineSet.of(self.processor.run(image, handwritten=False, conf_threshold=0.35))
+        else:
+            small = image.resize((width, max(int(image.height * width / image.width), 1)))
+            read = self.processor.run(small, handwritten=False, conf_threshold=0.35)
+            factor = self.processor.frame_scale(image) * image.width / width
+            lines = LineSet(line.scaled(factor) for line in read)
+        lines.__dict__["_rotation"] = self.processor.last_rotation
+        return lines
+
+    def _extract_summary_two_pass(
+        self,
+        image: Image.Image,
+        lines: LineSet,
+        header_hint_x: Optional[float],
+    ) -> Tuple[Optional[Tuple[int, float, List[float]]], LineSet]:
+        roi_lines = self._summary_roi_lines(image, lines)
+        if roi_lines is not None:
+            extracted = self._extract_pengeluaran_summary_total(roi_lines, image.width, image, header_hint_x)
+            if extracted is not None:
+                return extracted, roi_lines
+        if lines.analysis.is_summary_focus:
+            # Low resolution missed the Total row of a summary page: read the whole page.
+            lines = LineSet.of(self.processor.run(image, handwritten=False, conf_threshold=0.35))
+        return self._extract_pengeluaran_summary_total(lines, image.width, image, header_hint_x), lines
+
+    def _summary_roi_lines(self, image: Image.Image, lines: LineSet) -> Optional[LineSet]:
+        """Re-read the Total row right of the label at full resolution and merge it into ``lines``.
+
+        ``lines`` come from the low-resolution pass of ``image`` and carry its rotation. Returns
+        None when the page has no pengeluaran header with a Total label below it, or the region
+        reads nothing.
+        """
+        analysis = lines.analysis
+        if not analysis.header_indexes:
+            return None
+        header_y = lines[analysis.header_indexes[0]].y_center
+        labels = [line for line in lines if "total" in line.text_lower and line.y_center > header_y]
+        if not labels:
+            return None
+        # Summary totals sit in the last Total row, the one _extract_pengeluaran_summary_total prefers.
+        label = max(labels, key=lambda line: line.y_center)
+
+        if lines.rotation:
+            image = image.rotate(lines.rotation)
+        frame = self.processor.frame_scale(image)
+        xs, ys = label.bbox[0::2], label.bbox[1::2]
+        left = min(xs) - SUMMARY_ROI_PADDING
+        top = min(ys) - max(label.height, SUMMARY_ROI_PADDING)
+        bottom = max(ys) + SUMMARY_ROI_ROW_BELOW + SUMMARY_ROI_PADDING
+        box = (
+            max(int(left / frame), 0),
+            max(int(top / frame), 0),
+            image.width,
+            min(int(bottom / frame) + 1, image.height),
+        )
+        if box[2] <= box[0] or box[3] <= box[1]:
+            return None
+
+        # The strip is short, so it is read at native resolution instead of the usual width cap.
+        crop = image.crop(box)
+        roi_lines = self.processor.run(crop, handwritten=False, conf_threshold=0.35, max_width=crop.width)
+        if not roi_lines:
+            return None
+        factor = frame
+        offset_x, offset_y = box[0] * frame, box[1] * frame
+        roi_lines = [line.scaled(factor).shifted(offset_x, offset_y) for line in roi_lines]
+
+        region_top, region_bottom = box[1] * frame, box[3] * frame
+        region_left = box[0] * frame
+        kept = [
+            line
+            for line in lines
+            if not (region_top <= line.y_center <= region_bottom and line.x_center >= region_left)
+        ]
+        return LineSet(kept + roi_lines)
+
+    def _find_summary_focus_page_indexes(
+        self, pages: List[Image.Image], page_lines: Optional[Dict[int, LineSet]] = None
+    ) -> List[int]:
         scored_indexes: List[Tuple[int, float]] = []
         for page_idx, image in enumerate(pages):
-            lines = self.processor.run(image, handwritten=False, conf_threshold=0.35)
+            lines = self._summary_page_lines(pages, page_idx, page_lines)
             if self._has_summary_focus_keyword(lines):
                 score = self._score_summary_page(lines, image.width, image.height)
                 scored_indexes.append((page_idx, score))
@@ -756,11 +2550,12 @@ class OCRService:
         self,
         pages: List[Image.Image],
         focus_page_indexes: Optional[List[int]] = None,
+        page_lines: Optional[Dict[int, LineSet]] = None,
     ) -> Optional[Dict[str, Any]]:
         if not pages:
             return None
 
-        candidate_pages: List[Tuple[int, Image.Image, List[Dict[str, Any]]]] = []
+        candidate_pages: List[Tuple[int, Image.Image, List[Line]]] = []
         header_hint_x: Optional[float] = None
         if focus_page_indexes:
             candidate_indexes = focus_page_indexes
@@ -769,18 +2564,21 @@ class OCRService:
 
         for page_idx in candidate_indexes:
             image = pages[page_idx]
-            lines = self.processor.run(image, handwritten=False, conf_threshold=0.35)
+            lines = self._summary_page_lines(pages, page_idx, page_lines)
             candidate_pages.append((page_idx, image, lines))
             if header_hint_x is None:
-                header_lines = [line for line in lines if "pengeluaran" in line["text"].lower()]
+                header_lines = [line for line in lines if "pengeluaran" in line.text_lower]
                 if header_lines:
-                    header_hint_x = x_center(header_lines[0]["bbox"])
+                    header_hint_x = header_lines[0].x_center
 
         for page_idx, image, lines in candidate_pages:
             if not lines:
                 continue
 
-            extracted = self._extract_pengeluaran_summary_total(lines, image.width, image, header_hint_x)
+            if self._summary_roi_enabled():
+                extracted, lines = self._extract_summary_two_pass(image, LineSet.of(lines), header_hint_x)
+            else:
+                extracted = self._extract_pengeluaran_summary_total(lines, image.width, image, header_hint_x)
             if extracted is None:
                 continue
 
@@ -797,50 +2595,37 @@ class OCRService:
 
     def _extract_pengeluaran_summary_total(
         self,
-        lines: List[Dict[str, Any]],
+        lines: List[Line],
         page_width: int,
         image: Optional[Image.Image] = None,
         header_hint_x: Optional[float] = None,
     ) -> Optional[Tuple[int, float, List[float]]]:
-        text_joined = "\n".join(line["text"].lower() for line in lines)
-        normalized_text = re.sub(r"[^a-z0-9]+", " ", text_joined)
-        normalized_text = re.sub(r"\s+", " ", normalized_text).strip()
-
         # Strict template gate: must be a reference report table page.
-        has_pengeluaran = "pengeluaran" in normalized_text
-        has_saldo = "saldo" in normalized_text
-        has_laporan = "laporan" in normalized_text
-        has_rekap = "rekap" in normalized_text or "rekapitulasi" in normalized_text
-        has_pertanggungjawaban = (
-            "laporan pertanggung jawaban" in normalized_text
-            or "laporan pertanggungjawaban" in normalized_text
-            or "pertanggungjawaban" in normalized_text
-            or ("pertanggung" in normalized_text and "jawab" in normalized_text)
-        )
-
-        has_table_terms = any(token in text_joined for token in ["saldo", "debet", "kredit", "jumlah", "total"])
-        amount_density = sum(len(self._amounts_from_line(line["text"].lower())) for line in lines)
-        header_lines = [line for line in lines if "pengeluaran" in line["text"].lower()]
-        has_header_context = bool(header_lines or header_hint_x is not None)
+        lines = LineSet.of(lines)
+        analysis = lines.analysis
+        has_pengeluaran = analysis.has_pengeluaran
+        has_saldo = analysis.has_saldo
+        has_laporan = analysis.has_laporan
+        has_rekap = analysis.has_rekap
+        has_pertanggungjawaban = analysis.has_pertanggungjawaban
+
+        has_table_terms = analysis.has_table_terms
+        amount_density = analysis.amount_density
+        geometry = lines.geometry
+        header_indexes = analysis.header_indexes
+        has_header_context = bool(header_indexes or header_hint_x is not None)
 
         column_amount_hits = 0
         if has_header_context:
-            if header_lines:
-                header = header_lines[0]
-                gate_header_x = x_center(header["bbox"])
-                gate_header_y = y_center(header["bbox"])
+            if header_indexes:
+                gate_header_x = geometry.x_centers[header_indexes[0]]
+                gate_header_y = geometry.y_centers[header_indexes[0]]
             else:
                 gate_header_x = float(header_hint_x)
-                gate_header_y = min(y_center(line["bbox"]) for line in lines)
+                gate_header_y = geometry.y_centers.min()
             gate_x_tolerance = max(page_width * 0.22, 90)
-            for line in lines:
-                yc = y_center(line["bbox"])
-                if yc <= gate_header_y:
-                    continue
-                xc = x_center(line["bbox"])
-                if abs(xc - gate_header_x) > gate_x_tolerance:
-                    continue
-                column_amount_hits += len(self._amounts_from_line(line["text"].lower()))
+            column = lines.spatial.column(gate_header_x, gate_x_tolerance, gate_header_y)
+            column_amount_hits = sum(len(line.amounts) for line in column)
 
         mode = self._summary_template_mode()
         if mode == "strict":
@@ -863,29 +2648,29 @@ class OCRService:
 
         # Strategy A2 only: when "Total" label is separated from numeric lines,
         # read neighboring lines after the label and pick pengeluaran order.
-        ordered = sorted(lines, key=lambda l: y_center(l["bbox"]))
+        index = lines.spatial
+        ordered = index.ordered
+        rows = lines.rows
         total_label_candidates: List[Tuple[int, float, List[float], float]] = []
         for idx, line in enumerate(ordered):
-            line_text = line["text"].lower()
+            line_text = line.text_lower
             if "total" not in line_text:
                 continue
 
-            base_y = y_center(line["bbox"])
+            base_y = index.y_centers[idx]
             collected_amounts: List[int] = []
             chosen_bbox = line["bbox"]
 
-            # Only scan the NEXT 3 lines after Total label (more precise)
-            for next_idx in range(idx + 1, min(idx + 4, len(ordered))):
+            # Amount cells detected on the Total label's own row are read left to right,
+            # i.e. in pemasukan / pengeluaran / saldo order. Otherwise only scan the NEXT 3
+            # lines after the label, and stop at lines too far below (other table sections) -
+            # the Total row is compact.
+            same_row = [pos for pos in rows.right_of(idx) if ordered[pos].amounts]
+            below = index.span(base_y, base_y + 120)
+            for next_idx in same_row or range(idx + 1, min(idx + 4, below.stop)):
                 next_line = ordered[next_idx]
-                next_y = y_center(next_line["bbox"])
-                
-                # Skip lines above (header) or too far below (other table sections)
-                if next_y + 5 < base_y:
-                    continue
-                if next_y - base_y > 120:  # Reduced from 260px - Total row is compact
-                    break
 
-                next_amounts = self._amounts_from_line(next_line["text"].lower())
+                next_amounts = next_line.amounts
                 if next_amounts:
                     collected_amounts.extend(next_amounts)
                     chosen_bbox = next_line["bbox"]
@@ -914,8 +2699,71 @@ class OCRService:
         best_amount, best_conf, best_bbox, _ = total_label_candidates[0]
         return best_amount, best_conf, best_bbox
 
+    def _scan_bottom_up(
+        self, image: Image.Image, conf_threshold: float, handwritten: bool = False
+    ) -> Tuple[List[Line], Optional[Dict[str, Any]]]:
+        """Recognize the page bottom-up, stopping once a cheap anchor strategy is confident enough.
+
+        Only pages laid out as a single receipt may stop early: when the detected boxes show a
+        gutter another receipt could sit behind, the whole page is read for segmentation.
+        """
+        threshold = self._early_exit_confidence()
+        lines: List[Line] = []
+        single: Optional[bool] = None
+        for lines, page_boxes in self.processor.iter_bands(image, handwritten, conf_threshold, self._early_exit_bands()):
+            if single is None:
+                single = not ReceiptSegmenter.has_gutter(page_boxes)
+            if not single:
+                continue
+            found = [
+                total
+                for total in (self._extract_total_bayar(lines), self._extract_explicit_jumlah_tagihan(lines))
+                if total is not None
+            ]
+            if not found:
+                continue
+            total = max(found, key=lambda item: item["confidence"])
+            if total["confidence"] >= threshold:
+                return lines, total
+        return lines, None
+
     def _process_page(self, image: Image.Image) -> Dict[str, Any]:
-        lines = self.processor.run(image, handwritten=False, conf_threshold=0.6)
+        if not self._quality_triage_enabled():
+            return self._read_page(image, handwritten=False)
+        quality = self.quality.analyze(image)
+        result = self._read_page(image, handwritten=quality.profile == "handwritten")
+        result["triage"] = quality._asdict()
+        return result
+
+    def _read_page(self, image: Image.Image, handwritten: bool) -> Dict[str, Any]:
+        # A page read with the handwritten profile up front needs no per-group re-read.
+        conf_threshold = 0.5 if handwritten else 0.6
+        if self._early_exit_enabled():
+            lines, early_total = self._scan_bottom_up(image, conf_threshold, handwritten)
+            if early_total is not None:
+                return {
+                    "page_total": early_total["total"],
+                    "receipt_count": 1,
+                    "receipts": [
+                        {
+                            "total": early_total["total"],
+                            "confidence": early_total["confidence"],
+                        }
+                    ],
+                    "categories": ["resi_tagihan"],
+                    "avg_confidence": self._avg_conf(lines),
+                    "raw_text": [l["text"] for l in lines],
+                    "early_exit": True,
+                }
+        else:
+            lines = self.processor.run(image, handwritten=handwritten, conf_threshold=conf_threshold)
+        self.strategies.reset()
+        lines = LineSet.of(lines)
+        page_image = image
+        rotated = bool(self.processor.last_rotation)
+        if rotated:
+            # Line boxes are reported upright; keep group crops in the same frame.
+            image = image.rotate(self.processor.last_rotation)
         page_category = self.classifier.classify(lines)
 
         groups = self.segmenter.segment(lines, image.height, image.width)
@@ -930,12 +2778,12 @@ class OCRService:
 
         totals = []
         group_categories = []
-        for group in groups[:2]:
+        for group in groups:
             group_category = self.classifier.classify(group)
             group_categories.append(group_category)
 
             group_lines = group
-            if group_category == "handwritten":
+            if group_category == "handwritten" and not handwritten:
                 cropped = self._crop_group_region(image, group)
                 if cropped:
                     crop_image, offset_x, offset_y = cropped
@@ -952,22 +2800,18 @@ class OCRService:
             if secondary:
                 totals.append(secondary)
 
-        total_bayar = self._extract_total_bayar(lines)
-        if total_bayar is not None:
-            totals = [total_bayar]
+        # A whole-page billing anchor means one bill read as several blocks; a sheet of
+        # several bills keeps its per-receipt totals.
+        billing_total = None if self._separate_bills(groups) else self.strategies.run(PAGE_SCOPE, lines, image.height)
+        if billing_total is not None:
+            totals = [billing_total]
             group_categories = ["resi_tagihan"]
-        else:
-            explicit_total = self._extract_explicit_jumlah_tagihan(lines)
-            if explicit_total is not None:
-                totals = [explicit_total]
-                group_categories = ["resi_tagihan"]
-            else:
-                anchored_total = self._extract_tagihan_anchor_total(lines)
-                if anchored_total is not None:
-                    totals = [anchored_total]
-                    group_categories = ["resi_tagihan"]
 
         page_total = sum(t["total"] for t in totals) if totals else 0
+        # Only single-receipt pages teach a layout, so the category is the receipt's own.
+        single = len(groups) == 1 or billing_total is not None
+        if len(totals) == 1 and single and not handwritten and not rotated:
+            self.templates.learn(page_image, lines, totals[0], group_categories[0])
 
         return {
             "page_total": page_total,
@@ -984,28 +2828,40 @@ class OCRService:
             "raw_text": [l["text"] for l in lines],
         }
 
-    def _extract_explicit_jumlah_tagihan(self, lines: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
-        ordered = sorted(lines, key=lambda l: y_center(l["bbox"]))
+    @staticmethod
+    def _separate_bills(groups: List[List[Line]]) -> bool:
+        """Whether XY-cut receipt groups are separate bills: two or more carry a billing total anchor.
+
+        With fewer, the page is one bill laid out in blocks and its page-level anchor decides.
+        """
+        if len(groups) < SEGMENT_MIN_CLUSTERS:
+            return False
+        anchored = sum(1 for group in groups if LineSet.of(group).tokens.has_any(PAGE_BILLING_ANCHORS, normalized=True))
+        return anchored >= 2
+
+    def _extract_explicit_jumlah_tagihan(self, lines: List[Line]) -> Optional[Dict[str, Any]]:
+        lines = LineSet.of(lines)
+        ordered = lines.spatial.ordered
         candidates: List[Tuple[float, int, List[float]]] = []
 
-        for idx, line in enumerate(ordered):
-            anchor_text = line["text"].lower()
+        for idx in lines.tokens.positions(["total bayar", "total pembayaran", "jumlah tagihan"]):
+            line = ordered[idx]
+            anchor_hits = line.hits
             anchor_bonus = 0.0
-            if "total bayar" in anchor_text or "total pembayaran" in anchor_text:
+            if "total bayar" in anchor_hits or "total pembayaran" in anchor_hits:
                 anchor_bonus = 0.2
-            elif "jumlah tagihan" in anchor_text:
+            elif "jumlah tagihan" in anchor_hits:
                 anchor_bonus = 0.08
             else:
                 continue
 
             for next_idx in range(idx, min(idx + 4, len(ordered))):
                 next_line = ordered[next_idx]
-                next_text = next_line["text"].lower()
-                if any(token in next_text for token in BLOCKED_BILLING_TOKENS):
+                if next_line.hits.has("blocked_billing"):
                     continue
                 confidence = min(float(next_line.get("confidence", 0.0)), 1.0)
                 distance_penalty = (next_idx - idx) * 0.03
-                for amount in self._amounts_from_line(next_text):
+                for amount in next_line.amounts:
                     if amount < MIN_AMOUNT or amount > MAX_VALID_AMOUNT:
                         continue
                     score = 0.86 + confidence * 0.08 + anchor_bonus - distance_penalty
@@ -1021,7 +2877,7 @@ class OCRService:
     @staticmethod
     def _crop_group_region(
         image: Image.Image,
-        group: List[Dict[str, Any]],
+        group: List[Line],
         padding: int = 20,
     ) -> Optional[Tuple[Image.Image, int, int]]:
         if not group:
@@ -1048,100 +2904,46 @@ class OCRService:
         return image.crop((min_x, min_y, max_x, max_y)), min_x, min_y
 
     @staticmethod
-    def _offset_group_lines(lines: List[Dict[str, Any]], offset_x: int, offset_y: int) -> List[Dict[str, Any]]:
-        adjusted: List[Dict[str, Any]] = []
-        for line in lines:
-            new_line = dict(line)
-
-            bbox = list(line.get("bbox", []))
-            for i in range(0, len(bbox), 2):
-                bbox[i] += offset_x
-            for i in range(1, len(bbox), 2):
-                bbox[i] += offset_y
-            new_line["bbox"] = bbox
-
-            box_points = line.get("box_points")
-            if isinstance(box_points, list):
-                new_line["box_points"] = [[pt[0] + offset_x, pt[1] + offset_y] for pt in box_points]
-
-            adjusted.append(new_line)
+    def _offset_group_lines(lines: List[Line], offset_x: int, offset_y: int) -> List[Line]:
+        return LineSet(line.shifted(offset_x, offset_y) for line in lines)
 
-        return adjusted
-
-    def _extract_total_for_group(self, group: List[Dict[str, Any]], page_height: int) -> Optional[Dict[str, Any]]:
+    def _extract_total_for_group(self, group: List[Line], page_height: int) -> Optional[Dict[str, Any]]:
         category = self.classifier.classify(group)
-        if category == "handwritten":
-            result = self._max_currency_with_bbox(group)
-            if result is None:
-                return None
-            amounts, bbox = result
-            if amounts < MIN_HANDWRITTEN_AMOUNT:
-                return None
-            return {"total": amounts, "confidence": 0.6, "bbox": bbox}
+        return self.strategies.run(category, group, page_height)
 
-        if category == "retail_printed":
-            return self._extract_retail_v3_ranked(group, page_height)
+    def _extract_max_currency_total(
+        self,
+        lines: List[Line],
+        confidence: float,
+        min_amount: int = 0,
+    ) -> Optional[Dict[str, Any]]:
+        result = self._max_currency_with_bbox(lines)
+        if result is None:
+            return None
+        amount, bbox = result
+        if amount < min_amount:
+            return None
+        return {"total": amount, "confidence": confidence, "bbox": bbox}
 
-        if category == "digital_payment":
-            result = self._max_currency_with_bbox(group)
-            if result is None:
-                return None
-            amounts, bbox = result
-            return {"total": amounts, "confidence": 0.7, "bbox": bbox}
-
-        if category == "institutional_kuitansi":
-            for line in group:
-                if "sebesar" in line["text"].lower():
-                    amounts = self._amounts_from_line(line["text"])
-                    if amounts:
-                        return {"total": max(amounts), "confidence": 0.7, "bbox": line["bbox"]}
-
-        if category == "simple_proof":
-            result = self._max_currency_with_bbox(group)
-            if result is None:
-                return None
-            amounts, bbox = result
-            return {"total": amounts, "confidence": 0.6, "bbox": bbox}
-
-        if category == "resi_tagihan":
-            total_bayar = self._extract_total_bayar(group)
-            if total_bayar is not None:
-                return total_bayar
-            explicit_total = self._extract_explicit_jumlah_tagihan(group)
-            if explicit_total is not None:
-                return explicit_total
-            anchored_total = self._extract_tagihan_anchor_total(group)
-            if anchored_total is not None:
-                return anchored_total
-            return self._extract_unknown_billing_total(group)
-
-        if category == "unknown":
-            billing_total = self._extract_unknown_billing_total(group)
-            if billing_total is not None:
-                return billing_total
-
-        return self.extractor.extract(group, page_height)
-
-    def _extract_unknown_billing_total(self, lines: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
-        ordered = sorted(lines, key=lambda l: y_center(l["bbox"]))
-        total_bayar = self._extract_total_bayar(ordered)
-        if total_bayar is not None:
-            return total_bayar
-        explicit_total = self._extract_explicit_jumlah_tagihan(ordered)
-        if explicit_total is not None:
-            return explicit_total
-        anchored_total = self._extract_tagihan_anchor_total(ordered)
-        if anchored_total is not None:
-            return anchored_total
-
-        strong_anchor_keywords = ["jumlah tagihan", "total tagihan", "total bayar", "total pembayaran", "grand total", "total"]
-        weak_anchor_keywords = ["tagihan"]
+    @staticmethod
+    def _extract_sebesar_total(lines: List[Line]) -> Optional[Dict[str, Any]]:
+        for line in lines:
+            if "sebesar" in line.text_lower:
+                amounts = line.amounts
+                if amounts:
+                    return {"total": max(amounts), "confidence": 0.7, "bbox": line["bbox"]}
+        return None
 
+    def _extract_unknown_billing_total(self, lines: List[Line]) -> Optional[Dict[str, Any]]:
+        lines = LineSet.of(lines)
+        ordered = lines.spatial.ordered
         candidates: List[Tuple[int, float, List[float]]] = []
-        for idx, line in enumerate(ordered):
-            anchor_text = line["text"].lower()
-            is_strong_anchor = any(k in anchor_text for k in strong_anchor_keywords)
-            is_weak_anchor = any(k in anchor_text for k in weak_anchor_keywords)
+        anchors = KEYWORDS.groups["strong_billing"] | KEYWORDS.groups["weak_billing"]
+        for idx in lines.tokens.positions(anchors):
+            line = ordered[idx]
+            anchor_hits = line.hits
+            is_strong_anchor = anchor_hits.has("strong_billing")
+            is_weak_anchor = anchor_hits.has("weak_billing")
             if not (is_strong_anchor or is_weak_anchor):
                 continue
 
@@ -1149,12 +2951,11 @@ class OCRService:
             local_amounts: List[Tuple[int, List[float], float]] = []
             for next_idx in range(idx, min(idx + 4, len(ordered))):
                 next_line = ordered[next_idx]
-                next_text = next_line["text"].lower()
-                if any(token in next_text for token in BLOCKED_BILLING_TOKENS):
+                if next_line.hits.has("blocked_billing"):
                     continue
 
                 next_conf = min(float(next_line.get("confidence", 0.0)), 1.0)
-                for amount in self._amounts_from_line(next_text):
+                for amount in next_line.amounts:
                     if amount < MIN_AMOUNT or amount > MAX_VALID_AMOUNT:
                         continue
                     local_amounts.append((amount, next_line["bbox"], next_conf))
@@ -1180,31 +2981,31 @@ class OCRService:
             return None
         return {"total": amount, "confidence": round(min(score, 1.0), 4), "bbox": bbox}
 
-    def _extract_tagihan_anchor_total(self, lines: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
-        ordered = sorted(lines, key=lambda l: y_center(l["bbox"]))
+    def _extract_tagihan_anchor_total(self, lines: List[Line]) -> Optional[Dict[str, Any]]:
+        lines = LineSet.of(lines)
+        ordered = lines.spatial.ordered
         candidates: List[Tuple[float, int, List[float]]] = []
 
-        for idx, line in enumerate(ordered):
-            anchor_text = line["text"].lower()
-            if "tagihan" not in anchor_text:
-                continue
+        for idx in lines.tokens.positions(["tagihan"]):
+            line = ordered[idx]
+            anchor_hits = line.hits
 
             anchor_conf = min(float(line.get("confidence", 0.0)), 1.0)
             for near_idx in range(idx, min(idx + 4, len(ordered))):
                 near_line = ordered[near_idx]
-                near_text = near_line["text"].lower()
-                if any(token in near_text for token in BLOCKED_BILLING_TOKENS):
+                near_hits = near_line.hits
+                if near_hits.has("blocked_billing"):
                     continue
 
                 near_conf = min(float(near_line.get("confidence", 0.0)), 1.0)
                 distance_penalty = (near_idx - idx) * 0.05
                 keyword_bonus = 0.0
-                if "jumlah tagihan" in anchor_text or "jumlah tagihan" in near_text:
+                if "jumlah tagihan" in anchor_hits or "jumlah tagihan" in near_hits:
                     keyword_bonus += 0.16
-                if "total bayar" in near_text or "total pembayaran" in near_text:
+                if "total bayar" in near_hits or "total pembayaran" in near_hits:
                     keyword_bonus += 0.08
 
-                for amount in self._amounts_from_line(near_text):
+                for amount in near_line.amounts:
                     if amount < MIN_AMOUNT or amount > MAX_VALID_AMOUNT:
                         continue
                     score = 0.76 + ((anchor_conf + near_conf) / 2.0) * 0.18 + keyword_bonus - distance_penalty
@@ -1219,41 +3020,46 @@ class OCRService:
             return None
         return {"total": best_amount, "confidence": round(min(best_score, 1.0), 4), "bbox": best_bbox}
 
-    def _extract_total_bayar(self, lines: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
-        ordered = sorted(lines, key=lambda l: y_center(l["bbox"]))
+    def _extract_total_bayar(self, lines: List[Line]) -> Optional[Dict[str, Any]]:
+        lines = LineSet.of(lines)
+        ordered = lines.spatial.ordered
         candidates: List[Tuple[float, int, List[float]]] = []
 
-        for idx, line in enumerate(ordered):
-            anchor_text = line["text"].lower().replace("0", "o")
-            has_total_bayar = (
-                "total bayar" in anchor_text
-                or "total pembayaran" in anchor_text
-                or "jumlah pembayaran" in anchor_text
-            )
-            has_jumlah_tagihan = "jumlah tagihan" in anchor_text
-            has_total_tagihan = "total tagihan" in anchor_text
-
-            if not has_total_bayar and "total" in anchor_text and idx + 1 < len(ordered):
-                next_text = ordered[idx + 1]["text"].lower().replace("0", "o")
-                if "bayar" in next_text or "pembayaran" in next_text:
+        rows = lines.rows
+        anchors = KEYWORDS.groups["total_bayar"] | {"jumlah tagihan", "total tagihan", "total"}
+        for idx in lines.tokens.positions(anchors, normalized=True):
+            line = ordered[idx]
+            anchor_hits = line.hits_norm
+            has_total_bayar = anchor_hits.has("total_bayar")
+            has_jumlah_tagihan = "jumlah tagihan" in anchor_hits
+            has_total_tagihan = "total tagihan" in anchor_hits
+
+            if not has_total_bayar and "total" in anchor_hits and idx + 1 < len(ordered):
+                next_hits = ordered[idx + 1].hits_norm
+                if "bayar" in next_hits or "pembayaran" in next_hits:
                     has_total_bayar = True
 
             if not (has_total_bayar or has_jumlah_tagihan or has_total_tagihan):
                 continue
 
             anchor_conf = min(float(line.get("confidence", 0.0)), 1.0)
-            for near_idx in range(max(0, idx - 1), min(idx + 8, len(ordered))):
+            # A label box without its own amount is paired with the amount boxes on its row;
+            # the neighbour scan is the fallback for amounts printed below the label.
+            same_row: List[Tuple[int, int]] = []
+            if not line.amounts:
+                same_row = [(pos, idx) for pos in rows.right_of(idx) if ordered[pos].amounts]
+            neighbors = same_row or [(near_idx, near_idx) for near_idx in range(max(0, idx - 1), min(idx + 8, len(ordered)))]
+            for near_idx, distance_idx in neighbors:
                 near_line = ordered[near_idx]
-                near_text_norm = near_line["text"].lower().replace("0", "o")
-                near_text = near_line["text"].lower()
-                if "total admin" in near_text_norm:
+                near_hits = near_line.hits_norm
+                if "total admin" in near_hits:
                     continue
-                if any(token in near_text_norm for token in ["npwp", "resi", "telepon", "pelanggan", "tanggal", "jam"]):
+                if near_hits.has("total_bayar_blocked"):
                     continue
 
                 near_conf = min(float(near_line.get("confidence", 0.0)), 1.0)
-                distance_penalty = (near_idx - idx) * 0.03
-                for amount in self._amounts_from_line(near_text):
+                distance_penalty = (distance_idx - idx) * 0.03
+                for amount in near_line.amounts:
                     if amount < 10_000 or amount > MAX_VALID_AMOUNT:
                         continue
                     keyword_bonus = 0.18 if has_total_bayar else 0.12
@@ -1263,31 +3069,29 @@ class OCRService:
 
         tagihan_values: List[Tuple[int, List[float], float]] = []
         admin_values: List[Tuple[int, List[float], float]] = []
-        for idx, line in enumerate(ordered):
-            text_norm = line["text"].lower().replace("0", "o")
-            text = line["text"].lower()
+        for idx in lines.tokens.positions(["jumlah tagihan", "total tagihan", "total admin"], normalized=True):
+            line = ordered[idx]
+            hits = line.hits_norm
             confidence = min(float(line.get("confidence", 0.0)), 1.0)
 
-            if "jumlah tagihan" in text_norm or "total tagihan" in text_norm:
+            if "jumlah tagihan" in hits or "total tagihan" in hits:
                 local_amounts: List[Tuple[int, List[float], float]] = []
                 for near_idx in range(idx, min(idx + 5, len(ordered))):
                     near_line = ordered[near_idx]
-                    near_text = near_line["text"].lower()
                     near_conf = min(float(near_line.get("confidence", 0.0)), 1.0)
-                    for amount in self._amounts_from_line(near_text):
+                    for amount in near_line.amounts:
                         if MIN_AMOUNT <= amount <= MAX_VALID_AMOUNT:
                             local_amounts.append((amount, near_line["bbox"], near_conf))
                 if local_amounts:
                     best_amount, best_bbox, best_conf = sorted(local_amounts, key=lambda x: x[0], reverse=True)[0]
                     tagihan_values.append((best_amount, best_bbox, max(confidence, best_conf)))
 
-            if "total admin" in text_norm:
+            if "total admin" in hits:
                 local_admin: List[Tuple[int, List[float], float]] = []
                 for near_idx in range(idx, min(idx + 4, len(ordered))):
                     near_line = ordered[near_idx]
-                    near_text = near_line["text"].lower()
                     near_conf = min(float(near_line.get("confidence", 0.0)), 1.0)
-                    for amount in self._amounts_from_line(near_text):
+                    for amount in near_line.amounts:
                         if MIN_AMOUNT <= amount <= MAX_VALID_AMOUNT:
                             local_admin.append((amount, near_line["bbox"], near_conf))
                 if local_admin:
@@ -1311,25 +3115,23 @@ class OCRService:
             return None
         return {"total": best_amount, "confidence": round(min(best_score, 1.0), 4), "bbox": best_bbox}
 
-    def _extract_retail_v3_ranked(self, lines: List[Dict[str, Any]], page_height: int) -> Optional[Dict[str, Any]]:
+    def _extract_retail_v3_ranked(self, lines: List[Line], page_height: int) -> Optional[Dict[str, Any]]:
         candidates: List[Tuple[int, float, List[float]]] = []
         keyword_candidates: List[Tuple[int, float, List[float]]] = []
         keyword_anchors: List[Tuple[float, List[float], float]] = []
         amount_lines: List[Tuple[int, float, List[float], float]] = []
 
         for line in lines:
-            text = line["text"].lower()
-            normalized = text.replace("0", "o")
             confidence = float(line.get("confidence", 0.0))
-            yc = y_center(line["bbox"])
+            yc = line.y_center
             is_bottom = yc > page_height * 0.6
-            has_keyword = any(keyword in normalized for keyword in RETAIL_RANK_KEYWORDS)
-            has_negative_context = any(token in text for token in V3_NEGATIVE_CONTEXT)
+            has_keyword = line.hits_norm.has("retail_rank")
+            has_negative_context = line.hits.has("negative_context")
 
             if has_keyword and not has_negative_context:
                 keyword_anchors.append((yc, line["bbox"], confidence))
 
-            for amount in self._amounts_from_line(text):
+            for amount in line.amounts:
                 score = 0.0
                 if has_keyword:
                     score += 0.4
@@ -1396,22 +3198,21 @@ class OCRService:
 
     def _extract_retail_secondary_total(
         self,
-        lines: List[Dict[str, Any]],
+        lines: List[Line],
         page_height: int,
         primary_amount: int,
     ) -> Optional[Dict[str, Any]]:
         candidates: List[Tuple[int, float, List[float]]] = []
-        ordered_lines = sorted(lines, key=lambda l: y_center(l["bbox"]))
+        lines = LineSet.of(lines)
+        ordered_lines = lines.spatial.ordered
 
         for line in lines:
-            text = line["text"].lower()
-            normalized = text.replace("0", "o")
             confidence = float(line.get("confidence", 0.0))
-            is_bottom = y_center(line["bbox"]) > page_height * 0.55
-            has_keyword = any(keyword in normalized for keyword in RETAIL_RANK_KEYWORDS)
-            has_negative_context = any(token in text for token in V3_NEGATIVE_CONTEXT)
+            is_bottom = line.y_center > page_height * 0.55
+            has_keyword = line.hits_norm.has("retail_rank")
+            has_negative_context = line.hits.has("negative_context")
 
-            for amount in self._amounts_from_line(text):
+            for amount in line.amounts:
                 if amount == primary_amount:
                     continue
                 score = 0.0
@@ -1427,22 +3228,18 @@ class OCRService:
 
         # Fallback: if keyword and amount are split across nearby lines,
         # pull amounts from the next few lines after a TOTAL anchor.
-        for idx, line in enumerate(ordered_lines):
-            text = line["text"].lower()
-            normalized = text.replace("0", "o")
-            if not any(keyword in normalized for keyword in RETAIL_RANK_KEYWORDS):
-                continue
-            if any(token in text for token in V3_NEGATIVE_CONTEXT):
+        for idx in lines.tokens.positions(KEYWORDS.groups["retail_rank"], normalized=True):
+            line = ordered_lines[idx]
+            if line.hits.has("negative_context"):
                 continue
 
             anchor_conf = float(line.get("confidence", 0.0))
             for next_idx in range(idx + 1, min(idx + 6, len(ordered_lines))):
                 next_line = ordered_lines[next_idx]
-                next_text = next_line["text"].lower()
-                if any(token in next_text for token in V3_NEGATIVE_CONTEXT):
+                if next_line.hits.has("negative_context"):
                     continue
                 next_conf = float(next_line.get("confidence", 0.0))
-                for amount in self._amounts_from_line(next_text):
+                for amount in next_line.amounts:
                     if amount == primary_amount:
                         continue
                     distance_penalty = (next_idx - idx) * 0.03
@@ -1461,18 +3258,18 @@ class OCRService:
         return {"total": best_amount, "confidence": round(min(best_score, 1.0), 4), "bbox": best_bbox}
 
     @staticmethod
-    def _avg_conf(lines: List[Dict[str, Any]]) -> float:
+    def _avg_conf(lines: List[Line]) -> float:
         if not lines:
             return 0.0
         return sum(l["confidence"] for l in lines) / len(lines)
 
     @staticmethod
-    def _max_currency_with_bbox(lines: List[Dict[str, Any]]) -> Optional[Tuple[int, List[float]]]:
+    def _max_currency_with_bbox(lines: List[Line]) -> Optional[Tuple[int, List[float]]]:
         """Returns tuple of (max_amount, bbox) or None if no amounts found."""
         max_amount = None
         max_bbox = None
         for line in lines:
-            line_amounts = OCRService._amounts_from_line(line["text"])
+            line_amounts = line.amounts
             if line_amounts:
                 line_max = max(line_amounts)
                 if max_amount is None or line_max > max_amount:
@@ -1482,30 +3279,7 @@ class OCRService:
 
     @staticmethod
     def _amounts_from_line(text: str) -> List[int]:
-        values: List[int] = []
-        seen: set[int] = set()
-
-        for match in AMOUNT_RE.finditer(text):
-            value = parse_amount(match.group(1))
-            if value is None:
-                continue
-            if value < MIN_AMOUNT or value > MAX_VALID_AMOUNT:
-                continue
-            if value not in seen:
-                values.append(value)
-                seen.add(value)
-
-        # Fallback for OCR-noisy numeric runs that primary regex may miss.
-        for raw_token in NOISY_AMOUNT_RE.findall(text):
-            value = parse_amount(raw_token)
-            if value is None:
-                continue
-            if value < MIN_AMOUNT or value > MAX_VALID_AMOUNT:
-                continue
-            if value not in seen:
-                values.append(value)
-                seen.add(value)
-        return values
+        return amounts_from_line(text)
 
     @staticmethod
     def _load_pages(input_path: str) -> List[Image.Image]:
@@ -1514,17 +3288,24 @@ class OCRService:
             if convert_from_path is None:
                 return []
             return convert_from_path(input_path, dpi=300)
-        return [Image.open(input_path)]
+        # Phone photos record their orientation in EXIF; turn them upright once so OCR,
+        # segmentation and every crop taken later share the same frame.
+        return [ImageOps.exif_transpose(Image.open(input_path))]
 
 
 def main() -> None:
     parser = argparse.ArgumentParser()
     parser.add_argument("--input", required=True, help="Path to input image or PDF")
     parser.add_argument("--json", action="store_true", help="Output JSON only")
+    parser.add_argument("--stats", action="store_true", help="Print per-strategy counters and time to stderr")
     args = parser.parse_args()
 
     service = OCRService()
     result = service.process(args.input)
+    service.strategies.save()
+    service.templates.save()
+    if args.stats:
+        print(json.dumps(service.strategies.report()), file=sys.stderr)
 
     if args.json:
         print(json.dumps(result, ensure_ascii=True))
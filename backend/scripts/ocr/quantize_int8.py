@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""Post-training INT8 quantization of the ONNX det/rec models, calibrated on our receipts."""
+import argparse
+import os
+import sys
+from typing import Dict, Iterator, List, Optional
+
+import numpy as np
+
+try:
+    from onnxruntime.quantization import (
+        CalibrationDataReader,
+        CalibrationMethod,
+        QuantFormat,
+        QuantType,
+        quantize_static,
+    )
+except Exception as exc:
+    print(f"Missing onnxruntime quantization dependency: {exc}", file=sys.stderr)
+    raise
+
+from ocr_boxes import rotate_crop
+from onnx_backend import DET_LIMIT_SIDE_LEN, REC_IMAGE_SHAPE, OnnxOCR, default_model_dir
+from paddle_ocr_v3 import OCRProcessor, OCRService
+
+RECEIPT_EXTENSIONS = {".pdf", ".png", ".jpg", ".jpeg", ".webp", ".bmp", ".tif", ".tiff"}
+
+
+class TensorListReader(CalibrationDataReader):
+    """Feed pre-built input tensors to onnxruntime's calibrator one at a time."""
+
+    def __init__(self, input_name: str, tensors: List[np.ndarray]) -> None:
+        self.input_name = input_name
+        self.tensors = tensors
+        self._iter: Optional[Iterator[np.ndarray]] = None
+
+    def get_next(self) -> Optional[Dict[str, np.ndarray]]:
+        if self._iter is None:
+            self._iter = iter(self.tensors)
+        tensor = next(self._iter, None)
+        return None if tensor is None else {self.input_name: tensor}
+
+    def rewind(self) -> None:
+        self._iter = None
+
+
+def collect_inputs(paths: List[str]) -> List[str]:
+    files: List[str] = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _dirs, names in os.walk(path):
+                for name in sorted(names):
+                    if os.path.splitext(name)[1].lower() in RECEIPT_EXTENSIONS:
+                        files.append(os.path.join(root, name))
+        elif os.path.isfile(path):
+            files.append(path)
+    return files
+
+
+def build_calibration_tensors(
+    engine: OnnxOCR,
+    files: List[str],
+    max_pages: int,
+    max_crops: int,
+) -> Dict[str, List[np.ndarray]]:
+    # Pages go through the same preprocessing as inference so activation ranges match production.
+    # Samples are padded to one shape per stage because histogram calibrators stack them.
+    processor = OCRProcessor(backend="onnx")
+    det_tensors: List[np.ndarray] = []
+    rec_tensors: List[np.ndarray] = []
+    img_w = REC_IMAGE_SHAPE[2]
+
+    for path in files:
+        for page in OCRService._load_pages(path):
+            if len(det_tensors) >= max_pages:
+                break
+            np_img = np.array(processor.preprocess(page, handwritten=False))
+            tensor, _ratios = engine._det_preprocess(np_img)
+            padded = np.zeros((1, 3, DET_LIMIT_SIDE_LEN, DET_LIMIT_SIDE_LEN), dtype=np.float32)
+            padded[:, :, : tensor.shape[2], : tensor.shape[3]] = tensor[:, :, :DET_LIMIT_SIDE_LEN, :DET_LIMIT_SIDE_LEN]
+            det_tensors.append(padded)
+
+            for box in engine.detect(np_img):
+                if len(rec_tensors) >= max_crops:
+                    break
+                crop = rotate_crop(np_img, box)
+                rec_tensors.append(engine._resize_norm(crop, REC_IMAGE_SHAPE, img_w)[np.newaxis, ...])
+
+    return {"det": det_tensors, "rec": rec_tensors}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--input", nargs="+", required=True, help="Receipt files or directories used for calibration")
+    parser.add_argument("--model-dir", default=default_model_dir(), help="Directory holding det.onnx / rec.onnx")
+    parser.add_argument("--max-pages", type=int, default=60, help="Pages used to calibrate detection")
+    parser.add_argument("--max-crops", type=int, default=600, help="Text crops used to calibrate recognition")
+    parser.add_argument(
+        "--method",
+        choices=["minmax", "entropy", "percentile"],
+        default="percentile",
+        help="Activation range calibration method",
+    )
+    args = parser.parse_args()
+
+    files = collect_inputs(args.input)
+    if not files:
+        print("No calibration receipts found", file=sys.stderr)
+        sys.exit(1)
+
+    engine = OnnxOCR(
+        det_model_path=os.path.join(args.model_dir, "det.onnx"),
+        rec_model_path=os.path.join(args.model_dir, "rec.onnx"),
+        rec_char_dict_path=os.getenv("OCR_ONNX_REC_DICT") or os.path.join(args.model_dir, "rec_dict.txt"),
+    )
+    tensors = build_calibration_tensors(engine, files, args.max_pages, args.max_crops)
+    method = {
+        "minmax": CalibrationMethod.MinMax,
+        "entropy": CalibrationMethod.Entropy,
+        "percentile": CalibrationMethod.Percentile,
+    }[args.method]
+
+    sessions = {"det": engine.det_session, "rec": engine.rec_session}
+    for stage, stage_tensors in tensors.items():
+        if not stage_tensors:
+            print(f"No calibration samples for {stage}; skipping", file=sys.stderr)
+            continue
+        src = os.path.join(args.model_dir, f"{stage}.onnx")
+        dst = os.path.join(args.model_dir, f"{stage}_int8.onnx")
+        reader = TensorListReader(sessions[stage].get_inputs()[0].name, stage_tensors)
+        quantize_static(
+            src,
+            dst,
+            reader,
+            quant_format=QuantFormat.QDQ,
+            per_channel=True,
+            activation_type=QuantType.QUInt8,
+            weight_type=QuantType.QInt8,
+            calibrate_method=method,
+        )
+        print(f"{stage}: {len(stage_tensors)} calibration samples -> {dst}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,259 @@
+"""String-level receipt heuristics shared by the OCR engine: amount tokenizing/parsing, edit distance
+and EMVCo (QRIS) payload parsing.
+
+The module is plain typed Python with no third-party imports so that it can be compiled
+ahead of time with mypyc (``python3 build_heuristics.py``). When the compiled extension
+sits next to this file Python imports it instead; otherwise this source is used as is.
+"""
+import re
+from typing import Dict, Final, List, NamedTuple, Optional
+
+MAX_AMOUNT: Final = 100_000_000
+MIN_AMOUNT: Final = 1_000
+MAX_VALID_AMOUNT: Final = 100_000_000
+
+# A run of digits, separators and whitespace starting at a digit: the only text an amount
+# token can come from. ``scan_amounts`` tokenizes inside each run.
+AMOUNT_SEGMENT_RE: Final = re.compile(r"\d[\d.,\s]*")
+DIGIT_RUN_RE: Final = re.compile(r"\d+")
+AMOUNT_CHARS: Final = frozenset("0123456789.,")
+NOISY_AMOUNT_MIN_LENGTH: Final = 5
+
+# EMVCo merchant-presented QR tags: transaction amount, tip/fee indicator, fixed fee,
+# percentage fee and the CRC that closes the payload.
+EMV_AMOUNT_TAG: Final = "54"
+EMV_FEE_INDICATOR_TAG: Final = "55"
+EMV_FIXED_FEE_TAG: Final = "56"
+EMV_PERCENT_FEE_TAG: Final = "57"
+EMV_CRC_TAG: Final = "63"
+EMV_AMOUNT_RE: Final = re.compile(r"\d{1,13}(?:\.\d{1,2})?")
+
+COMPILED: Final = not __file__.endswith(".py")
+
+
+class AmountToken(NamedTuple):
+    start: int
+    end: int
+    value: Optional[int]
+    noisy: bool
+
+
+def parse_amount(raw: str) -> Optional[int]:
+    return _parse_amount_chars("".join(ch for ch in raw if ch in AMOUNT_CHARS))
+
+
+def _parse_amount_token(raw: str) -> Optional[int]:
+    # Tokens hold only digits, separators and whitespace; skip the character filter when
+    # dropping whitespace already leaves ASCII.
+    compact = "".join(raw.split())
+    return _parse_amount_chars(compact) if compact.isascii() else parse_amount(compact)
+
+
+def _parse_amount_chars(text: str) -> Optional[int]:
+    """Parse a string of ASCII digits and ``.``/``,`` with the Indonesian separator rules."""
+    if not text:
+        return None
+
+    # OCR can split thousand groups oddly, e.g. 168.00,00 instead of 168.000,00.
+    # Normalize this specific malformed pattern before generic parsing.
+    if (
+        7 <= len(text) <= 9
+        and text.endswith("00")
+        and text[-3] in ".,"
+        and text[-6] in ".,"
+        and text[-5:-3].isdigit()
+        and text[:-6].isdigit()
+    ):
+        text = f"{text[:-6]}{text[-5:-3]}0,00"
+
+    decimal_tail = text[-2:] if len(text) >= 3 and text[-3] in ".," and text[-2:].isdigit() else None
+
+    has_comma = "," in text
+    has_dot = "." in text
+    if has_comma and has_dot:
+        if text.rfind(",") > text.rfind("."):
+            text = text.replace(".", "").replace(",", ".")
+        else:
+            text = text.replace(",", "")
+    elif has_dot:
+        parts = text.split(".")
+        if len(parts) > 2 or len(parts[1]) == 3:
+            text = text.replace(".", "")
+    elif has_comma:
+        parts = text.split(",")
+        if len(parts) > 2 or len(parts[1]) > 2:
+            text = text.replace(",", "")
+        else:
+            text = text.replace(",", ".")
+
+    text = text.replace(".", "").replace(",", "")
+    if decimal_tail == "00" and len(text) >= 3 and text.endswith("00"):
+        text = text[:-2]
+
+    if not text:
+        return None
+    value = int(text)
+    if value <= 0 or value > MAX_AMOUNT:
+        return None
+    return value
+
+
+def scan_amounts(text: str) -> List[AmountToken]:
+    """Tokenize every candidate amount in ``text`` in one pass.
+
+    Inside each digit/separator run this yields, in order, the thousand-grouped or plain
+    amounts (``1.234.567``, ``12,50``, ``Rp 25 000``) and, when the run is long enough, one
+    noisy token spanning its first to last digit for OCR-garbled grouping. Tokens are
+    parsed with the same separator rules as ``parse_amount``; ``value`` is None when a token
+    does not parse. Noisy tokens are returned after all regular ones.
+    """
+    tokens: List[AmountToken] = []
+    noisy: List[AmountToken] = []
+    for segment_match in AMOUNT_SEGMENT_RE.finditer(text):
+        segment = segment_match.group(0)
+        offset = segment_match.start()
+        n = len(segment)
+        run = DIGIT_RUN_RE.match(segment)
+        while run is not None:
+            start, end = run.span()
+            # Up to three leading digits may open thousand groups: separator + exactly 3 digits.
+            if end - start <= 3:
+                while end + 4 <= n and (segment[end] in ".," or segment[end].isspace()) and segment[end + 1 : end + 4].isdecimal():
+                    end += 4
+            # Optional two-digit decimal tail.
+            if end + 3 <= n and segment[end] in ".," and segment[end + 1 : end + 3].isdecimal():
+                end += 3
+            tokens.append(AmountToken(offset + start, offset + end, _parse_amount_token(segment[start:end]), False))
+            run = DIGIT_RUN_RE.search(segment, end)
+
+        last = n
+        while last and not segment[last - 1].isdecimal():
+            last -= 1
+        if last >= NOISY_AMOUNT_MIN_LENGTH:
+            noisy.append(AmountToken(offset, offset + last, _parse_amount_token(segment[:last]), True))
+    return tokens + noisy
+
+
+def amounts_from_line(text: str) -> List[int]:
+    """Distinct plausible amounts in ``text``, noisy tokens included as a fallback."""
+    values: List[int] = []
+    seen: set[int] = set()
+
+    # Noisy tokens come last: a fallback for OCR-garbled runs the regular tokens miss.
+    for token in scan_amounts(text):
+        value = token.value
+        if value is None:
+            continue
+        if value < MIN_AMOUNT or value > MAX_VALID_AMOUNT:
+            continue
+        if value not in seen:
+            values.append(value)
+            seen.add(value)
+    return values
+
+
+def amounts_in_text(text: str) -> List[int]:
+    """Plausible amounts of the regular tokens in ``text``, in order and with repeats."""
+    amounts: List[int] = []
+    for token in scan_amounts(text):
+        if token.noisy:
+            continue
+        value = token.value
+        if value is None:
+            continue
+        if value < MIN_AMOUNT or value > MAX_VALID_AMOUNT:
+            continue
+        if len(str(value)) > 12:
+            continue
+        amounts.append(value)
+    return amounts
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """Optimal string alignment distance, giving up once it exceeds ``limit``."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    prev2: List[int] = []
+    prev = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        cur = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            cur[j] = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                cur[j] = min(cur[j], prev2[j - 2] + 1)
+        if min(cur) > limit:
+            return limit + 1
+        prev2, prev = prev, cur
+    return prev[-1]
+
+
+def emv_crc16(data: str) -> str:
+    """CRC-16/CCITT-FALSE of ``data`` as four uppercase hex digits, as EMVCo tag 63 carries it."""
+    crc = 0xFFFF
+    for byte in data.encode("utf-8"):
+        crc ^= byte << 8
+        for _ in range(8):
+            crc = ((crc << 1) ^ 0x1021) if crc & 0x8000 else crc << 1
+            crc &= 0xFFFF
+    return f"{crc:04X}"
+
+
+def parse_emv_payload(payload: str) -> Optional[Dict[str, str]]:
+    """Top-level tag -> value map of an EMVCo QR payload, or None unless it is well formed.
+
+    The payload must start with the format indicator (tag 00 = ``01``), be a clean run of
+    two-digit tag / two-digit length / value fields, and end with a tag 63 CRC matching the
+    bytes before it.
+    """
+    fields: Dict[str, str] = {}
+    pos = 0
+    while pos < len(payload):
+        tag = payload[pos : pos + 2]
+        length = payload[pos + 2 : pos + 4]
+        if len(tag) < 2 or not tag.isdigit() or len(length) < 2 or not length.isdigit():
+            return None
+        end = pos + 4 + int(length)
+        if end > len(payload):
+            return None
+        value = payload[pos + 4 : end]
+        if tag == EMV_CRC_TAG:
+            if end != len(payload) or value.upper() != emv_crc16(payload[: pos + 4]):
+                return None
+            fields[tag] = value
+            return fields if fields.get("00") == "01" else None
+        fields[tag] = value
+        pos = end
+    return None
+
+
+def _emv_amount(raw: str) -> Optional[float]:
+    return float(raw) if EMV_AMOUNT_RE.fullmatch(raw) else None
+
+
+def emv_amount(payload: str) -> Optional[int]:
+    """Amount a valid dynamic QRIS/EMVCo payload charges, fees included, in whole rupiah.
+
+    Static codes carry no amount (tag 54) and give None, as do implausible amounts.
+    """
+    fields = parse_emv_payload(payload)
+    if fields is None or EMV_AMOUNT_TAG not in fields:
+        return None
+    amount = _emv_amount(fields[EMV_AMOUNT_TAG])
+    if amount is None:
+        return None
+
+    indicator = fields.get(EMV_FEE_INDICATOR_TAG)
+    if indicator == "02":
+        fee = _emv_amount(fields.get(EMV_FIXED_FEE_TAG, ""))
+        if fee is not None:
+            amount += fee
+    elif indicator == "03":
+        percent = _emv_amount(fields.get(EMV_PERCENT_FEE_TAG, ""))
+        if percent is not None:
+            amount += amount * percent / 100.0
+
+    value = int(round(amount))
+    if value < MIN_AMOUNT or value > MAX_VALID_AMOUNT:
+        return None
+    return value
@@ -0,0 +1,88 @@
+"""Shared fixtures for the OCR engine tests (``pip install -r requirements-dev.txt``, then
+``python3 -m pytest tests`` from ``backend/scripts/ocr``).
+
+The tests never load PaddleOCR models: ``FakeEngine`` stands in for the engine and answers
+from a fixed page layout, keyed by the detected box each crop was cut from.
+"""
+import os
+import sys
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+import pytest
+from PIL import Image
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import paddle_ocr_v3  # noqa: E402
+
+Rect = Tuple[float, float, float, float]
+LayoutLine = Tuple[str, float, Rect]
+
+
+def box_of(rect: Rect) -> List[List[float]]:
+    x0, y0, x1, y1 = rect
+    return [[x0, y0], [x1, y0], [x1, y1], [x0, y1]]
+
+
+def text_line(text: str, x0: float, y0: float, x1: float = None, y1: float = None, conf: float = 0.95) -> LayoutLine:
+    """A layout line; width and height default to a 20 px wide, 30 px tall glyph box."""
+    if x1 is None:
+        x1 = x0 + 20 * len(text)
+    if y1 is None:
+        y1 = y0 + 30
+    return text, conf, (x0, y0, x1, y1)
+
+
+class FakeCrop:
+    """Crop placeholder remembering the box it was cut from."""
+
+    def __init__(self, box: np.ndarray) -> None:
+        self.key = tuple(np.asarray(box, dtype=np.float32).flatten())
+
+
+class FakeEngine:
+    """Minimal PaddleOCR stand-in that counts which stages ran and on how many boxes."""
+
+    use_angle_cls = True
+
+    def __init__(self, layout: Sequence[LayoutLine]) -> None:
+        self.layout = list(layout)
+        self.by_key = {tuple(np.array(box_of(rect), dtype=np.float32).flatten()): (text, conf) for text, conf, rect in layout}
+        self.calls: Dict[str, int] = {"full": 0, "det": 0, "rec": 0, "rec_boxes": 0, "cls": 0}
+
+    def ocr(self, img, det=True, rec=True, cls=True):
+        if det and rec:
+            self.calls["full"] += 1
+            return [[[box_of(rect), (text, conf)] for text, conf, rect in self.layout]]
+        if det:
+            self.calls["det"] += 1
+            return [[box_of(rect) for _, _, rect in self.layout]]
+        crops = img[0] if isinstance(img, list) and img and isinstance(img[0], list) else img
+        # PaddleOCR runs the recognizer even when only cls is requested.
+        self.calls["rec"] += 1
+        self.calls["rec_boxes"] += len(crops)
+        return [[self.by_key.get(crop.key, ("", 0.0)) for crop in crops]]
+
+    def text_classifier(self, crops):
+        self.calls["cls"] += 1
+        return list(crops), [["0", 0.99] for _ in crops], 0.0
+
+
+@pytest.fixture
+def make_service(monkeypatch):
+    """Build an ``OCRService`` backed by a ``FakeEngine`` over ``layout``.
+
+    Returns ``(service, engine, page)`` where ``page`` is a blank image of ``size``.
+    """
+    monkeypatch.setattr(paddle_ocr_v3, "rotate_crop", lambda image, box: FakeCrop(box))
+    monkeypatch.setenv("OCR_STRATEGY_STATS_PATH", "")
+    monkeypatch.setenv("OCR_TEMPLATE_PATH", "")
+
+    def build(layout: Sequence[LayoutLine], size: Tuple[int, int] = (1200, 1600)):
+        service = paddle_ocr_v3.OCRService()
+        engine = FakeEngine(layout)
+        service.processor._engine = engine
+        return service, engine, Image.new("RGB", size, "white")
+
+    return build
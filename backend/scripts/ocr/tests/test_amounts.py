@@ -0,0 +1,49 @@
+import random
+
+import pytest
+
+from bench_amounts import legacy_amounts_from_line, legacy_parse_amount, random_line
+from receipt_heuristics import amounts_from_line, amounts_in_text, edit_distance, parse_amount
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("total rp 1.234.567", [1234567]),
+        ("jumlah rp 25 000", [25000]),
+        ("tagihan 168.00,00", [168000]),
+        ("rp 12.500,00 admin 2.500", [12500, 2500]),
+        ("no. 12 tgl 05", []),
+        ("telp 022-5551234", [5551234]),
+    ],
+)
+def test_amounts_from_line(text, expected):
+    assert amounts_from_line(text) == expected
+
+
+def test_amounts_in_text_keeps_repeats_and_drops_noisy_tokens():
+    assert amounts_in_text("rp 10.000 + rp 10.000") == [10000, 10000]
+    assert amounts_in_text("1 2 3 4 5 6") == []
+
+
+def test_tokenizer_matches_legacy_regex_chain():
+    rng = random.Random(7)
+    for _ in range(20_000):
+        line = random_line(rng)
+        for raw in (line, line.lower()):
+            assert amounts_from_line(raw) == legacy_amounts_from_line(raw), raw
+            assert parse_amount(raw) == legacy_parse_amount(raw), raw
+
+
+@pytest.mark.parametrize(
+    "a, b, limit, expected",
+    [
+        ("total", "total", 1, 0),
+        ("tota1", "total", 1, 1),
+        ("tagiham", "tagihan", 1, 1),
+        ("jmulah", "jumlah", 1, 1),
+        ("pembayaran", "total", 2, 3),
+    ],
+)
+def test_edit_distance(a, b, limit, expected):
+    assert edit_distance(a, b, limit) == expected
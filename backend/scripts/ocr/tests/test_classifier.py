@@ -0,0 +1,48 @@
+import pytest
+
+from conftest import box_of
+from paddle_ocr_v3 import Line, LineSet, ReceiptClassifier
+
+
+def receipt(*texts):
+    lines = []
+    for row, text in enumerate(texts):
+        points = box_of((100, 100 + row * 50, 100 + 20 * len(text), 130 + row * 50))
+        lines.append(Line(text, 0.95, [coord for point in points for coord in point], points))
+    return lines
+
+
+@pytest.fixture
+def decisions(monkeypatch):
+    """Count the classifier's real decisions, i.e. calls that were not served from a cache."""
+    calls = []
+    decide = ReceiptClassifier._decide
+
+    def counted(features):
+        calls.append(features)
+        return decide(features)
+
+    monkeypatch.setattr(ReceiptClassifier, "_decide", staticmethod(counted))
+    return calls
+
+
+def test_repeated_lines_are_served_from_the_memo(decisions):
+    classifier = ReceiptClassifier()
+    lines = receipt("PDAM TIRTA", "Tagihan Air", "Total Bayar Rp 150.000")
+
+    first = classifier.classify(LineSet(lines))
+    # A new line set over the same lines, as a group split off the page would be.
+    again = classifier.classify(LineSet(reversed(lines)))
+
+    assert first == again == "resi_tagihan"
+    assert len(decisions) == 1
+
+
+def test_different_lines_are_classified_afresh(decisions):
+    classifier = ReceiptClassifier()
+    classifier.classify(receipt("PDAM TIRTA", "Tagihan Air", "Total Bayar Rp 150.000"))
+
+    category = classifier.classify(receipt("Nasi Goreng 25.000", "Es Teh 5.000", "Total 30.000", "Tunai 50.000"))
+
+    assert category != "resi_tagihan"
+    assert len(decisions) == 2
@@ -0,0 +1,67 @@
+import pytest
+
+from conftest import text_line
+
+# One bill filling the page: lines 40 px apart, no gutter anywhere.
+BILL = (
+    [text_line("PEMBAYARAN LISTRIK", 300, 100), text_line("ID Pel 5123 4567 890", 100, 170)]
+    + [text_line(f"Keterangan baris {row}", 100, 240 + row * 70) for row in range(15)]
+    + [
+        text_line("Tagihan", 100, 1300),
+        text_line("Rp 412.800", 800, 1300),
+        text_line("Admin", 100, 1370),
+        text_line("Rp 2.500", 800, 1370),
+        text_line("Total Bayar", 100, 1440),
+        text_line("Rp 415.300", 800, 1440),
+    ]
+)
+
+
+def shifted(lines, dy):
+    return [(text, conf, (x0, y0 + dy, x1, y1 + dy)) for text, conf, (x0, y0, x1, y1) in lines]
+
+
+@pytest.fixture(autouse=True)
+def early_exit(monkeypatch):
+    monkeypatch.setenv("OCR_EARLY_EXIT", "1")
+
+
+def test_single_receipt_stops_after_the_bottom_band(make_service):
+    service, engine, page = make_service(BILL)
+
+    result = service._read_page(page, handwritten=False)
+
+    assert result.get("early_exit") is True
+    assert result["page_total"] == 415300
+    assert engine.calls["rec_boxes"] < len(BILL)
+
+
+def test_sheet_with_a_gutter_is_read_in_full(make_service):
+    receipt = [
+        text_line("TOKO MAJU", 100, 100),
+        text_line("Nasi Goreng", 100, 150),
+        text_line("25.000", 450, 150),
+        text_line("Total", 100, 200),
+        text_line("25.000", 450, 200),
+    ]
+    # A shop receipt above the bill, separated by a wide empty band.
+    layout = receipt + shifted(BILL[-6:], -900)
+    service, engine, page = make_service(layout)
+
+    result = service._read_page(page, handwritten=False)
+
+    assert "early_exit" not in result
+    assert engine.calls["rec_boxes"] == len(layout)
+    assert "TOKO MAJU" in result["raw_text"]
+
+
+def test_jumlah_tagihan_anchor_can_stop_early_after_a_weak_total_bayar(make_service, monkeypatch):
+    service, _, page = make_service(BILL)
+    jumlah = {"total": 415300, "confidence": 0.97, "bbox": None}
+    monkeypatch.setattr(service, "_extract_total_bayar", lambda lines: {"total": 2500, "confidence": 0.4, "bbox": None})
+    monkeypatch.setattr(service, "_extract_explicit_jumlah_tagihan", lambda lines: jumlah)
+
+    lines, total = service._scan_bottom_up(page, conf_threshold=0.6)
+
+    assert total is jumlah
+    assert len(lines) < len(BILL)
@@ -0,0 +1,81 @@
+import random
+import string
+
+import pytest
+
+from conftest import text_line
+from paddle_ocr_v3 import FUZZY_ANCHOR_WORDS, FUZZY_MIN_TOKEN_LENGTH, FuzzyKeywordIndex, scan_keywords
+from receipt_heuristics import edit_distance
+
+ALPHABET = string.ascii_lowercase + string.digits
+
+
+def brute_force(token, distance):
+    """The per-token matcher the index replaces: edit distance to every anchor, one match wins."""
+    if token in FUZZY_ANCHOR_WORDS:
+        return token
+    if distance <= 0 or len(token) < FUZZY_MIN_TOKEN_LENGTH or token.isdigit():
+        return None
+    matches = [word for word in FUZZY_ANCHOR_WORDS if edit_distance(token, word, distance) <= distance]
+    return matches[0] if len(matches) == 1 else None
+
+
+def single_edits(word):
+    """Every deletion, transposition, substitution and insertion of one character."""
+    edits = set()
+    for i in range(len(word) + 1):
+        for ch in ALPHABET:
+            edits.add(word[:i] + ch + word[i:])
+        if i < len(word):
+            edits.add(word[:i] + word[i + 1 :])
+            for ch in ALPHABET:
+                edits.add(word[:i] + ch + word[i + 1 :])
+        if i < len(word) - 1:
+            edits.add(word[:i] + word[i + 1] + word[i] + word[i + 2 :])
+    return edits
+
+
+def typos(distance, samples=3000, seed=7):
+    rng = random.Random(seed)
+    tokens = {"pengeiuaran", "t0tal", "tota1", "jumiah", "tagiham", "pembayarn", "keterangan", "pelanggan"}
+    for word in FUZZY_ANCHOR_WORDS:
+        tokens |= single_edits(word)
+    if distance > 1:
+        pool = sorted(tokens)
+        tokens |= {rng.choice(sorted(single_edits(rng.choice(pool)))) for _ in range(samples)}
+    return sorted(tokens)
+
+
+@pytest.mark.parametrize("distance", [0, 1, 2])
+def test_index_resolves_typos_like_the_brute_force_matcher(distance):
+    index = FuzzyKeywordIndex(FUZZY_ANCHOR_WORDS, max_distance=distance)
+
+    mismatches = [token for token in typos(distance) if index.resolve(token) != brute_force(token, distance)]
+
+    assert mismatches == []
+
+
+@pytest.mark.parametrize("token, word", [("pengeiuaran", "pengeluaran"), ("t0tal", "total"), ("jumiah", "jumlah")])
+def test_common_misreads_resolve(token, word):
+    assert FuzzyKeywordIndex(FUZZY_ANCHOR_WORDS).resolve(token) == word
+
+
+def test_digit_misreads_are_repaired_only_in_normalized_text():
+    assert "total" not in scan_keywords("t0tal bayar")
+    assert "total" in scan_keywords("t0tal bayar", normalized=True)
+    assert "pengeluaran" in scan_keywords("jumlah pengeiuaran")
+
+
+def test_misread_column_header_counts_as_the_pengeluaran_header(make_service):
+    # The summary-page score looks the header up through the token index, which includes
+    # fuzzy hits: a misread header places the pengeluaran column like a clean one.
+    layout = [
+        text_line("LAPORAN PERTANGGUNGJAWABAN", 300, 80),
+        text_line("Pemasukan", 480, 300),
+        text_line("Pengeiuaran", 720, 300),
+    ]
+    service, _, page = make_service(layout)
+    lines = service.processor.run(page, False, 0.35)
+    ordered = lines.spatial.ordered
+
+    assert [ordered[pos].text for pos in lines.tokens.positions(["pengeluaran"])] == ["Pengeiuaran"]
@@ -0,0 +1,78 @@
+import cv2
+import numpy as np
+import pytest
+from PIL import Image
+
+from paddle_ocr_v3 import OCRService
+
+EXIF_ORIENTATION = 0x0112
+
+
+def test_load_pages_turns_exif_rotated_photos_upright(tmp_path):
+    path = tmp_path / "photo.jpg"
+    exif = Image.Exif()
+    exif[EXIF_ORIENTATION] = 6  # stored sideways, shown rotated 90 degrees clockwise
+    Image.new("RGB", (400, 300), "white").save(path, exif=exif)
+
+    (page,) = OCRService._load_pages(str(path))
+
+    assert page.size == (300, 400)
+
+
+def canvas(size, color=(255, 255, 255)):
+    page = np.empty((size[1], size[0], 3), dtype=np.uint8)
+    page[:] = color
+    return page
+
+
+def draw_receipt(page, x0, y0, x1, y1, paper):
+    """A receipt with a column of printed item lines."""
+    page[y0:y1, x0:x1] = paper
+    for row, y in enumerate(range(y0 + 120, y1 - 60, 90)):
+        cv2.putText(page, f"Item {row} Rp {row + 1}5.000", (x0 + 60, y), cv2.FONT_HERSHEY_SIMPLEX, 2.0, (30, 30, 30), 4)
+    return Image.fromarray(page)
+
+
+def white_page(size=(2480, 3508)):
+    return Image.new("RGB", size, "white")
+
+
+def speckled_page(size=(2480, 3508), specks=200):
+    page = np.full((size[1], size[0]), 255, dtype=np.uint8)
+    rng = np.random.default_rng(3)
+    page[rng.integers(0, size[1], specks), rng.integers(0, size[0], specks)] = 0
+    return Image.fromarray(page)
+
+
+def receipt_scan():
+    return draw_receipt(canvas((2480, 3508)), 300, 300, 2200, 3200, paper=(255, 255, 255))
+
+
+def receipt_photo_on_dark_table():
+    return draw_receipt(canvas((3000, 4000), (40, 40, 40)), 700, 400, 2300, 3700, paper=(235, 235, 230))
+
+
+@pytest.fixture
+def blank_skip(monkeypatch):
+    monkeypatch.setenv("OCR_BLANK_PAGE_SKIP", "1")
+
+
+@pytest.mark.parametrize("page", [white_page(), speckled_page(), Image.new("RGB", (2480, 3508), (128, 128, 128))])
+def test_blank_and_separator_pages_are_skipped(make_service, blank_skip, page):
+    service = make_service([])[0]
+
+    assert service._blank_page_indexes([page]) == [0]
+
+
+@pytest.mark.parametrize("page", [receipt_scan(), receipt_photo_on_dark_table()])
+def test_pages_with_a_receipt_are_read(make_service, blank_skip, page):
+    service = make_service([])[0]
+
+    assert service._blank_page_indexes([page]) == []
+
+
+def test_blank_page_skip_is_opt_in(make_service, monkeypatch):
+    monkeypatch.delenv("OCR_BLANK_PAGE_SKIP", raising=False)
+    service = make_service([])[0]
+
+    assert service._blank_page_indexes([white_page()]) == []
@@ -0,0 +1,113 @@
+import binascii
+
+import cv2
+import numpy as np
+import pytest
+from PIL import Image
+
+from conftest import text_line
+from receipt_heuristics import emv_amount, emv_crc16, parse_emv_payload
+
+
+def tlv(tag, value):
+    return f"{tag}{len(value):02d}{value}"
+
+
+def qris(amount=None, extra=""):
+    """A QRIS merchant payload with a valid CRC; static unless ``amount`` is given."""
+    body = (
+        tlv("00", "01")
+        + tlv("01", "12" if amount else "11")
+        + tlv("26", tlv("00", "ID.CO.QRIS.WWW") + tlv("01", "936000140000000000"))
+        + tlv("52", "5812")
+        + tlv("53", "360")
+    )
+    if amount:
+        body += tlv("54", amount)
+    body += extra + tlv("58", "ID") + tlv("59", "TOKO ABC") + tlv("60", "JAKARTA") + "6304"
+    return body + emv_crc16(body)
+
+
+def test_crc16_matches_the_ccitt_false_check_value():
+    assert emv_crc16("123456789") == "29B1"
+
+
+def test_crc16_matches_binascii():
+    payload = qris("150000")[:-4]
+    assert emv_crc16(payload) == f"{binascii.crc_hqx(payload.encode(), 0xFFFF):04X}"
+
+
+def test_parse_emv_payload_reads_top_level_tags():
+    fields = parse_emv_payload(qris("150000"))
+
+    assert fields["00"] == "01"
+    assert fields["54"] == "150000"
+    assert fields["59"] == "TOKO ABC"
+    assert fields["26"] == tlv("00", "ID.CO.QRIS.WWW") + tlv("01", "936000140000000000")
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        qris("150000")[:-1] + ("0" if qris("150000")[-1] != "0" else "1"),  # CRC mismatch
+        qris("150000")[:-10],  # truncated
+        "https://example.com/pay?amount=150000",
+    ],
+)
+def test_parse_emv_payload_rejects_malformed_payloads(payload):
+    assert parse_emv_payload(payload) is None
+
+
+@pytest.mark.parametrize(
+    "payload, expected",
+    [
+        (qris("150000"), 150000),
+        (qris("75000.00"), 75000),
+        (qris("75000", tlv("55", "02") + tlv("56", "1500")), 76500),
+        (qris("100000", tlv("55", "03") + tlv("57", "0.7")), 100700),
+        (qris(), None),
+    ],
+)
+def test_emv_amount(payload, expected):
+    assert emv_amount(payload) == expected
+
+
+def qr_image(payload, scale=8):
+    code = cv2.QRCodeEncoder.create().encode(payload)
+    return cv2.resize(code, (code.shape[1] * scale, code.shape[0] * scale), interpolation=cv2.INTER_NEAREST)
+
+
+def proof_page(payload, size=(1240, 1754), with_receipt=False):
+    page = np.full((size[1], size[0]), 255, dtype=np.uint8)
+    code = qr_image(payload)
+    page[300 : 300 + code.shape[0], 400 : 400 + code.shape[1]] = code
+    cv2.putText(page, "BUKTI PEMBAYARAN QRIS", (300, 250), cv2.FONT_HERSHEY_SIMPLEX, 1.2, 0, 2)
+    if with_receipt:
+        # A printed shop receipt pasted in the bottom-left corner of the same sheet.
+        for row in range(12):
+            cv2.putText(page, f"Item {row}  Rp {row + 1}5.000", (60, 1250 + row * 40), cv2.FONT_HERSHEY_SIMPLEX, 0.9, 0, 2)
+    return Image.fromarray(page).convert("RGB")
+
+
+@pytest.fixture
+def qr_fast_path(monkeypatch):
+    monkeypatch.setenv("OCR_QR_FAST_PATH", "1")
+
+
+def test_page_holding_only_a_dynamic_qr_is_read_from_the_code(make_service, qr_fast_path):
+    service, engine, _ = make_service([])
+
+    result = service._qr_page_result(proof_page(qris("150000")))
+
+    assert result["source"] == "qr"
+    assert result["page_total"] == 150000
+    assert engine.calls["full"] == 0
+
+
+def test_qr_beside_another_receipt_goes_to_ocr(make_service, qr_fast_path):
+    layout = [text_line("TOTAL", 60, 1690), text_line("65.000", 600, 1690)]
+    service, _, _ = make_service(layout)
+    service._load_pages = lambda path: [proof_page(qris("150000"), with_receipt=True)]
+
+    assert service._qr_page_result(service._load_pages("x.pdf")[0]) is None
+    assert service.process("x.pdf")["per_page"][0].get("source") != "qr"
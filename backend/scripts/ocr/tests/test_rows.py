@@ -0,0 +1,87 @@
+from conftest import box_of, text_line
+from paddle_ocr_v3 import Line, LineSet
+
+
+def line(text, x0, y0, x1, y1):
+    points = box_of((x0, y0, x1, y1))
+    return Line(text, 0.95, [coord for point in points for coord in point], points)
+
+
+def texts(lines, positions):
+    return [lines[pos].text for pos in positions]
+
+
+def test_rows_group_overlapping_lines_left_to_right():
+    lines = LineSet(
+        [
+            line("30.000", 900, 404, 1020, 436),
+            line("Total", 100, 400, 200, 430),
+            line("Tunai", 100, 460, 200, 490),
+            line("50.000", 900, 462, 1020, 492),
+            line("Kembali", 100, 520, 240, 550),
+        ]
+    )
+    ordered = lines.spatial.ordered
+
+    assert [texts(ordered, row) for row in lines.rows.rows] == [["Total", "30.000"], ["Tunai", "50.000"], ["Kembali"]]
+    total = next(pos for pos, entry in enumerate(ordered) if entry.text == "Total")
+    assert texts(ordered, lines.rows.right_of(total)) == ["30.000"]
+
+
+def test_lines_overlapping_by_less_than_half_their_height_are_separate_rows():
+    lines = LineSet([line("Subtotal", 100, 400, 260, 430), line("28.000", 900, 418, 1020, 448)])
+
+    assert len(lines.rows.rows) == 2
+
+
+def test_repeated_detection_of_the_same_box_keeps_the_most_confident():
+    lines = LineSet(
+        [
+            line("Total 30.000", 100, 400, 600, 430),
+            line("Total 30.000", 104, 402, 604, 432),
+            line("30.000", 450, 400, 600, 430),
+        ]
+    )
+    lines[1].confidence = 0.99
+
+    kept = lines.deduplicated()
+
+    # The bare amount overlaps the full line too little to count as the same detection.
+    assert sorted((entry.text, entry.confidence) for entry in kept) == [("30.000", 0.95), ("Total 30.000", 0.99)]
+
+
+def test_same_text_in_separate_boxes_is_kept():
+    lines = LineSet([line("5.000", 500, 400, 600, 430), line("5.000", 900, 400, 1000, 430)])
+
+    assert len(lines.deduplicated()) == 2
+
+
+def report(total_row):
+    header = [
+        text_line("LAPORAN PERTANGGUNGJAWABAN", 300, 80),
+        text_line("Uraian", 100, 300),
+        text_line("Pemasukan", 480, 300),
+        text_line("Pengeluaran", 720, 300),
+        text_line("Saldo", 1000, 300),
+        text_line("Belanja ATK", 100, 360),
+        text_line("250.000", 740, 360),
+        text_line("7.450.000", 980, 360),
+    ]
+    footer = [text_line("Bandung, 5 Mei 2026", 700, 700), text_line("Saldo akhir 7.450.000", 700, 750)]
+    return header + total_row + footer
+
+
+def test_total_row_cells_are_read_from_the_label_row(make_service):
+    # The amount cells sit a few pixels above the label, so they come before it in reading order.
+    total_row = [
+        text_line("Total", 100, 600),
+        text_line("7.700.000", 480, 592),
+        text_line("250.000", 740, 592),
+        text_line("7.450.000", 980, 592),
+    ]
+    service, _, page = make_service(report(total_row))
+    lines = service.processor.run(page, False, 0.6)
+
+    amount, _confidence, _bbox = service._extract_pengeluaran_summary_total(lines, page.width)
+
+    assert amount == 250000
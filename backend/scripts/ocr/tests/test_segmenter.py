@@ -0,0 +1,80 @@
+from conftest import text_line
+
+PAGE = (1600, 2263)
+
+
+def block(lines, x0, y0, amount_x=None):
+    """Lines stacked 45 px apart from (x0, y0); ``(label, amount)`` pairs put the amount in a right column."""
+    layout = []
+    for row, entry in enumerate(lines):
+        y = y0 + row * 45
+        label, amount = entry if isinstance(entry, tuple) else (entry, None)
+        layout.append(text_line(label, x0, y))
+        if amount is not None:
+            layout.append(text_line(amount, amount_x, y))
+    return layout
+
+
+def single_nota():
+    """One nota in three blocks separated by gaps of about nine line heights."""
+    header = block(["TOKO BANGUNAN SUMBER JAYA", "Jl. Soekarno Hatta 12 Bandung", "Telp 022-5551234"], 400, 150)
+    items = block(
+        ["Semen 2 sak Rp 130.000", "Pasir 1 m3 Rp 180.000", "Cat tembok 5 kg Rp 90.000", "Jumlah Rp 400.000"], 200, 510
+    )
+    footer = block(["PPN 5,45% Rp 21.800", "Total Bayar Rp 421.800", "Terima kasih"], 200, 915)
+    return header + items + footer
+
+
+def sheet(columns, rows):
+    """Small shop receipts taped in a grid, each with its own total."""
+    layout = []
+    for row in range(rows):
+        for column in range(columns):
+            x0, y0 = 60 + column * 520, 80 + row * 700
+            layout += block(
+                [
+                    f"WARUNG {row}{column}",
+                    ("Nasi rames", "15.000"),
+                    ("Es teh", "5.000"),
+                    ("Total", "20.000"),
+                ],
+                x0,
+                y0,
+                amount_x=x0 + 220,
+            )
+    return layout
+
+
+def test_single_nota_in_blocks_keeps_its_page_total(make_service):
+    service, _, page = make_service(single_nota(), size=PAGE)
+
+    result = service._read_page(page, handwritten=False)
+
+    assert result["page_total"] == 421800
+    assert result["receipt_count"] == 1
+
+
+def test_sectioned_bill_is_settled_by_its_page_total(make_service):
+    # Every section carries its own subtotal, so the segmenter sees three receipts; only
+    # one of them has a billing anchor, so this is one bill.
+    layout = (
+        block(["Material", "Semen 2 sak Rp 130.000", "Subtotal Rp 130.000"], 200, 150)
+        + block(["Jasa", "Tukang 2 hari Rp 250.000", "Subtotal Rp 250.000"], 200, 600)
+        + block(["Admin Rp 5.000", "Total Bayar Rp 385.000", "Terima kasih"], 200, 1050)
+    )
+    service, _, page = make_service(layout, size=PAGE)
+
+    result = service._read_page(page, handwritten=False)
+
+    assert len(service.segmenter.segment(service.processor.run(page, False, 0.6), PAGE[1], PAGE[0])) == 3
+    assert result["page_total"] == 385000
+    assert result["receipt_count"] == 1
+
+
+def test_taped_sheet_is_split_into_every_receipt(make_service):
+    service, _, page = make_service(sheet(3, 2), size=PAGE)
+
+    result = service._read_page(page, handwritten=False)
+
+    assert result["receipt_count"] == 6
+    assert result["page_total"] == 6 * 20000
@@ -0,0 +1,84 @@
+import numpy as np
+import pytest
+
+from conftest import box_of, text_line
+
+RECEIPT = [
+    text_line("TOKO MAJU JAYA", 300, 80),
+    text_line("Jl. Merdeka 10 Bandung", 260, 130),
+    text_line("Nasi Goreng", 100, 400),
+    text_line("25.000", 900, 400),
+    text_line("Es Teh Manis", 100, 460),
+    text_line("5.000", 920, 460),
+    text_line("Total", 100, 560),
+    text_line("30.000", 900, 560),
+    text_line("Kasir: Budi", 850, 700),
+]
+
+
+class FakeNumericRecognizer:
+    """Stands in for the bare TextRecognizer: called with crops, returns (rec_res, elapse)."""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.boxes = 0
+
+    def __call__(self, crops):
+        self.boxes += len(crops)
+        return [self.engine.by_key.get(crop.key, ("", 0.0)) for crop in crops], 0.0
+
+
+def test_page_orientation_recognizes_each_box_once(make_service):
+    service, engine, page = make_service(RECEIPT)
+    service.processor.orientation_mode = "page"
+
+    lines = service.processor.run(page, handwritten=False, conf_threshold=0.5)
+
+    assert len(lines) == len(RECEIPT)
+    assert engine.calls["cls"] == 1
+    assert engine.calls["rec"] == 1
+    assert engine.calls["rec_boxes"] == len(RECEIPT)
+
+
+def test_box_orientation_recognizes_each_box_once(make_service):
+    service, engine, page = make_service(RECEIPT)
+    service.processor.orientation_mode = "box"
+    service.processor.numeric_rec_model = "numeric"
+    service.processor._numeric_engine = FakeNumericRecognizer(engine)
+
+    service.processor.run(page, handwritten=False, conf_threshold=0.5)
+
+    assert engine.calls["cls"] == 1
+    assert engine.calls["rec_boxes"] + service.processor._numeric_engine.boxes == len(RECEIPT)
+
+
+def test_only_amount_column_boxes_go_to_the_numeric_model(make_service):
+    boxes = [np.array(box_of(rect), dtype=np.float32) for _, _, rect in RECEIPT]
+
+    shaped = make_service(RECEIPT)[0].processor._amount_shaped_boxes(boxes, 1200)
+
+    assert {RECEIPT[idx][0] for idx in shaped} == {"25.000", "5.000", "30.000"}
+
+
+def classifier_voting(engine, flipped):
+    """Make the engine's angle classifier label the first ``flipped`` crops of each call 180."""
+
+    def text_classifier(crops):
+        engine.calls["cls"] += 1
+        labels = [["180", 0.99] if idx < flipped else ["0", 0.99] for idx in range(len(crops))]
+        return list(crops), labels, 0.0
+
+    engine.text_classifier = text_classifier
+
+
+@pytest.mark.parametrize("flipped, rotation, cls_calls", [(0, 0, 1), (len(RECEIPT), 180, 1), (len(RECEIPT) // 2, 0, 2)])
+def test_page_orientation_vote(make_service, flipped, rotation, cls_calls):
+    service, engine, page = make_service(RECEIPT)
+    service.processor.orientation_mode = "page"
+    classifier_voting(engine, flipped)
+
+    service.processor.run(page, handwritten=False, conf_threshold=0.5)
+
+    # A split vote leaves the page as it is and falls back to classifying every box.
+    assert service.processor.last_rotation == rotation
+    assert engine.calls["cls"] == cls_calls
@@ -0,0 +1,54 @@
+from conftest import text_line
+from paddle_ocr_v3 import EXTRACTION_STRATEGIES, PAGE_SCOPE, STRATEGY_DEMOTE_MIN_EVALUATIONS, StrategyEngine
+
+
+def engine_with(history, order="adaptive"):
+    engine = StrategyEngine(None, EXTRACTION_STRATEGIES, order=order, stats_path="")
+    engine.history = history
+    return engine
+
+
+def names(cascade):
+    return [strategy.name for strategy in cascade]
+
+
+def test_adaptive_mode_keeps_precision_order():
+    registry = names(engine_with({}, order="fixed").applicable(PAGE_SCOPE))
+    # tagihan_anchor accepts far more often than total_bayar, which must still run first.
+    history = {
+        PAGE_SCOPE: {
+            "total_bayar": {"evaluations": 1000, "accepted": 10, "seconds": 5.0},
+            "explicit_jumlah_tagihan": {"evaluations": 990, "accepted": 5, "seconds": 5.0},
+            "tagihan_anchor": {"evaluations": 985, "accepted": 900, "seconds": 0.1},
+        }
+    }
+
+    assert names(engine_with(history).applicable(PAGE_SCOPE)) == registry
+
+
+def test_adaptive_mode_runs_strategies_that_never_accept_last():
+    history = {
+        "unknown": {
+            "billing_anchor": {"evaluations": STRATEGY_DEMOTE_MIN_EVALUATIONS, "accepted": 0, "seconds": 1.0},
+            "tagihan_anchor": {"evaluations": STRATEGY_DEMOTE_MIN_EVALUATIONS - 1, "accepted": 0, "seconds": 1.0},
+        }
+    }
+
+    cascade = names(engine_with(history).applicable("unknown"))
+
+    registry = names(engine_with({}).applicable("unknown"))
+    assert cascade == [name for name in registry if name != "billing_anchor"] + ["billing_anchor"]
+
+
+def test_receipt_only_a_demoted_strategy_reads_still_resolves(make_service):
+    layout = [text_line("PDAM TIRTA", 100, 100), text_line("Grand Total", 100, 600), text_line("Rp 250.000", 700, 600)]
+    service, _, page = make_service(layout)
+    service.strategies = StrategyEngine(service, EXTRACTION_STRATEGIES, order="adaptive", stats_path="")
+    service.strategies.history = {
+        "resi_tagihan": {"billing_anchor": {"evaluations": 10 * STRATEGY_DEMOTE_MIN_EVALUATIONS, "accepted": 0}}
+    }
+
+    total = service.strategies.run("resi_tagihan", service.processor.run(page, False, 0.6), page.height)
+
+    assert names(service.strategies.applicable("resi_tagihan"))[-1] == "billing_anchor"
+    assert total["total"] == 250000
@@ -0,0 +1,36 @@
+import numpy as np
+from PIL import Image, ImageDraw
+
+from conftest import box_of
+from paddle_ocr_v3 import Line
+
+
+def line(text, x0, y0, x1, y1):
+    points = box_of((x0, y0, x1, y1))
+    return Line(text, 0.95, [coord for point in points for coord in point], points)
+
+
+def test_roi_crop_uses_the_rotation_of_its_own_page(make_service, monkeypatch):
+    service, _, _ = make_service([])
+    monkeypatch.setenv("OCR_SUMMARY_LOWRES_WIDTH", "2000")
+    page = Image.new("RGB", (1000, 1400), "white")
+    # Ink right of the Total label; turning the page over would move it to the top-left.
+    ImageDraw.Draw(page).rectangle((700, 1000, 900, 1040), fill="black")
+    lowres = [line("Pengeluaran", 600, 200, 850, 240), line("Total", 100, 1000, 220, 1040)]
+    crops = []
+
+    def run(image, handwritten, conf_threshold, max_width=None):
+        if max_width is None:
+            service.processor.last_rotation = 0
+            return lowres
+        crops.append(np.asarray(image.convert("L")))
+        return [line("1.250.000", 10, 10, 200, 50)]
+
+    monkeypatch.setattr(service.processor, "run", run)
+    lines = service._run_lowres(page)
+    # Another page read since then turned out upside down.
+    service.processor.last_rotation = 180
+
+    assert service._summary_roi_lines(page, lines) is not None
+    (crop,) = crops
+    assert crop.min() == 0
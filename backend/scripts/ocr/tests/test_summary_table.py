@@ -0,0 +1,80 @@
+import pytest
+
+from conftest import box_of, text_line
+
+v2 = pytest.importorskip("paddle_ocr_v2", exc_type=ImportError)
+
+PAGE_WIDTH = 1240
+
+
+def line(text, x0, y0, x1=None, y1=None, conf=0.95):
+    text, conf, rect = text_line(text, x0, y0, x1, y1, conf)
+    points = box_of(rect)
+    return {"text": text, "confidence": conf, "bbox": [coord for point in points for coord in point], "box_points": points}
+
+
+def report(above_header=()):
+    """A pemasukan / pengeluaran / saldo table; the saldo column sits close to pengeluaran."""
+    lines = [line("LAPORAN PERTANGGUNGJAWABAN", 300, 80)] + list(above_header)
+    lines += [line("Pemasukan", 460, 400), line("Pengeluaran", 650, 400), line("Saldo", 880, 400)]
+    rows = [("7.700.000", "250.000", "7.450.000"), ("", "300.000", "5.750.000")]
+    for row, cells in enumerate(rows):
+        y = 460 + row * 50
+        for text, x in zip(cells, (460, 650, 860)):
+            if text:
+                lines.append(line(text, x, y))
+    return lines
+
+
+def test_text_x_places_a_span_by_its_offset_in_the_box():
+    row = line("Total 1.250.000 750.000", 100, 500, 560)
+
+    assert row["text"][6:15] == "1.250.000"
+    assert v2.text_x(row, 6, 15) == pytest.approx(100 + 460 * 10.5 / 23)
+    assert v2.text_x({"text": "", "bbox": []}, 0, 0) == 0.0
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("Rp 150.000", [(3, 10, 150000)]),
+        ("1.250.000 750.000", [(0, 9, 1250000), (10, 17, 750000)]),
+        ("Total 7.700.000 250.000 7.450.000", [(6, 15, 7700000), (16, 23, 250000), (24, 33, 7450000)]),
+        ("No 12", []),
+    ],
+)
+def test_amount_spans(text, expected):
+    assert v2.amount_spans(text) == expected
+
+
+def test_single_box_header_is_split_into_its_cells():
+    lines = [line("Pemasukan Pengeluaran Saldo", 400, 400, 1000)] + report()[4:]
+
+    table = v2.SummaryTableColumns.detect(lines, PAGE_WIDTH)
+
+    assert sorted(table.header_cells) == ["pemasukan", "pengeluaran", "saldo"]
+    assert table.header_cells["pemasukan"][0] < table.header_cells["pengeluaran"][0] < table.header_cells["saldo"][0]
+
+
+def test_column_amounts_reads_the_pengeluaran_column():
+    table = v2.SummaryTableColumns.detect(report(), PAGE_WIDTH)
+
+    assert sorted(amount for amount, _line, _x in table.column_amounts(report(), "pengeluaran")) == [250000, 300000]
+
+
+def test_saldo_line_above_the_table_does_not_hide_the_saldo_header():
+    lines = report(above_header=[line("Saldo Awal: 5.000.000", 100, 200)])
+
+    table = v2.SummaryTableColumns.detect(lines, PAGE_WIDTH)
+
+    assert sorted(table.header_cells) == ["pemasukan", "pengeluaran", "saldo"]
+    assert sorted(amount for amount, _line, _x in table.column_amounts(lines, "pengeluaran")) == [250000, 300000]
+
+
+def test_header_hint_stands_in_for_a_missing_pengeluaran_header():
+    lines = [entry for entry in report() if "Pengeluaran" not in entry["text"]]
+
+    table = v2.SummaryTableColumns.detect(lines, PAGE_WIDTH, header_hint_x=700.0)
+
+    assert table.header_cells["pengeluaran"][0] == 700.0
+    assert v2.SummaryTableColumns.detect(lines, PAGE_WIDTH) is None
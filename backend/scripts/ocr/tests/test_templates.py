@@ -0,0 +1,99 @@
+import json
+
+import cv2
+import numpy as np
+import pytest
+from PIL import Image
+
+from conftest import text_line
+from paddle_ocr_v3 import SUMMARY_TEMPLATE_CATEGORY, TemplateLibrary
+
+
+def bill(header):
+    """A one-total bill whose header lines are ``header``; the total row is the same for every issuer."""
+    layout = [text_line(text, 100, 80 + row * 50) for row, text in enumerate(header)]
+    return layout + [text_line("TOTAL BAYAR", 100, 1000), text_line("Rp 150.000", 700, 1000)]
+
+
+def printed(layout, size=(1200, 1600)):
+    """The page a layout was read from, so the header band has ink to fingerprint."""
+    page = np.full((size[1], size[0]), 255, dtype=np.uint8)
+    for text, _conf, (x0, _y0, _x1, y1) in layout:
+        cv2.putText(page, text, (int(x0), int(y1)), cv2.FONT_HERSHEY_SIMPLEX, 1.0, 0, 2)
+    return Image.fromarray(page).convert("RGB")
+
+
+REJEKI = bill(["TOKO SUMBER REJEKI", "Jl. Merdeka 10 Bandung"])
+SEHAT = bill(["APOTEK SEHAT SELALU", "Jl. Asia Afrika 5 Bandung"])
+
+
+@pytest.fixture
+def library_path(tmp_path, monkeypatch):
+    path = tmp_path / "templates.json"
+    monkeypatch.setenv("OCR_TEMPLATE_PATH", str(path))
+    return path
+
+
+def learn_bill(service, page, category="utility_bill"):
+    lines = service.processor.run(page, False, 0.6)
+    amount = next(line for line in lines if line.text == "Rp 150.000")
+    service.templates.learn(page, lines, {"bbox": amount.bbox}, category)
+
+
+def service_with(make_service, library_path, layout):
+    service, engine, _ = make_service(layout)
+    service.templates = TemplateLibrary(str(library_path))
+    return service, engine, printed(layout)
+
+
+def test_known_issuer_is_read_from_its_total_region(make_service, library_path):
+    service, _, page = service_with(make_service, library_path, REJEKI)
+    learn_bill(service, page)
+    service.templates.save()
+    service, engine, page = service_with(make_service, library_path, REJEKI)
+
+    result = service._template_page_result(page)
+
+    assert result["source"] == "template"
+    assert result["page_total"] == 150000
+
+
+def test_issuer_with_a_similar_header_band_is_not_matched(make_service, library_path):
+    service, _, page = service_with(make_service, library_path, REJEKI)
+    learn_bill(service, page)
+    service.templates.save()
+    service, engine, page = service_with(make_service, library_path, SEHAT)
+
+    # The two header bands hash alike; only the header text tells the issuers apart.
+    assert service.templates.match(page)
+    assert service._template_page_result(page) is None
+    assert engine.calls["full"] == 1  # the header band; the total region is never read
+
+
+def test_pages_without_header_text_are_not_learned(make_service, library_path):
+    layout = bill(["POSPAY"])
+    service, _, page = service_with(make_service, library_path, layout)
+
+    learn_bill(service, page)
+
+    assert service.templates.templates == {}
+
+
+@pytest.mark.parametrize("category, learned", [("utility_bill", 1), (SUMMARY_TEMPLATE_CATEGORY, 0)])
+def test_summary_pages_are_not_learned(make_service, library_path, category, learned):
+    service, _, page = service_with(make_service, library_path, REJEKI)
+
+    learn_bill(service, page, category)
+
+    assert len(service.templates.templates) == learned
+
+
+def test_summary_templates_from_older_libraries_are_not_matched(make_service, library_path):
+    service, _, page = service_with(make_service, library_path, REJEKI)
+    learn_bill(service, page)
+    service.templates.save()
+    data = json.loads(library_path.read_text())
+    data["templates"][0]["category"] = SUMMARY_TEMPLATE_CATEGORY
+    library_path.write_text(json.dumps(data))
+
+    assert TemplateLibrary(str(library_path)).match(page) == []